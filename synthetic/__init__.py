@@ -31,6 +31,11 @@ in their name.
 This package provides a method `load`, which is an alias of
 :meth:`synthetic.loader.load`. The method takes a graph instance and adds
 reviewers, products, and reviews to the graph.
+Method `load_partitioned`, an alias of :meth:`synthetic.loader.load_partitioned`,
+partitions reviewers and loads them into several graphs.
+Method `load_subgraph`, an alias of :meth:`synthetic.index.load_subgraph`,
+loads only the neighbourhood of given reviewers using an index built by
+`build_index`, an alias of :meth:`synthetic.index.build_index`.
 
 .. rubric:: References
 
@@ -50,10 +55,11 @@ reviewers, products, and reviews to the graph.
 
 from typing import Final
 
-from synthetic.loader import load
+from synthetic.index import build_index, load_subgraph
+from synthetic.loader import load, load_partitioned
 
 ANOMALOUS_REVIEWER_SIZE: Final = 57
 """The number of anomalous reviewers in this synthetic dataset. """
 
 
-__all__: Final = ("load", "ANOMALOUS_REVIEWER_SIZE")
+__all__: Final = ("load", "load_partitioned", "build_index", "load_subgraph", "ANOMALOUS_REVIEWER_SIZE")
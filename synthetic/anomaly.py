@@ -0,0 +1,57 @@
+#
+#  anomaly.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Classify reviewers into normal ones and each type of anomalous ones by their names.
+
+This module doesn't depend on other modules of this package, so that both
+the loaders in :mod:`synthetic.loader` and the evaluation tools in
+:mod:`synthetic.eval` can use it.
+"""
+
+from typing import Final
+
+import numpy as np
+import numpy.typing as npt
+
+ANOMALY_REVIEWER_TAG: Final = "anomaly"
+TYPE2_ANOMALY_REVIEWER_TAG: Final = "_1"
+TYPE3_ANOMALY_REVIEWER_TAG: Final = "_2"
+
+
+def anomaly_types(names: npt.ArrayLike) -> npt.NDArray[np.int8]:
+    """Classifies reviewers by their names.
+
+    Args:
+      names: An array of reviewer names.
+
+    Returns:
+      An array of the same length as *names* whose elements are 1, 2, or 3 if
+      the corresponding reviewer is a type-1, type-2, or type-3 anomalous
+      reviewer, respectively, and 0 otherwise.
+    """
+    names = np.asarray(names, dtype=np.str_)
+    res = np.zeros(names.shape, dtype=np.int8)
+    anomalous = np.char.find(names, ANOMALY_REVIEWER_TAG) >= 0
+    type2 = anomalous & (np.char.find(names, TYPE2_ANOMALY_REVIEWER_TAG) >= 0)
+    type3 = anomalous & ~type2 & (np.char.find(names, TYPE3_ANOMALY_REVIEWER_TAG) >= 0)
+    res[anomalous] = 1
+    res[type2] = 2
+    res[type3] = 3
+    return res
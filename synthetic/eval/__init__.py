@@ -20,6 +20,29 @@
 #
 from typing import Final
 
-from synthetic.eval.score import AnomalousReviews, Reviewer, calc_anomalous_reviews, dcg, ideal_dcg
+from synthetic.eval.evaluator import DcgResult, Evaluator, RankingResult, ThresholdResult
+from synthetic.eval.score import (
+    AnomalousReviews,
+    Estimate,
+    Reviewer,
+    ScoreSketch,
+    anomaly_types,
+    calc_anomalous_reviews,
+    dcg,
+    ideal_dcg,
+)
 
-__all__: Final = ("dcg", "ideal_dcg", "calc_anomalous_reviews", "Reviewer", "AnomalousReviews")
+__all__: Final = (
+    "dcg",
+    "ideal_dcg",
+    "calc_anomalous_reviews",
+    "anomaly_types",
+    "Reviewer",
+    "AnomalousReviews",
+    "Evaluator",
+    "ThresholdResult",
+    "RankingResult",
+    "DcgResult",
+    "ScoreSketch",
+    "Estimate",
+)
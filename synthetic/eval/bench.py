@@ -0,0 +1,265 @@
+#
+#  bench.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Benchmarks scalability of an algorithm with generated datasets of increasing sizes.
+
+Each dataset is generated and written in a child process, and another child
+process loads it, constructs a graph, and updates the graph so that the peak
+memory of the process reflects only that dataset. Since a forked child starts
+with the memory of its parent, the peak memory is measured as its growth over
+the baseline read right after the child starts. Child processes are
+terminated when the time budget of a size runs out.
+
+If a :class:`synthetic.store.DatasetStore` is given, generated datasets are
+kept in it in the binary form and reused by later runs with the same seed.
+Running the benchmark with different orders of nodes, which are passed to
+:meth:`synthetic.loader.reorder_dataset`, shows their effect on the time of
+an update.
+"""
+
+import math
+import multiprocessing
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import nullcontext
+from multiprocessing.queues import Queue
+from queue import Empty
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+
+from synthetic.eval.graph import Graph
+from synthetic.generator import generate_dataset, write_dataset
+from synthetic.loader import Order, add_dataset, read_dataset, reorder_dataset
+from synthetic.store import DatasetStore
+
+Message = Optional[tuple[str, float, Optional[int]]]
+"""A message from a child process, i.e., a name, seconds spent, and an integer measurement, or None at last."""
+
+
+class SizeResult(NamedTuple):
+    """Measurements for a dataset size."""
+
+    reviewers: int
+    products: int
+    reviews: int
+    generate: Optional[float]
+    """Seconds to generate and write the dataset."""
+    load: Optional[float]
+    """Seconds to read the dataset."""
+    construct: Optional[float]
+    """Seconds to add the reviewers, products, and reviews to a graph."""
+    updates: list[float]
+    """Seconds spent by each update."""
+    peak_memory: Optional[int]
+    """Growth in bytes of the peak resident set size of the process which loads and updates the graph over its
+    baseline right after it started, or None if the platform doesn't provide it."""
+    completed: bool
+    """False if the time budget ran out."""
+    order: Order = "file"
+    """Order of reviewers, products, and reviews added to the graph."""
+
+    @property
+    def update(self) -> Optional[float]:
+        """Mean seconds of an update."""
+        return sum(self.updates) / len(self.updates) if self.updates else None
+
+
+class Fit(NamedTuple):
+    """An empirical complexity curve, i.e., ``coefficient * reviews ** exponent``."""
+
+    exponent: float
+    coefficient: float
+
+
+def _peak_memory() -> Optional[int]:
+    """Peak resident set size of this process in bytes, or None on platforms without :mod:`resource`, e.g., Windows."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+
+def _memory_growth(baseline: Optional[int]) -> Optional[int]:
+    """Growth of the peak resident set size of this process in bytes over a baseline read by :func:`_peak_memory`."""
+    peak = _peak_memory()
+    return peak - baseline if peak is not None and baseline is not None else None
+
+
+def _generate(
+    reviewers: int, seed: Optional[int], directory: str, store: Optional[DatasetStore], queue: "Queue[Message]"
+) -> None:
+    """Generates a dataset and writes it into a directory, or into the store if given."""
+    baseline = _peak_memory()
+    start = time.perf_counter()
+    if store is not None and seed is not None:
+        dataset = read_dataset(store.generated(reviewers, seed=seed))
+    else:
+        dataset = generate_dataset(reviewers, seed=seed)
+        write_dataset(dataset, directory)
+    queue.put(("generate", time.perf_counter() - start, _memory_growth(baseline)))
+    queue.put(("products", 0.0, len(dataset.product_ids)))
+    queue.put(("reviews", 0.0, len(dataset.review_scores)))
+    queue.put(None)
+
+
+def _measure(factory: Callable[[], Graph], directory: str, loop: int, order: Order, queue: "Queue[Message]") -> None:
+    """Loads a dataset into a graph and updates it, reporting the time of each phase.
+
+    The time to reorder the dataset is a part of the load phase.
+    """
+    baseline = _peak_memory()
+    start = time.perf_counter()
+    dataset = reorder_dataset(read_dataset(directory), order)
+    queue.put(("load", time.perf_counter() - start, _memory_growth(baseline)))
+
+    start = time.perf_counter()
+    g = add_dataset(factory(), dataset)
+    queue.put(("construct", time.perf_counter() - start, _memory_growth(baseline)))
+    del dataset
+
+    for _ in range(loop):
+        start = time.perf_counter()
+        g.update()
+        queue.put(("update", time.perf_counter() - start, _memory_growth(baseline)))
+    queue.put(None)
+
+
+def _run(
+    target: Callable[..., None], args: tuple[Any, ...], deadline: float
+) -> tuple[list[tuple[str, float, Optional[int]]], bool]:
+    """Runs a function in a child process until it finishes or the deadline passes.
+
+    Args:
+      target: The function, which takes a queue as the last argument and puts messages to it.
+      args: Arguments passed to the function before the queue.
+      deadline: Value of :func:`time.perf_counter` when the process is terminated.
+
+    Returns:
+      A pair of the messages and whether the process finished before the deadline.
+    """
+    queue: "Queue[Message]" = multiprocessing.Queue()
+    p = multiprocessing.Process(target=target, args=(*args, queue), daemon=True)
+    p.start()
+    messages: list[tuple[str, float, Optional[int]]] = []
+    try:
+        while True:
+            try:
+                msg = queue.get(timeout=min(max(deadline - time.perf_counter(), 0), 0.5))
+            except Empty:
+                if time.perf_counter() >= deadline:
+                    return messages, False
+                if not p.is_alive():
+                    raise RuntimeError(f"benchmark process exited with code {p.exitcode}") from None
+                continue
+            if msg is None:
+                return messages, True
+            messages.append(msg)
+    finally:
+        p.terminate()
+        p.join()
+
+
+def scale_bench(
+    factory: Callable[[], Graph],
+    sizes: Iterable[int],
+    loop: int,
+    budget: Optional[float] = None,
+    seed: Optional[int] = None,
+    store: Optional[DatasetStore] = None,
+    order: Order = "file",
+) -> Iterator[SizeResult]:
+    """Measures an algorithm with generated datasets of increasing sizes.
+
+    Sizes after the one which runs out of the time budget are skipped since
+    they would take even longer.
+
+    Args:
+      factory: a function creating an empty graph of the algorithm.
+      sizes: numbers of reviewers of the generated datasets.
+      loop: the number of updates for each size.
+      budget: seconds allowed for each size including the generation of the dataset.
+      seed: seed used to generate datasets.
+      store: if given, the store where generated datasets are kept, which
+        requires *seed*. Datasets are loaded from their binary form then.
+      order: order of reviewers, products, and reviews added to the graph.
+
+    Yields:
+      Measurements for each size.
+    """
+    if store is not None and seed is None:
+        raise ValueError("a seed is required to store generated datasets")
+    for size in sizes:
+        deadline = time.perf_counter() + (budget if budget is not None else math.inf)
+        tmp = (
+            nullcontext(store.path(store.generator_key(size, seed=seed)))
+            if store is not None and seed is not None
+            else tempfile.TemporaryDirectory()
+        )
+        with tmp as directory:
+            generated, completed = _run(_generate, (size, seed, directory, store), deadline)
+            info = {name: (seconds, value) for name, seconds, value in generated}
+            completed = completed and "reviews" in info
+            measured: list[tuple[str, float, Optional[int]]] = []
+            if completed:
+                measured, completed = _run(_measure, (factory, directory, loop, order), deadline)
+
+        phases = {name: seconds for name, seconds, _ in measured}
+        yield SizeResult(
+            reviewers=size,
+            products=info.get("products", (0.0, 0))[1] or 0,
+            reviews=info.get("reviews", (0.0, 0))[1] or 0,
+            generate=info["generate"][0] if "generate" in info else None,
+            load=phases.get("load"),
+            construct=phases.get("construct"),
+            updates=[seconds for name, seconds, _ in measured if name == "update"],
+            peak_memory=measured[-1][2] if measured else None,
+            completed=completed,
+            order=order,
+        )
+        if not completed:
+            return
+
+
+def fit(results: Sequence[SizeResult]) -> dict[str, Fit]:
+    """Fits empirical complexity curves against the number of reviews.
+
+    Args:
+      results: Measurements for several sizes.
+
+    Returns:
+      Curves of load, construct, update, and peak_memory, which are fitted
+      with least squares in the log-log space. Metrics measured for less than
+      two sizes are omitted.
+    """
+    res = {}
+    for name in ("load", "construct", "update", "peak_memory"):
+        points = np.array(
+            [(r.reviews, v) for r in results if (v := getattr(r, name)) is not None and v > 0 and r.reviews > 0]
+        )
+        if len(np.unique(points[:, 0]) if len(points) else []) < 2:
+            continue
+        exponent, intercept = np.polyfit(np.log(points[:, 0]), np.log(points[:, 1]), 1)
+        res[name] = Fit(float(exponent), float(np.exp(intercept)))
+    return res
@@ -0,0 +1,191 @@
+#
+#  cache.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Caches freshly loaded graphs on disk."""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+from collections.abc import Callable, Mapping, Sequence
+from functools import cache
+from importlib import metadata
+from typing import Any, Final, Optional
+
+from synthetic.eval.graph import Graph
+
+LOGGER: Final = logging.getLogger(__name__)
+
+FORMAT_VERSION: Final = 1
+"""Version of the format of cached graphs, which is a part of cache keys so that old entries are ignored."""
+
+_SUFFIX: Final = ".pickle"
+
+_DISTRIBUTION: Final = "rgmining-synthetic-dataset"
+"""Distribution package providing the bundled algorithms, which an editable install doesn't map to its modules."""
+
+
+@cache
+def _distributions() -> Mapping[str, list[str]]:
+    return metadata.packages_distributions()
+
+
+def package_version(constructor: Callable[..., Any]) -> Optional[str]:
+    """Finds the version of the distribution package providing a graph constructor.
+
+    Args:
+      constructor: the graph constructor.
+
+    Returns:
+      The version, or None if the constructor isn't in an installed package.
+    """
+    module = (getattr(constructor, "__module__", None) or "").partition(".")[0]
+    names = _distributions().get(module, [_DISTRIBUTION] if module == "synthetic" else [])
+    for name in names:
+        try:
+            return metadata.version(name)
+        except metadata.PackageNotFoundError:
+            continue
+    return None
+
+
+class GraphCache:
+    """A size-capped cache of graphs which have been loaded but not updated yet.
+
+    Each graph is pickled into a file in the cache directory. The least
+    recently used files are removed when the total size exceeds the limit.
+    """
+
+    def __init__(self, root: str | os.PathLike[str], max_bytes: int) -> None:
+        """Creates a cache.
+
+        Args:
+          root: Cache directory, which is created if it doesn't exist.
+          max_bytes: The maximum total size of cached graphs in bytes.
+        """
+        self._root = os.fspath(root)
+        self._max_bytes = max_bytes
+        os.makedirs(self._root, exist_ok=True)
+
+    @staticmethod
+    def key(
+        method: str,
+        params: Sequence[tuple[str, float]],
+        digest: str,
+        sample: Optional[float] = None,
+        seed: Optional[int] = None,
+        version: Optional[str] = None,
+    ) -> str:
+        """Computes a cache key.
+
+        The key also depends on :data:`FORMAT_VERSION` so that graphs cached
+        in an old format are never restored.
+
+        Args:
+          method: name of the algorithm.
+          params: parameters passed to the graph constructor.
+          digest: digest of the dataset computed by :func:`synthetic.loader.dataset_digest`.
+          sample: fraction of reviewers loaded.
+          seed: seed used to sample reviewers.
+          version: version of the package providing the algorithm computed by :func:`package_version`,
+            so that upgrading the package invalidates its graphs.
+
+        Returns:
+          The cache key.
+        """
+        obj = {
+            "format": FORMAT_VERSION,
+            "method": method,
+            "version": version,
+            "params": sorted(params),
+            "dataset": digest,
+            "sample": sample,
+            "seed": seed,
+        }
+        return hashlib.sha256(json.dumps(obj).encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._root, key + _SUFFIX)
+
+    def get(self, key: str) -> Optional[Graph]:
+        """Restores a cached graph.
+
+        Args:
+          key: The cache key.
+
+        Returns:
+          The graph, or None if it isn't cached.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fp:
+                g: Graph = pickle.load(fp)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            LOGGER.warning("Failed to restore a cached graph %s: %s", path, e)
+            return None
+        os.utime(path)
+        return g
+
+    def put(self, key: str, g: Graph) -> bool:
+        """Stores a graph.
+
+        The graph is written into a temporary file which is renamed to the
+        cache file, so that concurrent readers never see a partial file.
+
+        Args:
+          key: The cache key.
+          g: The graph, which must be picklable.
+
+        Returns:
+          True if the graph is stored.
+        """
+        fd, tmp = tempfile.mkstemp(dir=self._root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                pickle.dump(g, fp, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            LOGGER.warning("Failed to cache a graph: %s", e)
+            os.remove(tmp)
+            return False
+        self._evict()
+        return True
+
+    def _evict(self) -> None:
+        """Removes the least recently used graphs until the total size fits the limit."""
+        entries = []
+        for entry in os.scandir(self._root):
+            if entry.name.endswith(_SUFFIX):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self._max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -22,19 +22,38 @@
 
 import json
 import logging
+import math
 import sys
-from typing import BinaryIO, Final, Optional, TextIO
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from typing import Any, Final, Optional, TextIO
 from importlib.metadata import version
 
 import click
 import numpy as np
-from matplotlib import pyplot
+import numpy.typing as npt
 
 import synthetic
-from synthetic.eval.graph import Graph, list_installed_graphs
-from synthetic.eval.score import calc_anomalous_reviews
-from synthetic.eval.score import dcg as dc_gain
-from synthetic.eval.score import ideal_dcg
+from synthetic.eval.bench import fit as fit_complexity
+from synthetic.eval.bench import scale_bench as run_scale_bench
+from synthetic.eval.cache import GraphCache
+from synthetic.eval.evaluator import Evaluator, dcg_result, ranking_result, threshold_result
+from synthetic.eval.external import read_external_scores
+from synthetic.eval.graph import Graph, Scores, ScoreSnapshot, export_scores, list_installed_graphs
+from synthetic.eval.plot import PLOTTERS, render, render_in_background
+from synthetic.eval.progress import Progress
+from synthetic.eval.queue import LEASE_SECONDS, MAX_ATTEMPTS, QueueExecutor, queue_status, work
+from synthetic.eval.replay import replay as replay_reviews
+from synthetic.eval.significance import METRICS as SIGNIFICANCE_METRICS
+from synthetic.eval.significance import compare
+from synthetic.eval.stats import DatasetStats
+from synthetic.eval.score import anomaly_types
+from synthetic.eval.tune import METRICS, best_trial, evaluate, grid, hyperband, successive_halving
+from synthetic.generator import ANOMALOUS_RATES, DestinationError, PrefixConflictError, inject_files
+from synthetic.loader import ORDERS, Dataset, Order, iter_dataset, read_dataset, sample_dataset
+from synthetic.store import DatasetStore
 
 logging.basicConfig(level=logging.INFO, stream=sys.stderr)
 
@@ -49,13 +68,95 @@ GRAPH_TYPES = sorted(INSTALLED_GRAPHS.keys())
 """
 
 
-def load_graph(method: str, params: list[tuple[str, str]]) -> Graph:
+def new_graph(method: str, params: list[tuple[str, str]]) -> Graph:
     try:
-        return synthetic.load(INSTALLED_GRAPHS[method](**{k: float(v) for k, v in params}))
+        return INSTALLED_GRAPHS[method](**{k: float(v) for k, v in params})
     except TypeError as e:
         sys.exit(f"Failed to initialize a graph object. Some parameter might need to be given via --param flag:\n{e}")
 
 
+def new_evaluator(
+    dataset: Optional[str] = None,
+    workers: int = 1,
+    sample: Optional[float] = None,
+    seed: Optional[int] = None,
+    cache: Optional[GraphCache] = None,
+) -> Evaluator:
+    return Evaluator(dataset, workers, sample, seed, cache, INSTALLED_GRAPHS)
+
+
+def build_graph(
+    evaluator: Evaluator, method: str, params: list[tuple[str, str]], warm_start: Optional[TextIO] = None
+) -> Graph:
+    try:
+        return evaluator.graph(
+            method, [(k, float(v)) for k, v in params], Scores.load(warm_start) if warm_start else None
+        )
+    except TypeError as e:
+        sys.exit(f"Failed to initialize a graph object. Some parameter might need to be given via --param flag:\n{e}")
+
+
+def load_graph(
+    method: str,
+    params: list[tuple[str, str]],
+    dataset: Optional[str] = None,
+    workers: int = 1,
+    sample: Optional[float] = None,
+    seed: Optional[int] = None,
+    cache: Optional[GraphCache] = None,
+) -> Graph:
+    """Builds a graph of an algorithm and loads a dataset into it.
+
+    Use :class:`synthetic.eval.Evaluator` to build graphs of several algorithms from a dataset read once.
+    """
+    if cache is None:
+        return synthetic.load(new_graph(method, params), path=dataset, workers=workers, fraction=sample, seed=seed)
+    return build_graph(new_evaluator(dataset, workers, sample, seed, cache), method, params)
+
+
+def graph_cache(cache_dir: Optional[str], cache_size: int) -> Optional[GraphCache]:
+    return GraphCache(cache_dir, cache_size * 1024 * 1024) if cache_dir else None
+
+
+def plot_results(kind: str, records: list[dict[str, Any]], plot: str, background: bool) -> None:
+    if background:
+        render_in_background(kind, records, plot)
+    else:
+        render(kind, records, plot)
+
+
+def progress_monitor(
+    method: str,
+    loop: int,
+    metrics_port: Optional[int],
+    status_file: Optional[str],
+) -> Progress | nullcontext[None]:
+    """Creates a progress exposed via a metrics server and/or a status file if either is requested."""
+    if metrics_port is None and not status_file:
+        return nullcontext()
+    return Progress(method, loop, metrics_port, status_file)
+
+
+def executor_for(jobs: int, queue: Optional[str]) -> Executor | nullcontext[None]:
+    """Creates an executor which puts jobs into a queue directory, runs them in processes, or nothing if jobs is 1."""
+    if queue:
+        return QueueExecutor(queue)
+    return ProcessPoolExecutor(jobs) if jobs > 1 else nullcontext()
+
+
+def _nan2none(v: float) -> Optional[float]:
+    return None if math.isnan(v) else v
+
+
+def load_dataset(
+    dataset: Optional[str] = None, workers: int = 1, sample: Optional[float] = None, seed: Optional[int] = None
+) -> Dataset:
+    res = read_dataset(dataset, workers)
+    if sample is not None:
+        res = sample_dataset(res, sample, seed)
+    return res
+
+
 @click.group()
 @click.version_option(version("rgmining-synthetic-dataset"))
 def main() -> None:
@@ -77,9 +178,87 @@ def main() -> None:
 @click.option(
     "--output", type=click.File("w"), default=sys.stdout, help="File path to store results (default: stdout)."
 )
-@click.option("--plot", type=click.File("bw"), help="File name of the result graph. If set, plot an ROC curve")
+@click.option(
+    "--dataset",
+    type=click.Path(exists=True, file_okay=False),
+    help="Directory of an external dataset in the same format as the bundled one (default: the synthetic dataset).",
+)
+@click.option(
+    "--workers", type=int, default=1, help="Number of processes parsing the review table of the dataset (default: 1)."
+)
+@click.option(
+    "--sample",
+    type=click.FloatRange(0, 1, min_open=True),
+    metavar="FRACTION",
+    help="If set, load only the subgraph induced by this fraction of reviewers sampled from each type of reviewers.",
+)
+@click.option("--seed", type=int, help="Seed used to sample reviewers.")
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, writable=True),
+    help="If set, cache graphs right after loading the dataset in this directory and reuse them.",
+)
+@click.option(
+    "--cache-size",
+    type=click.IntRange(0),
+    default=1024,
+    metavar="MB",
+    help="Maximum total size of cached graphs in megabytes (default: 1024).",
+)
+@click.option(
+    "--warm-start",
+    type=click.File("r"),
+    metavar="FROM",
+    help="File of scores saved by --save-scores. If set, the algorithm starts from those scores.",
+)
+@click.option("--save-scores", type=click.File("w"), help="File path to store the final scores.")
+@click.option(
+    "--record-scores",
+    type=click.Path(dir_okay=False, writable=True),
+    help="File path to store anomalous scores of reviewers after every iteration in the .npy format.",
+)
+@click.option(
+    "--plot",
+    type=click.Path(dir_okay=False, writable=True),
+    help="File name of the result graph. If set, plot an ROC curve",
+)
+@click.option(
+    "--metrics-port",
+    type=click.IntRange(0, 65535),
+    metavar="PORT",
+    help="If set, serve progress metrics in the Prometheus text format on localhost at this port.",
+)
+@click.option(
+    "--status-file",
+    type=click.Path(dir_okay=False, writable=True),
+    help="If set, rewrite this file with progress metrics in JSON during the run.",
+)
+@click.option(
+    "--approx",
+    type=click.IntRange(1),
+    metavar="BINS",
+    help="If set, compute metrics with a sketch of scores in this number of histogram bins, which approximates AUC.",
+)
+@click.option("--background-plot", is_flag=True, help="Render the result graph in a background process.")
 def threshold(
-    method: str, loop: int, param: list[tuple[str, str]], output: TextIO, plot: Optional[BinaryIO] = None
+    method: str,
+    loop: int,
+    param: list[tuple[str, str]],
+    output: TextIO,
+    dataset: Optional[str] = None,
+    workers: int = 1,
+    sample: Optional[float] = None,
+    seed: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    cache_size: int = 1024,
+    warm_start: Optional[TextIO] = None,
+    save_scores: Optional[TextIO] = None,
+    record_scores: Optional[str] = None,
+    plot: Optional[str] = None,
+    background_plot: bool = False,
+    metrics_port: Optional[int] = None,
+    status_file: Optional[str] = None,
+    approx: Optional[int] = None,
 ) -> None:
     """Threshold based classification.
 
@@ -96,8 +275,52 @@ def threshold(
     parameter `epsilon`. Option `param` specifies those parameters, and
     if you want to set 0.1 to the `epsilon`, pass `--param epsilon 0.1`.
 
+    Option `dataset` loads reviewers, products, and reviews from a directory
+    which has reviewer.dat, product.dat, and review.dat in the same format as
+    the synthetic dataset instead of the bundled one. Those files can be
+    compressed with gzip, bzip2, or xz. Option `workers` sets the number of
+    processes parsing the review file.
+
+    Option `sample` loads only the subgraph induced by the given fraction of
+    reviewers, which are sampled from normal and each type of anomalous
+    reviewers so that their ratio is kept, for quick evaluations. The sample
+    is reproducible with option `seed`.
+
     If a file name is given via `plot`, a ROC curve will be plotted and
     stored in the file.
+    With `--background-plot` flag, the graph is rendered in a background
+    process. The `plot` command also renders the graph from saved results.
+
+    Option `cache-dir` caches the graph right after loading the dataset, and
+    the next run with the same algorithm, parameters, and dataset restores it
+    instead of constructing and loading it again, unless the package providing
+    the algorithm has been upgraded. The least recently used graphs are
+    removed when the total size exceeds `cache-size` megabytes.
+
+    Option `save-scores` stores the final scores of reviewers and products,
+    and option `warm-start` makes the algorithm start from scores stored by
+    another run, e.g., with a neighbouring parameter value, if the algorithm
+    supports importing scores.
+
+    Option `record-scores` stores anomalous scores of reviewers after every
+    iteration into a memory-mapped (iterations x reviewers) array in the .npy
+    format, and their names into a file which has the same name but `.names`
+    extension.
+
+    Option `metrics-port` serves progress metrics, i.e., the current
+    iteration, update latency, throughput in reviews per second, the latest
+    precision and AUC, and the resident memory, in the Prometheus text format
+    at `http://127.0.0.1:PORT/metrics`, and option `status-file` rewrites the
+    given file with them in JSON after every iteration and every few seconds.
+
+    Option `approx` computes the results and the progress metrics with a
+    sketch which counts scores in the given number of histogram bins over
+    [0, 1] and keeps the top-k reviewers, in linear time instead of sorting
+    all scores. The counts and rankings are exact except reviewers with NaN
+    scores are left out of rankings, and the AUC is approximated within the
+    bound given as `auc_error` next to `auc` in the progress metrics. Scores
+    are still read in full after every iteration; only the metrics are
+    approximated.
     \f
 
     Args:
@@ -105,42 +328,40 @@ def threshold(
       loop: the number of iteration (default: 20).
       output: writable object where the output will be written.
       param: list of key and value pair which are connected with "=".
+      dataset: directory of an external dataset. If None, the synthetic dataset is used.
+      workers: the number of processes parsing the review table.
+      sample: if set, the fraction of reviewers to be loaded.
+      seed: seed used to sample reviewers.
+      cache_dir: if set, directory where graphs are cached.
+      cache_size: maximum total size of cached graphs in megabytes.
+      warm_start: readable object of scores the algorithm starts from.
+      save_scores: writable object where the final scores will be written.
+      record_scores: file path to store anomalous scores of reviewers after every iteration.
       plot: file name of the result graph. If set, plot an ROC curve.
+      background_plot: if True, the result graph is rendered in a background process.
+      metrics_port: if set, port on localhost where progress metrics are served.
+      status_file: if set, file path rewritten with progress metrics.
+      approx: if set, the number of bins of the sketch computing the metrics.
     """
-    g = load_graph(method, param)
-
+    evaluator = new_evaluator(dataset, workers, sample, seed, graph_cache(cache_dir, cache_size))
     # If method is ONE, the graph is updated only one time.
-    for _ in range(loop if method != "one" else 1):
-        g.update()
-
-    x, y = [], []
-    normal_reviewer_size = len(g.reviewers) - synthetic.ANOMALOUS_REVIEWER_SIZE
-    for th in np.linspace(0, 1, 100):
-        a = [r for r in g.reviewers if r.anomalous_score >= th]
-
-        tp = sum(calc_anomalous_reviews(a))
-        fp = len(a) - tp
-        fn = synthetic.ANOMALOUS_REVIEWER_SIZE - tp
-        tn = normal_reviewer_size - fp
-
-        json.dump(
-            {"threshold": th, "true-positive": tp, "true-negative": tn, "false-positive": fp, "false-negative": fn},
-            output,
-        )
-        output.write("\n")
+    loop = loop if method != "one" else 1
+    with progress_monitor(method, loop, metrics_port, status_file) as progress:
+        g = build_graph(evaluator, method, param, warm_start)
+        if progress:
+            # Reviews of the dataset read to build the graph give the throughput without reading it again.
+            progress.reviews = evaluator.reviews
+        snapshot = evaluator.run(g, loop, record_scores=record_scores, progress=progress, bins=approx)
+    if save_scores:
+        export_scores(g).dump(save_scores)
 
-        x.append(fp / normal_reviewer_size)
-        y.append(tp / synthetic.ANOMALOUS_REVIEWER_SIZE)
+    records = evaluator.threshold(snapshot, approx).records()
+    for res in records:
+        json.dump(res, output)
+        output.write("\n")
 
     if plot:
-        pyplot.plot(x, y)
-        pyplot.xlabel("False positive rate")
-        pyplot.ylabel("True positive rate")
-        pyplot.xlim(0, 1)
-        pyplot.ylim(0, 1)
-        pyplot.title("AUC: {0}".format(-round(np.trapezoid(y, x), 5)))
-        pyplot.tight_layout()
-        pyplot.savefig(plot)
+        plot_results("threshold", records, plot, background_plot)
 
 
 @main.command()
@@ -156,14 +377,100 @@ def threshold(
 @click.option(
     "--output", type=click.File("w"), default=sys.stdout, help="File path to store results (default: stdout)."
 )
-@click.option("--plot", type=click.File("bw"), help="File name of the result graph. If set, plot an ROC curve")
+@click.option(
+    "--dataset",
+    type=click.Path(exists=True, file_okay=False),
+    help="Directory of an external dataset in the same format as the bundled one (default: the synthetic dataset).",
+)
+@click.option(
+    "--workers", type=int, default=1, help="Number of processes parsing the review table of the dataset (default: 1)."
+)
+@click.option(
+    "--sample",
+    type=click.FloatRange(0, 1, min_open=True),
+    metavar="FRACTION",
+    help="If set, load only the subgraph induced by this fraction of reviewers sampled from each type of reviewers.",
+)
+@click.option("--seed", type=int, help="Seed used to sample reviewers.")
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, writable=True),
+    help="If set, cache graphs right after loading the dataset in this directory and reuse them.",
+)
+@click.option(
+    "--cache-size",
+    type=click.IntRange(0),
+    default=1024,
+    metavar="MB",
+    help="Maximum total size of cached graphs in megabytes (default: 1024).",
+)
+@click.option(
+    "--warm-start",
+    type=click.File("r"),
+    metavar="FROM",
+    help="File of scores saved by --save-scores. If set, the algorithm starts from those scores.",
+)
+@click.option("--save-scores", type=click.File("w"), help="File path to store the final scores.")
+@click.option(
+    "--record-scores",
+    type=click.Path(dir_okay=False, writable=True),
+    help="File path to store anomalous scores of reviewers after every iteration in the .npy format.",
+)
+@click.option(
+    "--plot",
+    type=click.Path(dir_okay=False, writable=True),
+    help="File name of the result graph. If set, plot an ROC curve",
+)
+@click.option(
+    "--pipeline",
+    is_flag=True,
+    help="Evaluate snapshots of scores in a background thread while the algorithm runs the next iteration.",
+)
+@click.option(
+    "--metrics-port",
+    type=click.IntRange(0, 65535),
+    metavar="PORT",
+    help="If set, serve progress metrics in the Prometheus text format on localhost at this port.",
+)
+@click.option(
+    "--status-file",
+    type=click.Path(dir_okay=False, writable=True),
+    help="If set, rewrite this file with progress metrics in JSON during the run.",
+)
+@click.option(
+    "--approx",
+    type=click.IntRange(1),
+    metavar="BINS",
+    help="If set, compute metrics with a sketch of scores in this number of histogram bins, which approximates AUC.",
+)
+@click.option("--background-plot", is_flag=True, help="Render the result graph in a background process.")
 def ranking(
-    method: str, loop: int, param: list[tuple[str, str]], output: TextIO, plot: Optional[BinaryIO] = None
+    method: str,
+    loop: int,
+    param: list[tuple[str, str]],
+    output: TextIO,
+    dataset: Optional[str] = None,
+    workers: int = 1,
+    sample: Optional[float] = None,
+    seed: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    cache_size: int = 1024,
+    warm_start: Optional[TextIO] = None,
+    save_scores: Optional[TextIO] = None,
+    record_scores: Optional[str] = None,
+    plot: Optional[str] = None,
+    background_plot: bool = False,
+    pipeline: bool = False,
+    metrics_port: Optional[int] = None,
+    status_file: Optional[str] = None,
+    approx: Optional[int] = None,
 ) -> None:
     """Ranking based classification.
 
     Runs a given algorithm and classifies reviewers who have top 57 highest
-    anomalous degree as anomalous.
+    anomalous degree as anomalous, where 57 is the number of anomalous
+    reviewers in the synthetic dataset and is replaced with the number of
+    anomalous reviewers of the given dataset.
     After every iteration, outputs precision of anomalous reviewers in JSON
     format.
 
@@ -178,8 +485,56 @@ def ranking(
     parameter `epsilon`. Option `param` specifies those parameters, and
     if you want to set 0.1 to the `epsilon`, pass `--param epsilon 0.1`.
 
+    Option `dataset` loads reviewers, products, and reviews from a directory
+    which has reviewer.dat, product.dat, and review.dat in the same format as
+    the synthetic dataset instead of the bundled one. Those files can be
+    compressed with gzip, bzip2, or xz. Option `workers` sets the number of
+    processes parsing the review file.
+
+    Option `sample` loads only the subgraph induced by the given fraction of
+    reviewers, which are sampled from normal and each type of anomalous
+    reviewers so that their ratio is kept, for quick evaluations. The sample
+    is reproducible with option `seed`.
+
     If a file name is given via `--plot` flag, a ROC curve will be plotted and
     stored in the file.
+    With `--background-plot` flag, the graph is rendered in a background
+    process. The `plot` command also renders the graph from saved results.
+
+    Option `cache-dir` caches the graph right after loading the dataset, and
+    the next run with the same algorithm, parameters, and dataset restores it
+    instead of constructing and loading it again, unless the package providing
+    the algorithm has been upgraded. The least recently used graphs are
+    removed when the total size exceeds `cache-size` megabytes.
+
+    Option `save-scores` stores the final scores of reviewers and products,
+    and option `warm-start` makes the algorithm start from scores stored by
+    another run, e.g., with a neighbouring parameter value, if the algorithm
+    supports importing scores.
+
+    Option `record-scores` stores anomalous scores of reviewers after every
+    iteration into a memory-mapped (iterations x reviewers) array in the .npy
+    format, and their names into a file which has the same name but `.names`
+    extension.
+
+    Option `metrics-port` serves progress metrics, i.e., the current
+    iteration, update latency, throughput in reviews per second, the latest
+    precision and AUC, and the resident memory, in the Prometheus text format
+    at `http://127.0.0.1:PORT/metrics`, and option `status-file` rewrites the
+    given file with them in JSON after every iteration and every few seconds.
+
+    With `--pipeline` flag, anomalous scores are copied after every iteration
+    and a background thread ranks them and writes the results while the
+    algorithm runs the next iteration.
+
+    Option `approx` computes the results and the progress metrics with a
+    sketch which counts scores in the given number of histogram bins over
+    [0, 1] and keeps the top-k reviewers, in linear time instead of sorting
+    all scores. The counts and rankings are exact except reviewers with NaN
+    scores are left out of rankings, and the AUC is approximated within the
+    bound given as `auc_error` next to `auc` in the progress metrics. Scores
+    are still read in full after every iteration; only the metrics are
+    approximated.
     \f
 
     Args:
@@ -187,59 +542,60 @@ def ranking(
       loop: the number of iteration (default: 20).
       output: writable object where the output will be written.
       param: list of key and value pair which are connected with "=".
+      dataset: directory of an external dataset. If None, the synthetic dataset is used.
+      workers: the number of processes parsing the review table.
+      sample: if set, the fraction of reviewers to be loaded.
+      seed: seed used to sample reviewers.
+      cache_dir: if set, directory where graphs are cached.
+      cache_size: maximum total size of cached graphs in megabytes.
+      warm_start: readable object of scores the algorithm starts from.
+      save_scores: writable object where the final scores will be written.
+      record_scores: file path to store anomalous scores of reviewers after every iteration.
       plot: file name of the result graph. If set, plot a graph.
+      background_plot: if True, the result graph is rendered in a background process.
+      pipeline: if True, results are computed in a background thread.
+      metrics_port: if set, port on localhost where progress metrics are served.
+      status_file: if set, file path rewritten with progress metrics.
+      approx: if set, the number of bins of the sketch computing the metrics.
     """
-    g = load_graph(method, param)
-
-    num_of_reviewers = len(g.reviewers)
-    num_of_type1, num_of_type2, num_of_type3 = calc_anomalous_reviews(g.reviewers)
-
-    a1_list, a2_list, a3_list, e_list = [], [], [], []
-    for i in range(loop if method != "one" else 1):
-        g.update()
-
-        a = sorted(g.reviewers, key=lambda r: r.anomalous_score, reverse=True)[:57]
-        type1, type2, type3 = calc_anomalous_reviews(a)
-        error = len(a) - (type1 + type2 + type3)
-
-        a1 = type1 / num_of_type1
-        a2 = type2 / num_of_type2
-        a3 = type3 / num_of_type3
-        e = error / num_of_reviewers
-
-        json.dump(
-            {
-                "a1": int(type1),
-                "a1-precision": a1,
-                "a2": int(type2),
-                "a2-precision": a2,
-                "a3": int(type3),
-                "a3-precision": a3,
-                "error": int(error),
-                "error-rate": e,
-                "loop": i,
-            },
-            output,
-        )
-        output.write("\n")
+    evaluator = new_evaluator(dataset, workers, sample, seed, graph_cache(cache_dir, cache_size))
+    # If method is ONE, the graph is updated only one time.
+    loop = loop if method != "one" else 1
+    with progress_monitor(method, loop, metrics_port, status_file) as progress:
+        g = build_graph(evaluator, method, param, warm_start)
+        if progress:
+            # Reviews of the dataset read to build the graph give the throughput without reading it again.
+            progress.reviews = evaluator.reviews
+        snapshot = ScoreSnapshot(g)
+        types = snapshot.types
+
+        records = []
 
-        a1_list.append(a1)
-        a2_list.append(a2)
-        a3_list.append(a3)
-        e_list.append(e)
+        def emit(i: int, scores: npt.NDArray[np.float64]) -> None:
+            res = ranking_result(scores, types, i, approx).record()
+            json.dump(res, output)
+            output.write("\n")
+            records.append(res)
 
+        pool: ThreadPoolExecutor | nullcontext[None] = ThreadPoolExecutor(1) if pipeline else nullcontext()
+        with pool as executor:
+            pending: deque[Future[None]] = deque()
+            for i in evaluator.updates(g, loop, snapshot, record_scores, progress, approx):
+                scores = snapshot.scores()
+                if executor is None:
+                    emit(i, scores)
+                    continue
+                # Keep at most two snapshots waiting so that they don't pile up if evaluations are slower than updates.
+                while len(pending) >= 2:
+                    pending.popleft().result()
+                pending.append(executor.submit(emit, i, scores))
+            for f in pending:
+                f.result()
+
+    if save_scores:
+        export_scores(g).dump(save_scores)
     if plot:
-        x = np.arange(len(a1_list))
-        pyplot.plot(x, a1_list, label="a1")
-        pyplot.plot(x, a2_list, label="a2")
-        pyplot.plot(x, a3_list, label="a3")
-        pyplot.plot(x, e_list, label="error")
-        pyplot.xlim(1, len(a1_list))
-        pyplot.ylim(0)
-        pyplot.xlabel("iteration")
-        pyplot.legend()
-        pyplot.tight_layout()
-        pyplot.savefig(plot)
+        plot_results("ranking", records, plot, background_plot)
 
 
 @main.command()
@@ -255,19 +611,144 @@ def ranking(
 @click.option(
     "--output", type=click.File("w"), default=sys.stdout, help="File path to store results (default: stdout)."
 )
-@click.option("--plot", type=click.File("bw"), help="File name of the result graph. If set, plot an ROC curve")
-def dcg(method: str, loop: int, param: list[tuple[str, str]], output: TextIO, plot: Optional[BinaryIO] = None) -> None:
+@click.option(
+    "--dataset",
+    type=click.Path(exists=True, file_okay=False),
+    help="Directory of an external dataset in the same format as the bundled one (default: the synthetic dataset).",
+)
+@click.option(
+    "--workers", type=int, default=1, help="Number of processes parsing the review table of the dataset (default: 1)."
+)
+@click.option(
+    "--sample",
+    type=click.FloatRange(0, 1, min_open=True),
+    metavar="FRACTION",
+    help="If set, load only the subgraph induced by this fraction of reviewers sampled from each type of reviewers.",
+)
+@click.option("--seed", type=int, help="Seed used to sample reviewers.")
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, writable=True),
+    help="If set, cache graphs right after loading the dataset in this directory and reuse them.",
+)
+@click.option(
+    "--cache-size",
+    type=click.IntRange(0),
+    default=1024,
+    metavar="MB",
+    help="Maximum total size of cached graphs in megabytes (default: 1024).",
+)
+@click.option(
+    "--warm-start",
+    type=click.File("r"),
+    metavar="FROM",
+    help="File of scores saved by --save-scores. If set, the algorithm starts from those scores.",
+)
+@click.option("--save-scores", type=click.File("w"), help="File path to store the final scores.")
+@click.option(
+    "--record-scores",
+    type=click.Path(dir_okay=False, writable=True),
+    help="File path to store anomalous scores of reviewers after every iteration in the .npy format.",
+)
+@click.option(
+    "--plot",
+    type=click.Path(dir_okay=False, writable=True),
+    help="File name of the result graph. If set, plot an ROC curve",
+)
+@click.option(
+    "--metrics-port",
+    type=click.IntRange(0, 65535),
+    metavar="PORT",
+    help="If set, serve progress metrics in the Prometheus text format on localhost at this port.",
+)
+@click.option(
+    "--status-file",
+    type=click.Path(dir_okay=False, writable=True),
+    help="If set, rewrite this file with progress metrics in JSON during the run.",
+)
+@click.option(
+    "--approx",
+    type=click.IntRange(1),
+    metavar="BINS",
+    help="If set, compute metrics with a sketch of scores in this number of histogram bins, which approximates AUC.",
+)
+@click.option("--background-plot", is_flag=True, help="Render the result graph in a background process.")
+def dcg(
+    method: str,
+    loop: int,
+    param: list[tuple[str, str]],
+    output: TextIO,
+    dataset: Optional[str] = None,
+    workers: int = 1,
+    sample: Optional[float] = None,
+    seed: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    cache_size: int = 1024,
+    warm_start: Optional[TextIO] = None,
+    save_scores: Optional[TextIO] = None,
+    record_scores: Optional[str] = None,
+    plot: Optional[str] = None,
+    background_plot: bool = False,
+    metrics_port: Optional[int] = None,
+    status_file: Optional[str] = None,
+    approx: Optional[int] = None,
+) -> None:
     """Evaluate an anomalous degree ranking by DCG.
 
     Runs a given algorithm and outputs Discounted Cumulative Gain (DCG) score
-    for each k in 1 to 57.
+    for each k in 1 to 57, i.e., the number of anomalous reviewers in the
+    dataset.
 
     Some algorithm requires a set of parameters. For example, feagle requires
     parameter `epsilon`. Option `param` specifies those parameters, and
     if you want to set 0.1 to the `epsilon`, pass `--param epsilon=0.1`.
 
+    Option `dataset` loads reviewers, products, and reviews from a directory
+    which has reviewer.dat, product.dat, and review.dat in the same format as
+    the synthetic dataset instead of the bundled one. Those files can be
+    compressed with gzip, bzip2, or xz. Option `workers` sets the number of
+    processes parsing the review file.
+
+    Option `sample` loads only the subgraph induced by the given fraction of
+    reviewers, which are sampled from normal and each type of anomalous
+    reviewers so that their ratio is kept, for quick evaluations. The sample
+    is reproducible with option `seed`.
+
     If a file name is given via `--plot` flag, a nDCG curve will be plotted and
     stored in the file.
+    With `--background-plot` flag, the graph is rendered in a background
+    process. The `plot` command also renders the graph from saved results.
+
+    Option `cache-dir` caches the graph right after loading the dataset, and
+    the next run with the same algorithm, parameters, and dataset restores it
+    instead of constructing and loading it again, unless the package providing
+    the algorithm has been upgraded. The least recently used graphs are
+    removed when the total size exceeds `cache-size` megabytes.
+
+    Option `save-scores` stores the final scores of reviewers and products,
+    and option `warm-start` makes the algorithm start from scores stored by
+    another run, e.g., with a neighbouring parameter value, if the algorithm
+    supports importing scores.
+
+    Option `record-scores` stores anomalous scores of reviewers after every
+    iteration into a memory-mapped (iterations x reviewers) array in the .npy
+    format, and their names into a file which has the same name but `.names`
+    extension.
+
+    Option `metrics-port` serves progress metrics, i.e., the current
+    iteration, update latency, throughput in reviews per second, the latest
+    precision and AUC, and the resident memory, in the Prometheus text format
+    at `http://127.0.0.1:PORT/metrics`, and option `status-file` rewrites the
+    given file with them in JSON after every iteration and every few seconds.
+
+    Option `approx` computes the results and the progress metrics with a
+    sketch which counts scores in the given number of histogram bins over
+    [0, 1] and keeps the top-k reviewers, in linear time instead of sorting
+    all scores. The counts and rankings are exact except reviewers with NaN
+    scores are left out of rankings, and the AUC is approximated within the
+    bound given as `auc_error` next to `auc` in the progress metrics. Scores
+    are still read in full after every iteration; only the metrics are
+    approximated.
     \f
 
     Args:
@@ -275,27 +756,853 @@ def dcg(method: str, loop: int, param: list[tuple[str, str]], output: TextIO, pl
       loop: the number of iteration (default: 20).
       output: writable object where the output will be written.
       param: list of key and value pair which are connected with "=".
+      dataset: directory of an external dataset. If None, the synthetic dataset is used.
+      workers: the number of processes parsing the review table.
+      sample: if set, the fraction of reviewers to be loaded.
+      seed: seed used to sample reviewers.
+      cache_dir: if set, directory where graphs are cached.
+      cache_size: maximum total size of cached graphs in megabytes.
+      warm_start: readable object of scores the algorithm starts from.
+      save_scores: writable object where the final scores will be written.
+      record_scores: file path to store anomalous scores of reviewers after every iteration.
       plot: file name of the result graph. If set, plot a nDCG curve.
+      background_plot: if True, the result graph is rendered in a background process.
+      metrics_port: if set, port on localhost where progress metrics are served.
+      status_file: if set, file path rewritten with progress metrics.
+      approx: if set, the number of bins of the sketch computing the metrics.
     """
-    g = load_graph(method, param)
+    evaluator = new_evaluator(dataset, workers, sample, seed, graph_cache(cache_dir, cache_size))
+    # If method is ONE, the graph is updated only one time.
+    loop = loop if method != "one" else 1
+    with progress_monitor(method, loop, metrics_port, status_file) as progress:
+        g = build_graph(evaluator, method, param, warm_start)
+        if progress:
+            # Reviews of the dataset read to build the graph give the throughput without reading it again.
+            progress.reviews = evaluator.reviews
+        snapshot = evaluator.run(g, loop, record_scores=record_scores, progress=progress, bins=approx)
+    if save_scores:
+        export_scores(g).dump(save_scores)
+
+    records = evaluator.dcg(snapshot, approx).records()
+    for res in records:
+        json.dump(res, output)
+        output.write("\n")
+
+    if plot:
+        plot_results("dcg", records, plot, background_plot)
+
+
+@main.command()
+@click.argument("method", type=click.Choice(GRAPH_TYPES, case_sensitive=False))
+@click.option("--every", type=click.IntRange(1), metavar="N", help="Update the graph after every N reviews.")
+@click.option(
+    "--interval",
+    type=click.FloatRange(0, min_open=True),
+    metavar="T",
+    help="Update the graph every T simulated seconds.",
+)
+@click.option(
+    "--rate",
+    type=click.FloatRange(0, min_open=True),
+    help="If set, feed this number of reviews per wall-clock second, which is also the number of reviews per "
+    "simulated second if the dataset doesn't have timestamps (default: as fast as possible, and 1.0).",
+)
+@click.option(
+    "--param",
+    type=(str, str),
+    multiple=True,
+    metavar="KEY VALUE",
+    help="Key and value pair passed to the chosen algorithm. This option can be set multiply.",
+)
+@click.option(
+    "--output", type=click.File("w"), default=sys.stdout, help="File path to store results (default: stdout)."
+)
+@click.option(
+    "--dataset",
+    type=click.Path(exists=True, file_okay=False),
+    help="Directory of an external dataset in the same format as the bundled one (default: the synthetic dataset).",
+)
+@click.option(
+    "--workers", type=int, default=1, help="Number of processes parsing the review table of the dataset (default: 1)."
+)
+@click.option(
+    "--sample",
+    type=click.FloatRange(0, 1, min_open=True),
+    metavar="FRACTION",
+    help="If set, load only the subgraph induced by this fraction of reviewers sampled from each type of reviewers.",
+)
+@click.option("--seed", type=int, help="Seed used to sample reviewers.")
+def replay(
+    method: str,
+    every: Optional[int],
+    interval: Optional[float],
+    param: list[tuple[str, str]],
+    output: TextIO,
+    dataset: Optional[str] = None,
+    workers: int = 1,
+    sample: Optional[float] = None,
+    seed: Optional[int] = None,
+    rate: Optional[float] = None,
+) -> None:
+    """Replay reviews in time order to benchmark an online algorithm.
+
+    Feeds reviews to a given algorithm in the order of their timestamps and
+    updates it after every N reviews given via `every` and/or every T seconds
+    of simulated time given via `interval`.
 
-    for _ in range(loop if method != "one" else 1):
-        g.update()
+    Option `rate` paces the feed like a live stream, i.e., the i-th review
+    isn't fed until i / rate seconds have passed, so that an algorithm whose
+    updates are slower than the stream lags behind it. If the dataset doesn't
+    have timestamps, reviews arrive in the order of the review file at the
+    same rate in simulated time, or one per second without `rate`.
 
-    x, y = [], []
-    for k in range(1, synthetic.ANOMALOUS_REVIEWER_SIZE + 1):
-        score = dc_gain(g.reviewers, k) / ideal_dcg(k)
-        json.dump({"k": k, "score": score}, output)
+    After every update, outputs a JSON object which has the index of the
+    step, the number of reviews fed so far, the simulated time, wall-clock
+    seconds spent to feed the reviews and to update the algorithm, seconds
+    the feed lags behind the rate, and the precision of the top-k anomalous
+    reviewers where k is the number of anomalous reviewers fed so far.
+    \f
+
+    Args:
+      method: name of algorithm.
+      every: the number of reviews between updates.
+      interval: simulated seconds between updates.
+      param: list of key and value pair which are connected with "=".
+      output: writable object where the output will be written.
+      dataset: directory of an external dataset. If None, the synthetic dataset is used.
+      workers: the number of processes parsing the review table.
+      sample: if set, the fraction of reviewers to be loaded.
+      seed: seed used to sample reviewers.
+      rate: if set, reviews fed per wall-clock second.
+    """
+    if every is None and interval is None:
+        raise click.UsageError("Either --every or --interval is required.")
+
+    g = new_graph(method, param)
+    for step in replay_reviews(g, load_dataset(dataset, workers, sample, seed), every, interval, rate):
+        json.dump({**step._asdict(), "precision": _nan2none(step.precision)}, output)
         output.write("\n")
 
-        x.append(k)
-        y.append(score)
+
+@main.command()
+@click.argument("kind", type=click.Choice(sorted(PLOTTERS), case_sensitive=False))
+@click.argument("results", type=click.File("r"))
+@click.argument("output", type=click.Path(dir_okay=False, writable=True))
+def plot(kind: str, results: TextIO, output: str) -> None:
+    """Plot results of an evaluation command.
+
+    Reads results of threshold, ranking, or dcg command, which is specified
+    by `kind`, from a file `results`, and plots the same graph as the command
+    with `--plot` flag into a file `output`.
+    \f
+
+    Args:
+      kind: name of the evaluation command.
+      results: readable object of the results.
+      output: file name of the result graph.
+    """
+    render(kind, [json.loads(line) for line in results if line.strip()], output)
+
+
+@main.command()
+@click.argument("method", type=click.Choice(GRAPH_TYPES, case_sensitive=False))
+@click.option(
+    "--loop", type=click.IntRange(1), default=20, metavar="LOOP", help="Maximum number of iteration (default: 20)."
+)
+@click.option(
+    "--param",
+    type=(str, str),
+    multiple=True,
+    metavar="KEY VALUES",
+    help="Parameter name and its comma-separated candidate values. This option can be set multiply.",
+)
+@click.option(
+    "--metric", type=click.Choice(sorted(METRICS)), default="auc", help="Metric to be maximized (default: auc)."
+)
+@click.option(
+    "--strategy",
+    type=click.Choice(["hyperband", "halving"]),
+    default="hyperband",
+    help="Search strategy (default: hyperband).",
+)
+@click.option("--eta", type=click.IntRange(2), default=3, help="Reduction factor of candidates (default: 3).")
+@click.option(
+    "--min-loop",
+    type=click.IntRange(1),
+    default=1,
+    help="Number of iteration in the first round of successive halving (default: 1).",
+)
+@click.option(
+    "--jobs", type=click.IntRange(1), default=1, help="Number of processes evaluating candidates (default: 1)."
+)
+@click.option(
+    "--queue",
+    type=click.Path(file_okay=False),
+    help="If set, put evaluations into this queue directory and wait for `queue-work` workers instead of --jobs.",
+)
+@click.option(
+    "--output", type=click.File("w"), default=sys.stdout, help="File path to store results (default: stdout)."
+)
+@click.option(
+    "--dataset",
+    type=click.Path(exists=True, file_okay=False),
+    help="Directory of an external dataset in the same format as the bundled one (default: the synthetic dataset).",
+)
+@click.option(
+    "--sample",
+    type=click.FloatRange(0, 1, min_open=True),
+    metavar="FRACTION",
+    help="If set, load only the subgraph induced by this fraction of reviewers sampled from each type of reviewers.",
+)
+@click.option("--seed", type=int, help="Seed used to sample reviewers and candidates.")
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, writable=True),
+    help="If set, cache graphs right after loading the dataset in this directory and reuse them.",
+)
+@click.option(
+    "--cache-size",
+    type=click.IntRange(0),
+    default=1024,
+    metavar="MB",
+    help="Maximum total size of cached graphs in megabytes (default: 1024).",
+)
+def tune(
+    method: str,
+    loop: int,
+    param: list[tuple[str, str]],
+    metric: str,
+    strategy: str,
+    eta: int,
+    min_loop: int,
+    jobs: int,
+    output: TextIO,
+    dataset: Optional[str] = None,
+    sample: Optional[float] = None,
+    seed: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    cache_size: int = 1024,
+    queue: Optional[str] = None,
+) -> None:
+    """Search parameters of an algorithm.
+
+    Evaluates every combination of candidate values given via `param` with
+    successive halving or Hyperband, which is chosen by `strategy`.
+    The budget of an evaluation is the number of iterations: all candidates
+    are evaluated after a few iterations, and only the best 1/eta of them
+    are evaluated again with eta times more iterations until the number of
+    iterations reaches `loop`. Candidates of algorithms which can export and
+    import their scores continue from the previous round, and only the extra
+    iterations are run. Hyperband runs successive halving several times with
+    different trade-offs between the number of candidates and the number of
+    iterations.
+
+    Candidates are evaluated by `metric`; auc is the area under the ROC curve,
+    ndcg and precision are computed for the top-k ranking where k is the
+    number of anomalous reviewers. For example, `--param epsilon 0.1,0.2,0.3`
+    searches the best `epsilon` among three values.
+
+    Option `cache-dir` caches graphs right after loading the dataset so that
+    evaluations of the same candidate with more iterations don't construct
+    and load the graph again.
+
+    Option `queue` puts evaluations into a queue directory instead of running
+    them in local processes, and any number of `queue-work` commands on hosts
+    sharing the directory run them. Evaluations already in the queue are
+    reused, so a sweep interrupted and run again resumes. Then, `cache-dir`
+    and `dataset` must be paths accessible from the workers.
+
+    Outputs a JSON object for each evaluation and the best parameters at last.
+    \f
+
+    Args:
+      method: name of algorithm.
+      loop: the maximum number of iteration.
+      param: list of pairs of a parameter name and its comma-separated candidate values.
+      metric: name of the metric to be maximized.
+      strategy: hyperband or halving.
+      eta: the reduction factor.
+      min_loop: the number of iteration in the first round of successive halving.
+      jobs: the number of processes evaluating candidates.
+      output: writable object where the output will be written.
+      dataset: directory of an external dataset. If None, the synthetic dataset is used.
+      sample: if set, the fraction of reviewers to be loaded.
+      seed: seed used to sample reviewers and candidates.
+      cache_dir: if set, directory where graphs are cached.
+      cache_size: maximum total size of cached graphs in megabytes.
+      queue: if set, queue directory where evaluations are put.
+    """
+    try:
+        configs = grid({k: [float(v) for v in values.split(",")] for k, values in param})
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--param") from e
+
+    evaluator = partial(evaluate, method, metric, dataset, sample, seed, cache=graph_cache(cache_dir, cache_size))
+    with executor_for(jobs, queue) as executor:
+        if strategy == "halving":
+            search = successive_halving(evaluator, configs, min_loop, loop, eta, executor)
+        else:
+            search = hyperband(evaluator, configs, loop, eta, executor, seed)
+
+        trials = []
+        for t in search:
+            json.dump(
+                {
+                    "bracket": t.bracket,
+                    "rung": t.rung,
+                    "params": dict(t.params),
+                    "loop": t.loop,
+                    metric: _nan2none(t.score),
+                },
+                output,
+            )
+            output.write("\n")
+            trials.append(t)
+
+    best = best_trial(trials)
+    json.dump({"best": dict(best.params), "loop": best.loop, metric: _nan2none(best.score)}, output)
+    output.write("\n")
+
+
+@main.command()
+@click.argument("scores_a", metavar="A", type=click.File("r"))
+@click.argument("scores_b", metavar="B", type=click.File("r"))
+@click.option(
+    "--metric",
+    type=click.Choice(sorted(SIGNIFICANCE_METRICS)),
+    default="auc",
+    help="Metric to be compared; nDCG is computed for the top-k ranking where k is the number of anomalous "
+    "reviewers (default: auc).",
+)
+@click.option(
+    "--resamples", type=click.IntRange(1), default=10000, help="Number of resamples of each test (default: 10000)."
+)
+@click.option(
+    "--alpha",
+    type=click.FloatRange(0, 1, min_open=True, max_open=True),
+    default=0.05,
+    help="Significance level of the confidence interval (default: 0.05).",
+)
+@click.option("--seed", type=int, help="Seed used to resample reviewers.")
+@click.option("--jobs", type=click.IntRange(1), default=1, help="Number of processes resampling (default: 1).")
+@click.option(
+    "--queue",
+    type=click.Path(file_okay=False),
+    help="If set, put --jobs parts of resamples into this queue directory and wait for `queue-work` workers.",
+)
+@click.option(
+    "--output", type=click.File("w"), default=sys.stdout, help="File path to store results (default: stdout)."
+)
+def significance(
+    scores_a: TextIO,
+    scores_b: TextIO,
+    metric: str,
+    resamples: int,
+    alpha: float,
+    seed: Optional[int],
+    jobs: int,
+    output: TextIO,
+    queue: Optional[str] = None,
+) -> None:
+    """Test whether two methods differ significantly.
+
+    Reads final scores of two runs written by `--save-scores` option from
+    files `A` and `B`, and compares a metric of them over the reviewers in
+    both files. The confidence interval of the difference of the metric, A
+    minus B, is computed by resampling reviewers with bootstrap, and the
+    p-value is computed by a paired permutation test swapping scores of the
+    two methods at random.
+
+    Option `queue` puts `jobs` parts of the resamples into a queue directory,
+    and `queue-work` commands on hosts sharing the directory run them.
+    \f
+
+    Args:
+      scores_a: readable object of the scores of the method A.
+      scores_b: readable object of the scores of the method B.
+      metric: name of the metric.
+      resamples: the number of resamples of each test.
+      alpha: the significance level of the confidence interval.
+      seed: seed used to resample reviewers.
+      jobs: the number of processes resampling, or the number of parts of resamples if queue is set.
+      output: writable object where the output will be written.
+      queue: if set, queue directory where parts of resamples are put.
+    """
+    a = Scores.load(scores_a).reviewers
+    b = Scores.load(scores_b).reviewers
+    names = sorted(a.keys() & b.keys())
+    if len(names) != len(a) or len(names) != len(b):
+        LOGGER.warning("Only %d reviewers rated in both files are compared.", len(names))
+
+    with executor_for(jobs, queue) as executor:
+        res = compare(
+            [a[n] for n in names],
+            [b[n] for n in names],
+            anomaly_types(names) > 0,
+            metric=metric,
+            resamples=resamples,
+            alpha=alpha,
+            seed=seed,
+            executor=executor,
+            jobs=jobs,
+        )
+
+    json.dump(
+        {
+            "metric": res.metric,
+            "a": _nan2none(res.a),
+            "b": _nan2none(res.b),
+            "difference": _nan2none(res.difference),
+            "low": _nan2none(res.low),
+            "high": _nan2none(res.high),
+            "p-value": res.p_value,
+            "resamples": res.resamples,
+        },
+        output,
+    )
+    output.write("\n")
+
+
+@main.command(name="evaluate-scores")
+@click.argument("kind", type=click.Choice(sorted(PLOTTERS), case_sensitive=False))
+@click.argument("scores", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--output", type=click.File("w"), default=sys.stdout, help="File path to store results (default: stdout)."
+)
+@click.option(
+    "--dataset",
+    type=click.Path(exists=True, file_okay=False),
+    help="Directory of an external dataset in the same format as the bundled one (default: the synthetic dataset).",
+)
+@click.option(
+    "--plot",
+    type=click.Path(dir_okay=False, writable=True),
+    help="File name of the result graph. If set, plot the same graph as the evaluation command.",
+)
+@click.option(
+    "--approx",
+    type=click.IntRange(1),
+    metavar="BINS",
+    help="If set, compute metrics with a sketch of scores in this number of histogram bins, which approximates AUC.",
+)
+@click.option("--background-plot", is_flag=True, help="Render the result graph in a background process.")
+def evaluate_scores(
+    kind: str,
+    scores: str,
+    output: TextIO,
+    dataset: Optional[str] = None,
+    plot: Optional[str] = None,
+    background_plot: bool = False,
+    approx: Optional[int] = None,
+) -> None:
+    """Evaluate scores computed outside this package.
+
+    Reads anomalous scores of reviewers from a file `scores`, which has
+    `reviewer_name score` lines and can be compressed with gzip, bzip2, or xz,
+    or is a .npy file whose reviewer names are in a file with the same name but
+    `.names` extension, e.g., written by `--record-scores` option, and outputs
+    the same results as threshold, ranking, or dcg command, which is specified
+    by `kind`. If the .npy file has scores of every iteration, the last ones
+    are evaluated.
+
+    The file is read chunk by chunk and joined with reviewers in the dataset,
+    of which only the reviewer table is read. Reviewers in the dataset but not
+    in the file are ranked last, and reviewers not in the dataset are ignored.
+
+    Option `approx` computes the results with a sketch of the given number of
+    histogram bins in linear time like the evaluation commands, where
+    reviewers without scores are left out of rankings.
+    \f
+
+    Args:
+      kind: name of the evaluation command.
+      scores: path to the score file.
+      output: writable object where the output will be written.
+      dataset: directory of an external dataset. If None, the synthetic dataset is used.
+      plot: file name of the result graph. If set, plot a graph.
+      background_plot: if True, the result graph is rendered in a background process.
+      approx: if set, the number of bins of the sketch computing the results.
+    """
+    try:
+        values, types = read_external_scores(scores, dataset)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="SCORES") from e
+
+    kind = kind.lower()
+    if kind == "threshold":
+        records = threshold_result(values, types, approx).records()
+    elif kind == "ranking":
+        records = [ranking_result(values, types, 0, approx).record()]
+    else:
+        records = dcg_result(values, types, approx).records()
+    for res in records:
+        json.dump(res, output)
+        output.write("\n")
 
     if plot:
-        pyplot.plot(x, y)
-        pyplot.xlabel("k")
-        pyplot.ylabel("nDCG")
-        pyplot.xlim(1, synthetic.ANOMALOUS_REVIEWER_SIZE)
-        pyplot.ylim(0, 1.1)
-        pyplot.tight_layout()
-        pyplot.savefig(plot)
+        plot_results(kind, records, plot, background_plot)
+
+
+@main.command()
+@click.option(
+    "--dataset",
+    type=click.Path(exists=True, file_okay=False),
+    help="Directory of an external dataset in the same format as the bundled one (default: the synthetic dataset).",
+)
+@click.option(
+    "--workers", type=int, default=1, help="Number of processes parsing the review table of the dataset (default: 1)."
+)
+@click.option("--stream", is_flag=True, help="Read the review table chunk by chunk instead of loading it at once.")
+@click.option(
+    "--output", type=click.File("w"), default=sys.stdout, help="File path to store results (default: stdout)."
+)
+def stats(output: TextIO, dataset: Optional[str] = None, workers: int = 1, stream: bool = False) -> None:
+    """Profile a dataset.
+
+    Computes degree distributions of reviewers and products, a histogram of
+    review scores, scores of each type of reviewers, and densities of
+    collusion blocks, i.e., anomalous reviewers of each type and the products
+    they review.
+    \f
+
+    Args:
+      output: writable object where the output will be written.
+      dataset: directory of an external dataset. If None, the synthetic dataset is used.
+      workers: the number of processes parsing the review table of the dataset.
+      stream: if True, the review table is read chunk by chunk.
+    """
+    res = DatasetStats()
+    for chunk in iter_dataset(dataset) if stream else [read_dataset(dataset, workers)]:
+        res.add(chunk)
+    json.dump(res.summary(), output)
+    output.write("\n")
+
+
+@main.command(name="scale-bench")
+@click.argument("method", type=click.Choice(GRAPH_TYPES, case_sensitive=False))
+@click.option(
+    "--sizes",
+    default="1000,10000,100000,1000000,10000000",
+    metavar="N,...",
+    help="Comma-separated numbers of reviewers of generated datasets (default: 1000,10000,100000,1000000,10000000).",
+)
+@click.option("--loop", type=click.IntRange(1), default=3, metavar="LOOP", help="Number of iteration (default: 3).")
+@click.option(
+    "--budget",
+    type=click.FloatRange(0, min_open=True),
+    metavar="SECONDS",
+    help="Time budget of each size. Larger sizes are skipped once a size runs out of it.",
+)
+@click.option(
+    "--param",
+    type=(str, str),
+    multiple=True,
+    metavar="KEY VALUE",
+    help="Key and value pair passed to the chosen algorithm. This option can be set multiply.",
+)
+@click.option("--seed", type=int, help="Seed used to generate datasets.")
+@click.option(
+    "--store",
+    type=click.Path(file_okay=False),
+    help="Directory where generated datasets are stored and reused; it requires --seed.",
+)
+@click.option(
+    "--store-size",
+    type=click.IntRange(0),
+    default=1024,
+    metavar="MB",
+    help="Maximum total size of stored datasets in megabytes (default: 1024).",
+)
+@click.option(
+    "--order",
+    type=click.Choice(ORDERS),
+    default="file",
+    help="Order of reviewers, products, and reviews added to the graph (default: file).",
+)
+@click.option(
+    "--output", type=click.File("w"), default=sys.stdout, help="File path to store results (default: stdout)."
+)
+def scale_bench(
+    method: str,
+    sizes: str,
+    loop: int,
+    budget: Optional[float],
+    param: list[tuple[str, str]],
+    seed: Optional[int],
+    output: TextIO,
+    store: Optional[str] = None,
+    store_size: int = 1024,
+    order: Order = "file",
+) -> None:
+    """Benchmark scalability of an algorithm.
+
+    Generates datasets which have the given numbers of reviewers in increasing
+    order, and measures seconds to load each dataset, to construct a graph of
+    the algorithm, and to update it `loop` times, and the peak memory, which
+    is the growth over the memory of the child process right after it started.
+    Outputs a JSON object for each size and fitted complexity curves at last,
+    i.e., exponents and coefficients of time and memory against the number of
+    reviews.
+
+    Option `order` reorders reviewers, products, and reviews before they are
+    added to the graph; degree sorts nodes by their degrees, rcm applies the
+    reverse Cuthill-McKee ordering, and product groups reviews by products.
+    Comparing the update time with the default order, file, shows the effect
+    of memory locality on the algorithm. The time to reorder is included in
+    the load time.
+    \f
+
+    Args:
+      method: name of algorithm.
+      sizes: comma-separated numbers of reviewers.
+      loop: the number of iteration for each size.
+      budget: if set, seconds allowed for each size.
+      param: list of key and value pair which are connected with "=".
+      seed: seed used to generate datasets.
+      output: writable object where the output will be written.
+      store: if set, directory where generated datasets are stored.
+      store_size: maximum total size of stored datasets in megabytes.
+      order: order of reviewers, products, and reviews added to the graph.
+    """
+    try:
+        numbers = sorted(int(v) for v in sizes.split(","))
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--sizes") from e
+    if store and seed is None:
+        raise click.BadParameter("--store requires --seed", param_hint="--store")
+
+    results = []
+    datasets = DatasetStore(store, store_size * 1024 * 1024) if store else None
+    for r in run_scale_bench(partial(new_graph, method, param), numbers, loop, budget, seed, datasets, order):
+        json.dump({**r._asdict(), "update": r.update}, output)
+        output.write("\n")
+        output.flush()
+        results.append(r)
+
+    json.dump({"fit": {name: f._asdict() for name, f in fit_complexity(results).items()}}, output)
+    output.write("\n")
+
+
+@main.command()
+@click.argument("root", metavar="STORE", type=click.Path(file_okay=False))
+@click.option(
+    "--dataset",
+    type=click.Path(exists=True, file_okay=False),
+    help="Directory of an external dataset to be converted (default: the synthetic dataset).",
+)
+@click.option("--reviewers", type=click.IntRange(1), help="Generate a dataset of this number of reviewers instead.")
+@click.option("--products", type=click.IntRange(1), help="Number of products of the generated dataset.")
+@click.option("--seed", type=int, default=0, help="Seed used to generate the dataset (default: 0).")
+@click.option(
+    "--time-span",
+    type=(float, float),
+    metavar="START END",
+    help="If set, reviews of the generated dataset have POSIX timestamps drawn uniformly from this range.",
+)
+@click.option(
+    "--workers", type=int, default=1, help="Number of processes parsing the review table of the dataset (default: 1)."
+)
+@click.option(
+    "--store-size",
+    type=click.IntRange(0),
+    default=1024,
+    metavar="MB",
+    help="Maximum total size of stored datasets in megabytes (default: 1024).",
+)
+@click.option(
+    "--output", type=click.File("w"), default=sys.stdout, help="File path to store results (default: stdout)."
+)
+def store(
+    root: str,
+    seed: int,
+    workers: int,
+    store_size: int,
+    output: TextIO,
+    dataset: Optional[str] = None,
+    reviewers: Optional[int] = None,
+    products: Optional[int] = None,
+    time_span: Optional[tuple[float, float]] = None,
+) -> None:
+    """Store a dataset in the binary form.
+
+    Converts a dataset, or generates one if `--reviewers` is given, into the
+    binary form in the store directory `STORE` unless the same dataset is
+    already stored, and outputs the directory of the stored dataset, which can
+    be passed to `--dataset` option of the other commands to skip parsing.
+
+    Option `time-span` gives timestamps to reviews of the generated dataset,
+    so that the `replay` command replays them in time order.
+    \f
+
+    Args:
+      root: directory of the store.
+      seed: seed used to generate the dataset.
+      workers: the number of processes parsing the review table of the dataset.
+      store_size: maximum total size of stored datasets in megabytes.
+      output: writable object where the output will be written.
+      dataset: directory of an external dataset. If None, the synthetic dataset is used.
+      reviewers: if set, the number of reviewers of the generated dataset.
+      products: the number of products of the generated dataset.
+      time_span: if set, the range of timestamps of reviews of the generated dataset.
+    """
+    if time_span is not None and time_span[0] > time_span[1]:
+        raise click.BadParameter("START must not be after END", param_hint="--time-span")
+    datasets = DatasetStore(root, store_size * 1024 * 1024)
+    if reviewers is not None:
+        key = datasets.generator_key(reviewers, products, seed=seed, times=time_span)
+        hit = datasets.get(key) is not None
+        path = datasets.generated(reviewers, products, seed=seed, times=time_span)
+    else:
+        key = datasets.source_key(dataset)
+        hit = datasets.get(key) is not None
+        path = datasets.converted(dataset, workers)
+    json.dump({"key": key, "path": path, "hit": hit}, output)
+    output.write("\n")
+
+
+@main.command()
+@click.argument("destination", type=click.Path(file_okay=False, writable=True))
+@click.option(
+    "--dataset",
+    type=click.Path(exists=True, file_okay=False),
+    help="Directory of an external dataset in the same format as the bundled one (default: the synthetic dataset).",
+)
+@click.option(
+    "--type1",
+    type=click.FloatRange(0),
+    default=ANOMALOUS_RATES[0],
+    help=f"Number of independent anomalous reviewers relative to the reviewers (default: {ANOMALOUS_RATES[0]}).",
+)
+@click.option(
+    "--type2",
+    type=click.FloatRange(0),
+    default=ANOMALOUS_RATES[1],
+    help=f"Number of colluding `_1` anomalous reviewers relative to the reviewers (default: {ANOMALOUS_RATES[1]}).",
+)
+@click.option(
+    "--type3",
+    type=click.FloatRange(0),
+    default=ANOMALOUS_RATES[2],
+    help=f"Number of colluding `_2` anomalous reviewers relative to the reviewers (default: {ANOMALOUS_RATES[2]}).",
+)
+@click.option("--prefix", default="s", help="Prefix of the names of injected reviewers (default: s).")
+@click.option("--seed", type=int, help="Seed used to inject reviewers.")
+@click.option(
+    "--output", type=click.File("w"), default=sys.stdout, help="File path to store results (default: stdout)."
+)
+def inject(
+    destination: str,
+    type1: float,
+    type2: float,
+    type3: float,
+    prefix: str,
+    seed: Optional[int],
+    output: TextIO,
+    dataset: Optional[str] = None,
+) -> None:
+    """Inject anomalous reviewers into a dataset.
+
+    Copies a dataset into `DESTINATION` adding independent and colluding
+    anomalous reviewers and their reviews, so that algorithms can be evaluated
+    with the dataset via `--dataset` option. The review table is streamed, and
+    outputs the numbers of injected reviewers of each type and their reviews.
+    \f
+
+    Args:
+      destination: directory where the new dataset is written.
+      type1: the number of independent anomalous reviewers relative to the reviewers.
+      type2: the number of colluding `_1` anomalous reviewers relative to the reviewers.
+      type3: the number of colluding `_2` anomalous reviewers relative to the reviewers.
+      prefix: prefix of the names of injected reviewers.
+      seed: seed used to inject reviewers.
+      output: writable object where the output will be written.
+      dataset: directory of an external dataset. If None, the synthetic dataset is used.
+    """
+    try:
+        res = inject_files(dataset, destination, (type1, type2, type3), seed, prefix)
+    except PrefixConflictError as e:
+        raise click.BadParameter(str(e), param_hint="--prefix") from e
+    except DestinationError as e:
+        raise click.BadParameter(str(e), param_hint="DESTINATION") from e
+    except ValueError as e:
+        raise click.BadParameter(f"malformed dataset: {e}", param_hint="--dataset") from e
+
+    counts = np.bincount(anomaly_types(res.reviewer_names), minlength=4)
+    json.dump(
+        {
+            "type1": int(counts[1]),
+            "type2": int(counts[2]),
+            "type3": int(counts[3]),
+            "reviews": len(res.review_scores),
+        },
+        output,
+    )
+    output.write("\n")
+
+
+@main.command(name="queue-work")
+@click.argument("queue", type=click.Path(file_okay=False))
+@click.option(
+    "--idle-timeout",
+    type=click.FloatRange(0),
+    metavar="SECONDS",
+    help="If set, exit after no jobs are found for this time. Otherwise, wait for new jobs forever.",
+)
+@click.option(
+    "--lease",
+    type=click.FloatRange(0, min_open=True),
+    default=LEASE_SECONDS,
+    metavar="SECONDS",
+    help=f"Seconds after which a job of a dead worker is taken over by another worker (default: {LEASE_SECONDS:g}).",
+)
+@click.option(
+    "--max-attempts",
+    type=click.IntRange(1),
+    default=MAX_ATTEMPTS,
+    help=f"Number of attempts of a job before it fails (default: {MAX_ATTEMPTS}).",
+)
+@click.option(
+    "--output", type=click.File("w"), default=sys.stdout, help="File path to store results (default: stdout)."
+)
+def queue_work(
+    queue: str, lease: float, max_attempts: int, output: TextIO, idle_timeout: Optional[float] = None
+) -> None:
+    """Run jobs in a queue directory.
+
+    Runs jobs which `--queue` option of `tune` and `significance` puts into
+    the queue directory `QUEUE`. Any number of workers on hosts sharing the
+    directory can run at once; each job is leased to one worker, and a job
+    whose worker stops renewing its lease is run again by another worker.
+    Outputs the number of jobs this worker finished.
+
+    Jobs are pickles which are run as they are, so the directory must be
+    writable only by trusted users.
+    \f
+
+    Args:
+      queue: queue directory.
+      lease: seconds a lease lasts unless it is renewed.
+      max_attempts: the number of attempts of a job before it fails.
+      output: writable object where the output will be written.
+      idle_timeout: if set, seconds to wait for new jobs before exiting.
+    """
+    finished = work(queue, idle_timeout=idle_timeout, lease_seconds=lease, max_attempts=max_attempts)
+    json.dump({"finished": finished}, output)
+    output.write("\n")
+
+
+@main.command(name="queue-status")
+@click.argument("queue", type=click.Path(file_okay=False))
+@click.option(
+    "--output", type=click.File("w"), default=sys.stdout, help="File path to store results (default: stdout)."
+)
+def queue_status_command(queue: str, output: TextIO) -> None:
+    """Show the numbers of pending, running, done, and failed jobs in a queue directory.
+    \f
+
+    Args:
+      queue: queue directory.
+      output: writable object where the output will be written.
+    """
+    json.dump(queue_status(queue)._asdict(), output)
+    output.write("\n")
@@ -0,0 +1,442 @@
+#
+#  evaluator.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Evaluates review graph mining algorithms in process.
+
+:class:`Evaluator` reads a dataset once, builds graphs of installed
+algorithms from it, runs updates calling hooks after each of them, and
+computes the results of the threshold, ranking, and dcg commands as arrays,
+so that many evaluations can run in one process without the command line
+interface.
+"""
+
+import logging
+import os
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from typing import Any, Final, NamedTuple, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+import synthetic
+from synthetic.eval.cache import GraphCache, package_version
+from synthetic.eval.graph import Graph, GraphConstructor, Scores, ScoreSnapshot, import_scores, list_installed_graphs
+from synthetic.eval.progress import Progress
+from synthetic.eval.record import ScoreRecorder
+from synthetic.eval.score import ScoreSketch, auc, dcg_curve, ideal_dcg, precision_at_k
+from synthetic.loader import Dataset, dataset_digest, read_dataset, sample_dataset
+
+LOGGER: Final = logging.getLogger(__name__)
+
+THRESHOLDS: Final = np.linspace(0, 1, 100)
+"""Thresholds of anomalous scores at which reviewers are classified."""
+
+Hook = Callable[[int, ScoreSnapshot], None]
+"""A function called with the index of an iteration and the snapshot of the graph after each update."""
+
+
+class ThresholdResult(NamedTuple):
+    """Confusion matrices of classifying reviewers whose anomalous scores are at least each threshold as anomalous."""
+
+    thresholds: npt.NDArray[np.float64]
+    """Thresholds."""
+    true_positive: npt.NDArray[np.int64]
+    """The number of anomalous reviewers classified as anomalous at each threshold."""
+    true_negative: npt.NDArray[np.int64]
+    """The number of normal reviewers classified as normal at each threshold."""
+    false_positive: npt.NDArray[np.int64]
+    """The number of normal reviewers classified as anomalous at each threshold."""
+    false_negative: npt.NDArray[np.int64]
+    """The number of anomalous reviewers classified as normal at each threshold."""
+    auc: float
+    """Area under the ROC curve of the anomalous scores."""
+    auc_error: float = 0.0
+    """Bound of the absolute error of :attr:`auc`, which is 0 unless it is approximated with a sketch."""
+
+    def records(self) -> list[dict[str, Any]]:
+        """Returns the results in the output format of the threshold command."""
+        return [
+            {"threshold": th, "true-positive": tp, "true-negative": tn, "false-positive": fp, "false-negative": fn}
+            for th, tp, tn, fp, fn in zip(
+                self.thresholds.tolist(),
+                self.true_positive.tolist(),
+                self.true_negative.tolist(),
+                self.false_positive.tolist(),
+                self.false_negative.tolist(),
+                strict=True,
+            )
+        ]
+
+
+class RankingResult(NamedTuple):
+    """Reviewers in the top-k ranking, where k is the number of anomalous reviewers."""
+
+    loop: int
+    """Index of the iteration."""
+    found: npt.NDArray[np.int64]
+    """The numbers of normal, type-1, type-2, and type-3 anomalous reviewers in the ranking."""
+    totals: npt.NDArray[np.int64]
+    """The numbers of normal, type-1, type-2, and type-3 anomalous reviewers in the graph."""
+
+    @property
+    def precisions(self) -> npt.NDArray[np.float64]:
+        """Fractions of type-1, type-2, and type-3 anomalous reviewers found in the ranking."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.found[1:] / self.totals[1:]
+
+    @property
+    def error_rate(self) -> float:
+        """The number of normal reviewers in the ranking divided by the number of reviewers."""
+        total = self.totals.sum()
+        return float(self.found[0] / total) if total else 0.0
+
+    def record(self) -> dict[str, Any]:
+        """Returns the result in the output format of the ranking command.
+
+        The precision of a type without reviewers in the graph is None so that the record stays valid JSON.
+        """
+        error, type1, type2, type3 = self.found.tolist()
+        precisions = [float(p) if n else None for p, n in zip(self.precisions, self.totals[1:])]
+        return {
+            "a1": type1,
+            "a1-precision": precisions[0],
+            "a2": type2,
+            "a2-precision": precisions[1],
+            "a3": type3,
+            "a3-precision": precisions[2],
+            "error": error,
+            "error-rate": self.error_rate,
+            "loop": self.loop,
+        }
+
+
+class DcgResult(NamedTuple):
+    """nDCG of the top-k ranking for each k up to the number of anomalous reviewers."""
+
+    ndcg: npt.NDArray[np.float64]
+    """nDCG at k = 1, 2, ..., the number of anomalous reviewers."""
+
+    def records(self) -> list[dict[str, Any]]:
+        """Returns the results in the output format of the dcg command."""
+        return [{"k": k, "score": v} for k, v in enumerate(self.ndcg.tolist(), start=1)]
+
+
+def _sketch(
+    scores: npt.NDArray[np.float64], anomalous: npt.NDArray[np.bool_], k: int, bins: int, thresholds: npt.ArrayLike = ()
+) -> ScoreSketch:
+    """Creates a sketch of anomalous scores over [0, 1] keeping the top-k reviewers."""
+    res = ScoreSketch(k, bins, thresholds=thresholds)
+    res.add(scores, anomalous)
+    return res
+
+
+def threshold_result(
+    scores: npt.NDArray[np.float64], types: npt.NDArray[np.int8], bins: Optional[int] = None
+) -> ThresholdResult:
+    """Classifies reviewers with every threshold in :data:`THRESHOLDS`.
+
+    Args:
+      scores: anomalous scores of reviewers.
+      types: types of the reviewers computed by :meth:`synthetic.eval.score.anomaly_types`.
+      bins: if set, reviewers are counted with a :class:`synthetic.eval.score.ScoreSketch` of this
+        number of bins, which keeps the counts exact but approximates the AUC within :attr:`ThresholdResult.auc_error`.
+        Only the result is approximated; *scores* are still held in memory.
+
+    Returns:
+      The confusion matrices.
+    """
+    anomalous = types > 0
+    if bins is not None:
+        sketch = _sketch(scores, anomalous, 0, bins, THRESHOLDS)
+        tp, fp, _ = sketch.at_least(THRESHOLDS)
+        area, error = sketch.auc()
+    else:
+        valid = ~np.isnan(scores)
+        # The number of scores at least a threshold is the number of scores minus the position of the threshold.
+        positive = np.count_nonzero(valid) - np.searchsorted(np.sort(scores[valid]), THRESHOLDS)
+        tp = np.count_nonzero(valid & anomalous) - np.searchsorted(np.sort(scores[valid & anomalous]), THRESHOLDS)
+        fp = positive - tp
+        area, error = auc(scores, anomalous), 0.0
+    return ThresholdResult(
+        thresholds=THRESHOLDS,
+        true_positive=tp.astype(np.int64),
+        true_negative=(len(scores) - int(anomalous.sum()) - fp).astype(np.int64),
+        false_positive=fp.astype(np.int64),
+        false_negative=(int(anomalous.sum()) - tp).astype(np.int64),
+        auc=area,
+        auc_error=error,
+    )
+
+
+def ranking_result(
+    scores: npt.NDArray[np.float64], types: npt.NDArray[np.int8], loop: int, bins: Optional[int] = None
+) -> RankingResult:
+    """Counts each type of reviewers in the top-k ranking, where k is the number of anomalous reviewers.
+
+    Args:
+      scores: anomalous scores of reviewers.
+      types: types of the reviewers computed by :meth:`synthetic.eval.score.anomaly_types`.
+      loop: the index of the iteration.
+      bins: if set, the ranking is taken from a :class:`synthetic.eval.score.ScoreSketch` of this
+        number of bins in linear time, which leaves out reviewers with NaN scores.
+
+    Returns:
+      The numbers of reviewers.
+    """
+    totals = np.bincount(types, minlength=4).astype(np.int64)
+    k = int(totals[1:].sum())
+    if bins is not None:
+        top = types[_sketch(scores, types > 0, k, bins).top_index]
+    else:
+        # A stable sort keeps tied reviewers in the same order as sorted() does.
+        top = types[np.argsort(-scores, kind="stable")[:k]]
+    return RankingResult(loop, np.bincount(top, minlength=4).astype(np.int64), totals)
+
+
+def dcg_result(scores: npt.NDArray[np.float64], types: npt.NDArray[np.int8], bins: Optional[int] = None) -> DcgResult:
+    """Computes nDCG of the top-k ranking for each k up to the number of anomalous reviewers.
+
+    Args:
+      scores: anomalous scores of reviewers.
+      types: types of the reviewers computed by :meth:`synthetic.eval.score.anomaly_types`.
+      bins: if set, the ranking is taken from a :class:`synthetic.eval.score.ScoreSketch` of this
+        number of bins in linear time, which leaves out reviewers with NaN scores.
+
+    Returns:
+      The nDCG curve.
+    """
+    anomalous = types > 0
+    k = int(anomalous.sum())
+    curve = _sketch(scores, anomalous, k, bins).dcg_curve() if bins is not None else dcg_curve(scores, anomalous, k)
+    return DcgResult(np.array([v / ideal_dcg(k) for k, v in enumerate(curve.tolist(), start=1)], dtype=np.float64))
+
+
+class Evaluator:
+    """Evaluates algorithms with a dataset read only once.
+
+    The dataset is read when the first graph which isn't in the cache is
+    built, and graphs of any algorithms and parameters are loaded from it.
+
+    Example:
+
+    .. code-block:: python
+
+       evaluator = Evaluator(sample=0.1, seed=0)
+       g = evaluator.graph("mutual")
+       snapshot = evaluator.run(g, 10)
+       print(evaluator.ranking(snapshot).precisions)
+    """
+
+    def __init__(
+        self,
+        dataset: Optional[str | os.PathLike[str]] = None,
+        workers: int = 1,
+        sample: Optional[float] = None,
+        seed: Optional[int] = None,
+        cache: Optional[GraphCache] = None,
+        graphs: Optional[Mapping[str, GraphConstructor]] = None,
+    ) -> None:
+        """Creates an evaluator.
+
+        Args:
+          dataset: directory of an external dataset. If None, the synthetic dataset is used.
+          workers: the number of processes parsing the review table.
+          sample: if set, the fraction of reviewers to be loaded.
+          seed: seed used to sample reviewers.
+          cache: if given, the cache of graphs right after loading the dataset.
+          graphs: constructors of graphs keyed by names of algorithms (default: the installed ones).
+        """
+        self._path = dataset
+        self._workers = workers
+        self._sample = sample
+        self._seed = seed
+        self._cache = cache
+        self._graphs = graphs if graphs is not None else list_installed_graphs()
+        self._dataset: Optional[Dataset] = None
+        self._digest: Optional[str] = None
+
+    @property
+    def methods(self) -> list[str]:
+        """Names of available algorithms."""
+        return sorted(self._graphs)
+
+    @property
+    def dataset(self) -> Dataset:
+        """The dataset, which is read at the first access."""
+        if self._dataset is None:
+            res = read_dataset(self._path, self._workers)
+            if self._sample is not None:
+                res = sample_dataset(res, self._sample, self._seed)
+            self._dataset = res
+        return self._dataset
+
+    @property
+    def reviews(self) -> Optional[int]:
+        """The number of reviews in the dataset, or None if it hasn't been read, e.g., all graphs were cached."""
+        return len(self._dataset.review_scores) if self._dataset is not None else None
+
+    @property
+    def digest(self) -> str:
+        """The digest of the dataset files, which is computed at the first access."""
+        if self._digest is None:
+            self._digest = dataset_digest(self._path)
+        return self._digest
+
+    def graph(
+        self,
+        method: str,
+        params: Mapping[str, float] | Iterable[tuple[str, float]] = (),
+        warm_start: Optional[Scores] = None,
+    ) -> Graph:
+        """Builds a graph of an algorithm and loads the dataset into it.
+
+        Args:
+          method: name of the algorithm.
+          params: parameters passed to the constructor of the algorithm.
+          warm_start: if given, scores the algorithm starts from.
+
+        Returns:
+          The graph.
+
+        Raises:
+          ValueError: if the algorithm isn't available.
+          TypeError: if the constructor doesn't accept the parameters.
+        """
+        if method not in self._graphs:
+            raise ValueError(f"unknown algorithm: {method}")
+        kwargs = dict(params)
+
+        g: Optional[Graph] = None
+        key = ""
+        if self._cache is not None:
+            key = GraphCache.key(
+                method,
+                list(kwargs.items()),
+                self.digest,
+                self._sample,
+                self._seed,
+                package_version(self._graphs[method]),
+            )
+            g = self._cache.get(key)
+            if g is not None:
+                LOGGER.info("Restored a cached graph.")
+        if g is None:
+            g = synthetic.load(self._graphs[method](**kwargs), path=self.dataset)
+            if self._cache is not None:
+                self._cache.put(key, g)
+
+        if warm_start is not None:
+            import_scores(g, warm_start)
+        return g
+
+    @staticmethod
+    def updates(
+        g: Graph,
+        loop: int,
+        snapshot: Optional[ScoreSnapshot] = None,
+        record_scores: Optional[str] = None,
+        progress: Optional[Progress] = None,
+        bins: Optional[int] = None,
+    ) -> Iterator[int]:
+        """Updates a graph *loop* times and yields the index of each iteration after the update.
+
+        Args:
+          g: the graph.
+          loop: the number of iterations.
+          snapshot: if given, used to read scores instead of creating a new one.
+          record_scores: if set, file path to store anomalous scores of reviewers after every iteration.
+          progress: if given, updated with the latency of each update and the precision and AUC after it.
+          bins: if set, the precision and AUC given to *progress* are computed with a
+            :class:`synthetic.eval.score.ScoreSketch` of this number of bins, which approximates the AUC and
+            gives *progress* its error bound. The sketch is fed from the full score vector read by *snapshot*
+            after each update, so only the metrics are approximated, not the memory to read the scores.
+
+        Yields:
+          The index of each iteration.
+        """
+        if snapshot is None:
+            snapshot = ScoreSnapshot(g)
+        recorder = ScoreRecorder(record_scores, snapshot, loop) if record_scores else None
+        anomalous = snapshot.types > 0
+        try:
+            for i in range(loop):
+                if progress:
+                    progress.start_update(i)
+                g.update()
+                if recorder:
+                    recorder.record()
+                if progress:
+                    scores = snapshot.scores()
+                    if bins is not None:
+                        sketch = _sketch(scores, anomalous, int(anomalous.sum()), bins)
+                        progress.finish_update(sketch.precision(), *sketch.auc())
+                    else:
+                        progress.finish_update(
+                            precision_at_k(scores, anomalous, int(anomalous.sum())), auc(scores, anomalous), 0.0
+                        )
+                yield i
+        finally:
+            if recorder:
+                recorder.close()
+
+    def run(
+        self,
+        g: Graph,
+        loop: int,
+        hooks: Iterable[Hook] = (),
+        record_scores: Optional[str] = None,
+        progress: Optional[Progress] = None,
+        bins: Optional[int] = None,
+    ) -> ScoreSnapshot:
+        """Updates a graph *loop* times calling hooks after each update.
+
+        Args:
+          g: the graph.
+          loop: the number of iterations.
+          hooks: functions called with the index of the iteration and the snapshot after each update.
+          record_scores: if set, file path to store anomalous scores of reviewers after every iteration.
+          progress: if given, updated with the latency of each update and the precision and AUC after it.
+          bins: if set, the number of bins of the sketch computing the metrics given to *progress* from the
+            full score vector after each update.
+
+        Returns:
+          The snapshot of the graph, which reads the final scores.
+        """
+        hooks = list(hooks)
+        snapshot = ScoreSnapshot(g)
+        for i in self.updates(g, loop, snapshot, record_scores, progress, bins):
+            for hook in hooks:
+                hook(i, snapshot)
+        return snapshot
+
+    @staticmethod
+    def threshold(snapshot: ScoreSnapshot, bins: Optional[int] = None) -> ThresholdResult:
+        """Classifies reviewers in a graph with every threshold in :data:`THRESHOLDS`."""
+        return threshold_result(snapshot.scores(), snapshot.types, bins)
+
+    @staticmethod
+    def ranking(snapshot: ScoreSnapshot, loop: int = 0, bins: Optional[int] = None) -> RankingResult:
+        """Counts each type of reviewers in the top-k ranking of a graph, where k is the number of anomalous ones."""
+        return ranking_result(snapshot.scores(), snapshot.types, loop, bins)
+
+    @staticmethod
+    def dcg(snapshot: ScoreSnapshot, bins: Optional[int] = None) -> DcgResult:
+        """Computes nDCG of the top-k ranking of a graph for each k up to the number of anomalous reviewers."""
+        return dcg_result(snapshot.scores(), snapshot.types, bins)
@@ -0,0 +1,172 @@
+#
+#  external.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Reads anomalous scores computed outside this package.
+
+Scores are read in chunks from ``reviewer_name score`` text files, which can
+be compressed with gzip, bzip2, or xz, or from ``.npy`` files with reviewer-name
+indexes in the format of :class:`synthetic.eval.record.ScoreRecorder`, and
+joined with reviewers of a dataset, so that they are evaluated in the same way
+as scores of installed algorithms without keeping the whole file in memory.
+"""
+
+import logging
+import os
+from collections.abc import Iterable, Iterator
+from typing import Final
+
+import numpy as np
+import numpy.typing as npt
+
+from synthetic.eval.record import index_path
+from synthetic.eval.score import anomaly_types
+from synthetic.loader import line_chunks, open_table, read_reviewer_names
+
+LOGGER: Final = logging.getLogger(__name__)
+
+CHUNK_REVIEWERS: Final = 1 << 20
+"""The number of reviewers read from a ``.npy`` file at once."""
+
+
+def _parse_scores(buf: bytes) -> tuple[npt.NDArray[np.str_], npt.NDArray[np.float64]]:
+    """Parses ``reviewer_name score`` lines.
+
+    Args:
+      buf: Whole lines of a score file.
+
+    Returns:
+      A tuple of a name array and a score array.
+    """
+    tokens = buf.split()
+    if len(tokens) % 2:
+        raise ValueError("each line must consist of a reviewer name and a score")
+    if not tokens:
+        return np.empty(0, dtype=np.str_), np.empty(0, dtype=np.float64)
+    return np.char.decode(np.array(tokens[0::2]), "utf-8"), np.array(tokens[1::2]).astype(np.float64)
+
+
+def _read_text(path: str) -> Iterator[tuple[npt.NDArray[np.str_], npt.NDArray[np.float64]]]:
+    with open_table(path) as fp:
+        for buf in line_chunks(fp):
+            names, scores = _parse_scores(buf)
+            if len(names):
+                yield names, scores
+
+
+def _read_npy(path: str) -> Iterator[tuple[npt.NDArray[np.str_], npt.NDArray[np.float64]]]:
+    scores = np.load(path, mmap_mode="r", allow_pickle=False)
+    if scores.ndim == 2:
+        # A record of every iteration, whose last row has the final scores.
+        scores = scores[-1] if len(scores) else scores.reshape(-1)
+    if scores.ndim != 1:
+        raise ValueError(f"scores must be a 1-D or 2-D array: {path}")
+
+    start = 0
+    with open_table(index_path(path)) as fp:
+        for buf in line_chunks(fp):
+            names = np.array(buf.decode().split(), dtype=np.str_)
+            for i in range(0, len(names), CHUNK_REVIEWERS):
+                chunk = names[i : i + CHUNK_REVIEWERS]
+                if start + len(chunk) > len(scores):
+                    raise ValueError(f"the index has more names than scores: {index_path(path)}")
+                yield chunk, np.asarray(scores[start : start + len(chunk)], dtype=np.float64)
+                start += len(chunk)
+    if start != len(scores):
+        raise ValueError(f"the index has fewer names than scores: {index_path(path)}")
+
+
+def read_score_chunks(path: str | os.PathLike[str]) -> Iterator[tuple[npt.NDArray[np.str_], npt.NDArray[np.float64]]]:
+    """Reads a score file chunk by chunk.
+
+    Args:
+      path: Path to a ``reviewer_name score`` text file, or a ``.npy`` file
+        whose reviewer names are in the file with the same name but ``.names``
+        extension. If the ``.npy`` file has an (iterations x reviewers) array,
+        the scores of the last iteration are read.
+
+    Yields:
+      Tuples of reviewer names and their scores.
+
+    Raises:
+      ValueError: if the file isn't in either format.
+    """
+    path = os.fspath(path)
+    if path.endswith(".npy"):
+        yield from _read_npy(path)
+    else:
+        yield from _read_text(path)
+
+
+def join_scores(
+    names: npt.NDArray[np.str_], chunks: Iterable[tuple[npt.NDArray[np.str_], npt.NDArray[np.float64]]]
+) -> npt.NDArray[np.float64]:
+    """Aligns scores given in chunks with reviewers.
+
+    Reviewers are looked up in a sorted copy of *names* so that each chunk is
+    joined with vectorized binary searches.
+
+    Args:
+      names: Names of the reviewers.
+      chunks: Tuples of reviewer names and their scores.
+
+    Returns:
+      An array of the scores of the reviewers in the order of *names*, where
+      reviewers without scores have NaN. Scores of unknown reviewers are ignored.
+    """
+    order = np.argsort(names, kind="stable")
+    keys = np.asarray(names)[order]
+    res = np.full(len(names), np.nan)
+    rated = np.zeros(len(names), dtype=bool)
+    unknown = 0
+    for chunk, scores in chunks:
+        if not len(keys):
+            unknown += len(chunk)
+            continue
+        pos = np.minimum(np.searchsorted(keys, chunk), len(keys) - 1)
+        found = keys[pos] == chunk
+        res[order[pos[found]]] = scores[found]
+        rated[order[pos[found]]] = True
+        unknown += len(chunk) - int(np.count_nonzero(found))
+
+    if unknown:
+        LOGGER.warning("Ignored %d scores of reviewers who aren't in the dataset.", unknown)
+    if missing := len(names) - int(np.count_nonzero(rated)):
+        LOGGER.warning("%d reviewers in the dataset don't have scores and are ranked last.", missing)
+    return res
+
+
+def read_external_scores(
+    path: str | os.PathLike[str], dataset: str | os.PathLike[str] | None = None
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.int8]]:
+    """Reads a score file and joins it with reviewers of a dataset.
+
+    Only the reviewer table of the dataset is read.
+
+    Args:
+      path: Path to the score file, which :meth:`read_score_chunks` reads.
+      dataset: Directory of the dataset. If None, the bundled dataset is used.
+
+    Returns:
+      A tuple of the scores of the reviewers, which are NaN if the file
+      doesn't have them, and their types computed by
+      :meth:`synthetic.eval.score.anomaly_types`.
+    """
+    names = read_reviewer_names(dataset)
+    return join_scores(names, read_score_chunks(path)), anomaly_types(names)
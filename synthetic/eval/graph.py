@@ -18,25 +18,180 @@
 #  You should have received a copy of the GNU General Public License
 #  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
 #
+import inspect
 import logging
-from collections.abc import Collection
+from collections.abc import Collection, Sequence
+from datetime import datetime
 from functools import wraps
-from typing import Any, Callable
+from typing import Any, Callable, Optional, Protocol, TypeGuard, runtime_checkable
 
-from synthetic.eval import Reviewer
+import numpy as np
+import numpy.typing as npt
+
+from synthetic.eval.score import Reviewer, anomaly_types
+from synthetic.graph import DeviationGraph, MutualGraph
 from synthetic.loader import Graph as _Graph
+from synthetic.scores import Scores
 
 LOGGER = logging.getLogger(__name__)
 
 
-class Graph(_Graph):
+class Graph(_Graph, Protocol):
     """Protocol class that a graph needs to have for eval package."""
 
-    reviewers: Collection[Reviewer]
+    @property
+    def reviewers(self) -> Collection[Reviewer]:
+        """Reviewers in this graph."""
+        ...
 
     def update(self) -> Any: ...
 
 
+@runtime_checkable
+class WarmStartGraph(Protocol):
+    """Optional protocol for graphs which can export and import their scores.
+
+    Graphs implementing this protocol can start from scores computed by
+    another run, e.g., with a neighbouring parameter setting, instead of their
+    default initial scores.
+    """
+
+    def export_scores(self) -> Scores:
+        """Exports the current scores of reviewers and products."""
+        ...
+
+    def import_scores(self, scores: Scores) -> None:
+        """Sets scores of reviewers and products.
+
+        Args:
+          scores: Scores to be set. Reviewers and products not in it keep their current scores.
+        """
+        ...
+
+
+class TimedGraph(Protocol):
+    """Optional protocol for graphs whose ``add_review`` takes the date of the review as the fourth argument.
+
+    :func:`takes_dates` checks whether a graph implements it since the
+    signature of a method can't be checked by :func:`isinstance`.
+    """
+
+    def add_review(self, reviewer: Any, product: Any, score: float, date: datetime) -> Any:
+        """Adds a new review posted at the given date."""
+        ...
+
+
+def takes_dates(g: Graph) -> TypeGuard[TimedGraph]:
+    """Checks whether ``add_review`` of a graph takes the date of the review as the fourth argument.
+
+    Args:
+      g: The graph.
+
+    Returns:
+      True if the graph implements :class:`TimedGraph`.
+    """
+    try:
+        params = inspect.signature(g.add_review).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    if any(p.kind == inspect.Parameter.VAR_POSITIONAL for p in params):
+        return True
+    positional = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+    return sum(p.kind in positional for p in params) >= 4
+
+
+@runtime_checkable
+class ScoreArrayGraph(Protocol):
+    """Optional protocol for graphs which give anomalous scores of all reviewers as an array.
+
+    Evaluation reads scores through this protocol instead of accessing
+    ``anomalous_score`` of each reviewer object, which can be slow if scores
+    are computed lazily or stored remotely.
+    """
+
+    def reviewer_index(self) -> Sequence[str]:
+        """Returns names of reviewers in the order of :meth:`scores_array`, which doesn't change."""
+        ...
+
+    def scores_array(self) -> npt.NDArray[np.float64]:
+        """Returns the current anomalous scores of reviewers, which can be a view of the internal storage."""
+        ...
+
+
+class ScoreSnapshot:
+    """Reads anomalous scores of all reviewers in a graph at once.
+
+    Names and types of reviewers are gathered when this object is created, and
+    :meth:`scores` returns scores aligned with them. If the graph implements
+    :class:`ScoreArrayGraph`, scores are read as an array, and otherwise they
+    are gathered from reviewer objects in one pass. Reviewers must not be
+    added to the graph after this object is created.
+    """
+
+    def __init__(self, g: Graph) -> None:
+        """Creates a snapshot reader of a graph.
+
+        Args:
+          g: The graph.
+        """
+        self._graph: Optional[ScoreArrayGraph] = None
+        self._reviewers: list[Reviewer] = []
+        if isinstance(g, ScoreArrayGraph):
+            self._graph = g
+            names = list(g.reviewer_index())
+        else:
+            self._reviewers = list(g.reviewers)
+            names = [r.name for r in self._reviewers]
+        self.names: npt.NDArray[np.str_] = np.array(names, dtype=np.str_)
+        """Names of the reviewers."""
+        self.types: npt.NDArray[np.int8] = anomaly_types(self.names)
+        """Types of the reviewers computed by :meth:`synthetic.eval.score.anomaly_types`."""
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def scores(self) -> npt.NDArray[np.float64]:
+        """Returns a copy of the current anomalous scores of the reviewers."""
+        if self._graph is not None:
+            return np.array(self._graph.scores_array(), dtype=np.float64)
+        return np.fromiter((r.anomalous_score for r in self._reviewers), dtype=np.float64, count=len(self._reviewers))
+
+
+def export_scores(g: Graph) -> Scores:
+    """Exports scores of a graph.
+
+    If the graph doesn't implement :class:`WarmStartGraph`, only anomalous
+    scores of reviewers are exported.
+
+    Args:
+      g: The graph.
+
+    Returns:
+      Scores of reviewers and products in the graph.
+    """
+    if isinstance(g, WarmStartGraph):
+        return g.export_scores()
+    snapshot = ScoreSnapshot(g)
+    return Scores(reviewers=dict(zip(snapshot.names.tolist(), snapshot.scores().tolist(), strict=True)), products={})
+
+
+def import_scores(g: Graph, scores: Scores) -> bool:
+    """Imports scores to a graph if it implements :class:`WarmStartGraph`.
+
+    Args:
+      g: The graph.
+      scores: Scores to be imported.
+
+    Returns:
+      True if the scores are imported.
+    """
+    if not isinstance(g, WarmStartGraph):
+        LOGGER.warning("%s doesn't support importing scores.", type(g).__name__)
+        return False
+    g.import_scores(scores)
+    return True
+
+
 GraphConstructor = Callable[..., Graph]
 
 
@@ -65,6 +220,10 @@ def list_installed_graphs() -> dict[str, GraphConstructor]:
     """Returns a dictionary of installed graph constructors."""
     res: dict[str, Callable[..., Graph]] = {}
 
+    # Register the bundled baselines, which don't have any extra dependencies.
+    res["deviation"] = DeviationGraph
+    res["mutual"] = MutualGraph
+
     # Load and register RIA.
     try:
         import ria as _ria
@@ -0,0 +1,115 @@
+#
+#  plot.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Renders results of evaluation commands.
+
+Matplotlib is imported only when a figure is rendered, and figures are drawn
+on :class:`matplotlib.figure.Figure` objects, which use the non-interactive
+Agg canvas regardless of the pyplot backend.
+"""
+
+import multiprocessing
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING, Any, Final
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+
+Record = dict[str, Any]
+"""A result of an evaluation command, i.e., a JSON object in the output."""
+
+
+def plot_threshold(ax: "Axes", records: Sequence[Record]) -> None:
+    """Plots an ROC curve from the output of threshold command."""
+    x = [r["false-positive"] / (r["false-positive"] + r["true-negative"]) for r in records]
+    y = [r["true-positive"] / (r["true-positive"] + r["false-negative"]) for r in records]
+    ax.plot(x, y)
+    ax.set_xlabel("False positive rate")
+    ax.set_ylabel("True positive rate")
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    ax.set_title(f"AUC: {-round(np.trapezoid(y, x), 5)}")
+
+
+def plot_ranking(ax: "Axes", records: Sequence[Record]) -> None:
+    """Plots precisions in each iteration from the output of ranking command."""
+    x = np.arange(len(records))
+    ax.plot(x, [r["a1-precision"] for r in records], label="a1")
+    ax.plot(x, [r["a2-precision"] for r in records], label="a2")
+    ax.plot(x, [r["a3-precision"] for r in records], label="a3")
+    ax.plot(x, [r["error-rate"] for r in records], label="error")
+    ax.set_xlim(1, len(records))
+    ax.set_ylim(0)
+    ax.set_xlabel("iteration")
+    ax.legend()
+
+
+def plot_dcg(ax: "Axes", records: Sequence[Record]) -> None:
+    """Plots a nDCG curve from the output of dcg command."""
+    ax.plot([r["k"] for r in records], [r["score"] for r in records])
+    ax.set_xlabel("k")
+    ax.set_ylabel("nDCG")
+    ax.set_xlim(1, len(records))
+    ax.set_ylim(0, 1.1)
+
+
+PLOTTERS: Final[dict[str, Callable[["Axes", Sequence[Record]], None]]] = {
+    "threshold": plot_threshold,
+    "ranking": plot_ranking,
+    "dcg": plot_dcg,
+}
+"""Plot functions keyed by the names of evaluation commands."""
+
+
+def render(kind: str, records: Sequence[Record], output: str) -> None:
+    """Renders results of an evaluation command into a file.
+
+    Args:
+      kind: name of the evaluation command, i.e., threshold, ranking, or dcg.
+      records: results of the command.
+      output: path to the image file.
+    """
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    PLOTTERS[kind](fig.add_subplot(), records)
+    fig.tight_layout()
+    fig.savefig(output)
+
+
+def render_in_background(kind: str, records: Sequence[Record], output: str) -> multiprocessing.Process:
+    """Renders results of an evaluation command into a file in another process.
+
+    The caller can continue without waiting for the rendering. The process is
+    not a daemon, and the interpreter waits for it before exiting.
+
+    Args:
+      kind: name of the evaluation command, i.e., threshold, ranking, or dcg.
+      records: results of the command.
+      output: path to the image file.
+
+    Returns:
+      The started process.
+    """
+    p = multiprocessing.Process(target=render, args=(kind, list(records), output))
+    p.start()
+    return p
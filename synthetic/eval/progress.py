@@ -0,0 +1,267 @@
+#
+#  progress.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Exposes progress of a running evaluation.
+
+:class:`Progress` keeps the current iteration, update latencies, throughput,
+the latest precision and AUC, and the resident memory of the process, and
+exposes them in the Prometheus text format via an HTTP server on localhost
+and/or in a JSON status file rewritten periodically, so that schedulers can
+detect stalled or diverging runs.
+"""
+
+import json
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Any, Final, Optional
+
+STATUS_INTERVAL: Final = 5.0
+"""Seconds between rewrites of a status file while an update is running."""
+
+_PREFIX: Final = "synthetic_"
+"""Prefix of the metric names."""
+
+_METRICS: Final = (
+    ("iteration", "gauge", "Index of the current iteration."),
+    ("loop", "gauge", "Number of iterations to be run."),
+    ("update_seconds", "gauge", "Seconds spent by the last update."),
+    ("running_update_seconds", "gauge", "Seconds elapsed in the running update, which is 0 between updates."),
+    ("update_seconds_total", "counter", "Seconds spent by all finished updates."),
+    ("updates_total", "counter", "Number of finished updates."),
+    ("throughput_reviews_per_second", "gauge", "Reviews processed per second by the last update."),
+    ("precision", "gauge", "Precision of the top-k reviewers after the last update."),
+    ("auc", "gauge", "Area under the ROC curve of anomalous scores after the last update."),
+    ("auc_error", "gauge", "Bound of the absolute error of the AUC, which is 0 unless it is approximated."),
+    ("resident_memory_bytes", "gauge", "Resident set size of the process."),
+)
+"""Names, types, and descriptions of the exposed metrics."""
+
+
+def resident_memory() -> Optional[int]:
+    """Returns the current resident set size of this process in bytes.
+
+    The peak one is returned if the current one isn't available, and None on
+    platforms without :mod:`resource`, e.g., Windows.
+    """
+    try:
+        with open("/proc/self/statm") as fp:
+            return int(fp.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+
+class Progress:
+    """Progress of an evaluation which runs updates of a graph in a loop.
+
+    Methods of this class are thread-safe. Use it as a context manager to
+    start and stop the HTTP server and the status file writer.
+    """
+
+    def __init__(
+        self,
+        method: str,
+        loop: int,
+        port: Optional[int] = None,
+        status_file: Optional[str] = None,
+        interval: float = STATUS_INTERVAL,
+    ) -> None:
+        """Creates a progress.
+
+        Args:
+          method: name of the algorithm.
+          loop: the number of iterations to be run.
+          port: if given, port on localhost where metrics are served; 0 chooses a free port.
+          status_file: if given, path of a JSON file rewritten with the metrics.
+          interval: seconds between rewrites of the status file while an update is running.
+        """
+        self.method = method
+        self.loop = loop
+        self.reviews: Optional[int] = None
+        """Number of reviews in the graph, which is used to compute throughput if set."""
+        self._port = port
+        self._status_file = status_file
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._state = "loading"
+        self._started_at = time.time()
+        self._iteration: Optional[int] = None
+        self._update_started: Optional[float] = None
+        self._last_update: Optional[float] = None
+        self._total_seconds = 0.0
+        self._updates = 0
+        self._precision = math.nan
+        self._auc = math.nan
+        self._auc_error = math.nan
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def port(self) -> Optional[int]:
+        """Port where metrics are served, or None if the server isn't running."""
+        return self._server.server_address[1] if self._server else None
+
+    def start_update(self, iteration: int) -> None:
+        """Records that an update starts.
+
+        Args:
+          iteration: index of the iteration.
+        """
+        with self._lock:
+            self._state = "running"
+            self._iteration = iteration
+            self._update_started = time.perf_counter()
+
+    def finish_update(self, precision: float = math.nan, auc: float = math.nan, auc_error: float = math.nan) -> None:
+        """Records that the running update finishes.
+
+        Args:
+          precision: precision of the top-k reviewers after the update.
+          auc: area under the ROC curve after the update.
+          auc_error: bound of the absolute error of *auc*, which is 0 if it is exact.
+        """
+        with self._lock:
+            if self._update_started is not None:
+                self._last_update = time.perf_counter() - self._update_started
+                self._total_seconds += self._last_update
+                self._updates += 1
+            self._update_started = None
+            self._precision = precision
+            self._auc = auc
+            self._auc_error = auc_error
+        self._write_status()
+
+    def metrics(self) -> dict[str, Any]:
+        """Returns the current metrics.
+
+        Returns:
+          A dictionary of the state, i.e., loading, running, or finished, the
+          method, timestamps, and the values of the metrics, which are None if
+          they aren't available yet.
+        """
+        with self._lock:
+            last = self._last_update
+            running = time.perf_counter() - self._update_started if self._update_started is not None else 0.0
+            return {
+                "state": self._state,
+                "method": self.method,
+                "started_at": self._started_at,
+                "updated_at": time.time(),
+                "iteration": self._iteration,
+                "loop": self.loop,
+                "update_seconds": last,
+                "running_update_seconds": running,
+                "update_seconds_total": self._total_seconds,
+                "updates_total": self._updates,
+                "throughput_reviews_per_second": self.reviews / last if self.reviews is not None and last else None,
+                "precision": None if math.isnan(self._precision) else self._precision,
+                "auc": None if math.isnan(self._auc) else self._auc,
+                "auc_error": None if math.isnan(self._auc_error) else self._auc_error,
+                "resident_memory_bytes": resident_memory(),
+            }
+
+    def prometheus(self) -> str:
+        """Renders the current metrics in the Prometheus text exposition format."""
+        values = self.metrics()
+        labels = "{" + f'method="{self.method}"' + "}"
+        lines = []
+        for name, kind, description in _METRICS:
+            if values[name] is None:
+                continue
+            lines.append(f"# HELP {_PREFIX}{name} {description}")
+            lines.append(f"# TYPE {_PREFIX}{name} {kind}")
+            lines.append(f"{_PREFIX}{name}{labels} {float(values[name])!r}")
+        return "\n".join(lines) + "\n"
+
+    def _write_status(self) -> None:
+        """Rewrites the status file atomically."""
+        if not self._status_file:
+            return
+        directory = os.path.dirname(os.path.abspath(self._status_file))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as fp:
+            json.dump(self.metrics(), fp)
+        os.replace(tmp, self._status_file)
+
+    def _write_periodically(self) -> None:
+        while not self._stop.wait(self._interval):
+            self._write_status()
+
+    def __enter__(self) -> "Progress":
+        if self._port is not None:
+            self._server = ThreadingHTTPServer(("127.0.0.1", self._port), _handler(self))
+            self._threads.append(threading.Thread(target=self._server.serve_forever, daemon=True))
+        if self._status_file:
+            self._write_status()
+            self._threads.append(threading.Thread(target=self._write_periodically, daemon=True))
+        for t in self._threads:
+            t.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        with self._lock:
+            self._state = "failed" if exc_type else "finished"
+        self._stop.set()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for t in self._threads:
+            t.join()
+        self._write_status()
+
+
+def _handler(progress: Progress) -> type[BaseHTTPRequestHandler]:
+    """Creates a request handler serving metrics of a progress."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            if self.path not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = progress.prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            # Don't mix access logs with the results written to stdout or stderr.
+            pass
+
+    return Handler
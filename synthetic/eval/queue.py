@@ -0,0 +1,480 @@
+#
+#  queue.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Runs evaluations on any number of workers through a queue in a shared directory.
+
+A coordinator submits jobs, i.e., pickled functions and their arguments, into
+a queue directory via :class:`QueueExecutor`, and workers running
+:func:`work` on any host which can access the directory pull and run them.
+
+* ``jobs/<id>.pickle`` stores a job, where the ID is the digest of the job so
+  that submitting the same job again reuses it and its result.
+* ``leases/<id>.json`` shows that a worker runs the job until the lease
+  expires. Workers renew their leases while running jobs, and a lease which
+  has expired, e.g., because its worker died, is taken over by another
+  worker. Jobs are retried until they fail *max_attempts* times.
+* ``leases/<id>.<attempt>.claim`` is created exclusively by the one worker
+  taking over an expired lease for the attempt.
+* ``results/<id>.pickle`` stores the outcome of a job. Results are written
+  into temporary files which are renamed, so that they appear atomically,
+  and any worker produces the same result file for the same job.
+
+No other services are needed, so several local workers can share a local
+directory as well.
+
+.. warning::
+
+   Jobs and results are pickles, and unpickling them runs arbitrary code.
+   Workers run whatever is put into the queue directory, and coordinators
+   load whatever results appear there, so only use a directory which no
+   untrusted user can write into. Jobs can't be stored in JSON instead since
+   they are arbitrary functions, e.g., evaluations of installed algorithms.
+"""
+
+import contextlib
+import glob
+import hashlib
+import json
+import logging
+import os
+import pickle
+import socket
+import tempfile
+import threading
+import time
+import traceback
+from collections.abc import Callable
+from concurrent.futures import Executor, Future
+from typing import Any, Final, NamedTuple, Optional
+
+LOGGER: Final = logging.getLogger(__name__)
+
+LEASE_SECONDS: Final = 60.0
+"""Default seconds a lease lasts unless it is renewed."""
+
+MAX_ATTEMPTS: Final = 3
+"""Default number of attempts of a job before it fails."""
+
+_JOBS: Final = "jobs"
+_LEASES: Final = "leases"
+_RESULTS: Final = "results"
+
+
+class JobError(RuntimeError):
+    """An error raised by a job on a worker, or a job which ran out of attempts."""
+
+
+class QueueStatus(NamedTuple):
+    """Numbers of jobs in each state."""
+
+    pending: int
+    """Jobs which no workers run."""
+    running: int
+    """Jobs which workers hold unexpired leases of."""
+    done: int
+    """Jobs which succeeded."""
+    failed: int
+    """Jobs which raised errors in all attempts."""
+
+
+def _paths(root: str, job_id: str) -> tuple[str, str, str]:
+    """Computes the paths of the job, lease, and result files of a job."""
+    return (
+        os.path.join(root, _JOBS, job_id + ".pickle"),
+        os.path.join(root, _LEASES, job_id + ".json"),
+        os.path.join(root, _RESULTS, job_id + ".pickle"),
+    )
+
+
+def _init(root: str) -> None:
+    for name in (_JOBS, _LEASES, _RESULTS):
+        os.makedirs(os.path.join(root, name), exist_ok=True)
+
+
+def _write_atomically(path: str, data: bytes) -> None:
+    """Writes a file into a temporary file and renames it so that readers never see a partial file."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def _read_lease(path: str) -> Optional[dict[str, Any]]:
+    try:
+        with open(path) as fp:
+            res: dict[str, Any] = json.load(fp)
+            return res
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def submit_job(root: str | os.PathLike[str], fn: Callable[..., Any], *args: Any, **kwargs: Any) -> str:
+    """Puts a job into a queue.
+
+    Args:
+      root: Queue directory, which is created if it doesn't exist.
+      fn: Picklable function.
+      *args: Picklable positional arguments of the function.
+      **kwargs: Picklable keyword arguments of the function.
+
+    Returns:
+      The ID of the job, which is the same for the same function and arguments.
+    """
+    root = os.fspath(root)
+    _init(root)
+    payload = pickle.dumps((fn, args, kwargs), protocol=pickle.HIGHEST_PROTOCOL)
+    job_id = hashlib.sha256(payload).hexdigest()
+    job, _, _ = _paths(root, job_id)
+    if not os.path.exists(job):
+        _write_atomically(job, payload)
+    return job_id
+
+
+def read_result(root: str | os.PathLike[str], job_id: str) -> tuple[bool, Any]:
+    """Reads the result of a job.
+
+    Args:
+      root: Queue directory.
+      job_id: ID of the job.
+
+    Returns:
+      A pair of whether the result exists and the value returned by the job.
+
+    Raises:
+      JobError: if the job failed.
+    """
+    _, _, result = _paths(os.fspath(root), job_id)
+    try:
+        with open(result, "rb") as fp:
+            ok, value = pickle.load(fp)
+    except FileNotFoundError:
+        return False, None
+    if not ok:
+        raise JobError(value)
+    return True, value
+
+
+def queue_status(root: str | os.PathLike[str]) -> QueueStatus:
+    """Counts jobs in each state.
+
+    Args:
+      root: Queue directory.
+
+    Returns:
+      The numbers of jobs.
+    """
+    root = os.fspath(root)
+    _init(root)
+    pending = running = done = failed = 0
+    now = time.time()
+    for entry in os.scandir(os.path.join(root, _JOBS)):
+        if entry.name.startswith("."):
+            continue
+        job_id = entry.name.removesuffix(".pickle")
+        _, lease, result = _paths(root, job_id)
+        try:
+            read_result(root, job_id)
+        except JobError:
+            failed += 1
+            continue
+        if os.path.exists(result):
+            done += 1
+        elif (info := _read_lease(lease)) is not None and info["expires"] > now:
+            running += 1
+        else:
+            pending += 1
+    return QueueStatus(pending, running, done, failed)
+
+
+class _Lease:
+    """A lease of a job held by this worker."""
+
+    def __init__(self, path: str, worker: str, attempt: int, seconds: float) -> None:
+        self.path = path
+        self.worker = worker
+        self.attempt = attempt
+        self.seconds = seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._renew_periodically, daemon=True)
+
+    def info(self, expires: Optional[float] = None) -> bytes:
+        return json.dumps(
+            {
+                "worker": self.worker,
+                "attempt": self.attempt,
+                "expires": time.time() + self.seconds if expires is None else expires,
+            }
+        ).encode()
+
+    def write(self, expires: Optional[float] = None) -> None:
+        _write_atomically(self.path, self.info(expires))
+
+    def held(self) -> bool:
+        """Reads the lease file back and checks that it is still this lease."""
+        info = _read_lease(self.path)
+        return info is not None and info["worker"] == self.worker and info["attempt"] == self.attempt
+
+    def _renew_periodically(self) -> None:
+        while not self._stop.wait(self.seconds / 3):
+            # Don't resurrect a lease which another worker has taken over.
+            if not self.held():
+                return
+            self.write()
+
+    def __enter__(self) -> "_Lease":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def _claim(root: str, job_id: str, worker: str, seconds: float) -> Optional[_Lease]:
+    """Takes a lease of a job if no other worker holds an unexpired one.
+
+    Returns:
+      The lease, or None if another worker holds one. The lease of a job which
+      has failed before has the attempt number following the previous one.
+    """
+    _, lease_path, _ = _paths(root, job_id)
+    try:
+        fd = os.open(lease_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return _take_over(lease_path, worker, seconds)
+    lease = _Lease(lease_path, worker, 1, seconds)
+    with os.fdopen(fd, "wb") as fp:
+        fp.write(lease.info())
+    return lease if lease.held() else None
+
+
+def _take_over(lease_path: str, worker: str, seconds: float) -> Optional[_Lease]:
+    """Takes over an expired lease.
+
+    Only the worker which exclusively creates the claim file of the next
+    attempt writes the new lease, so that two workers never take over the
+    same lease. A claim whose worker died before writing the lease expires
+    like a lease, and the attempt after it is claimed instead.
+
+    Returns:
+      The lease, or None if the lease hasn't expired or another worker takes it over.
+    """
+    info = _read_lease(lease_path)
+    if info is None:
+        # The lease is being written, or its worker died while writing it.
+        if not _expired(lease_path, seconds):
+            return None
+        attempt = 1
+    elif info["expires"] > time.time():
+        return None
+    else:
+        attempt = info["attempt"] + 1
+
+    while True:
+        try:
+            os.close(os.open(_claim_path(lease_path, attempt), os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            if not _expired(_claim_path(lease_path, attempt), seconds):
+                return None
+            attempt += 1
+    lease = _Lease(lease_path, worker, attempt, seconds)
+    lease.write()
+    return lease if lease.held() else None
+
+
+def _claim_path(lease_path: str, attempt: int) -> str:
+    return f"{lease_path.removesuffix('.json')}.{attempt}.claim"
+
+
+def _expired(path: str, seconds: float) -> bool:
+    """Checks if a file was last modified more than *seconds* ago, which is False if it doesn't exist."""
+    try:
+        return os.stat(path).st_mtime + seconds <= time.time()
+    except FileNotFoundError:
+        return False
+
+
+def _release(lease_path: str) -> None:
+    """Removes a lease and the claims of its attempts."""
+    for path in glob.glob(glob.escape(lease_path.removesuffix(".json")) + ".*.claim") + [lease_path]:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+
+
+def work(
+    root: str | os.PathLike[str],
+    worker: Optional[str] = None,
+    idle_timeout: Optional[float] = None,
+    poll: float = 1.0,
+    lease_seconds: float = LEASE_SECONDS,
+    max_attempts: int = MAX_ATTEMPTS,
+) -> int:
+    """Runs jobs in a queue.
+
+    Jobs are unpickled and run as they are, so the queue directory must be
+    writable only by trusted users.
+
+    Args:
+      root: Queue directory, which is created if it doesn't exist.
+      worker: Name of this worker written in leases (default: host name and process ID).
+      idle_timeout: If given, seconds to wait for new jobs before returning. Otherwise, waits forever.
+      poll: Seconds between scans of the queue when no jobs can be run.
+      lease_seconds: Seconds a lease lasts unless it is renewed.
+      max_attempts: The number of attempts of a job before it fails.
+
+    Returns:
+      The number of jobs this worker finished, i.e., succeeded or failed at last.
+    """
+    root = os.fspath(root)
+    _init(root)
+    worker = worker or f"{socket.gethostname()}-{os.getpid()}"
+    finished = 0
+    idle_since = time.monotonic()
+    while True:
+        ran = False
+        for name in sorted(f for f in os.listdir(os.path.join(root, _JOBS)) if not f.startswith(".")):
+            job_id = name.removesuffix(".pickle")
+            job, lease_path, result = _paths(root, job_id)
+            if os.path.exists(result) or (lease := _claim(root, job_id, worker, lease_seconds)) is None:
+                continue
+            ran = True
+            if os.path.exists(result):
+                # Another worker has finished the job since the scan.
+                _release(lease_path)
+                continue
+            if lease.attempt > max_attempts:
+                LOGGER.warning("Job %s failed %d times.", job_id, max_attempts)
+                _write_atomically(
+                    result, pickle.dumps((False, f"job failed {max_attempts} times"), protocol=pickle.HIGHEST_PROTOCOL)
+                )
+                _release(lease_path)
+                finished += 1
+                continue
+
+            LOGGER.info("Running job %s (attempt %d).", job_id, lease.attempt)
+            with lease:
+                try:
+                    with open(job, "rb") as fp:
+                        fn, args, kwargs = pickle.load(fp)
+                    outcome = (True, fn(*args, **kwargs))
+                except Exception:
+                    LOGGER.warning("Job %s raised an error:\n%s", job_id, traceback.format_exc())
+                    outcome = (False, traceback.format_exc())
+            if not outcome[0] and lease.attempt < max_attempts:
+                # Expire the lease so that the job is retried with the next attempt.
+                lease.write(expires=0)
+                continue
+            _write_atomically(result, pickle.dumps(outcome, protocol=pickle.HIGHEST_PROTOCOL))
+            _release(lease_path)
+            finished += 1
+
+        if ran:
+            idle_since = time.monotonic()
+        elif idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+            return finished
+        else:
+            time.sleep(poll)
+
+
+class QueueExecutor(Executor):
+    """An executor which puts calls into a queue directory and waits for workers to run them.
+
+    Workers are started separately with :func:`work` or the ``queue-work``
+    command, on this or other hosts.
+    """
+
+    def __init__(self, root: str | os.PathLike[str], poll: float = 1.0) -> None:
+        """Creates an executor.
+
+        Args:
+          root: Queue directory, which is created if it doesn't exist.
+          poll: Seconds between checks of results.
+        """
+        self._root = os.fspath(root)
+        self._poll = poll
+        self._lock = threading.Lock()
+        self._pending: dict[str, list[Future[Any]]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        _init(self._root)
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future[Any]:
+        """Puts a call into the queue.
+
+        The call must be picklable. If the same call has been run before, its
+        result is reused.
+        """
+        future: Future[Any] = Future()
+        job_id = submit_job(self._root, fn, *args, **kwargs)
+        with self._lock:
+            if self._stop.is_set():
+                raise RuntimeError("cannot submit jobs after shutdown")
+            self._pending.setdefault(job_id, []).append(future)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._collect, daemon=True)
+                self._thread.start()
+        return future
+
+    def _collect(self) -> None:
+        """Resolves futures whose results have appeared."""
+        while True:
+            with self._lock:
+                pending = list(self._pending.items())
+                if not pending and self._stop.is_set():
+                    return
+            for job_id, futures in pending:
+                error: Optional[JobError] = None
+                try:
+                    ok, value = read_result(self._root, job_id)
+                except JobError as e:
+                    ok, error = True, e
+                if not ok:
+                    continue
+                with self._lock:
+                    del self._pending[job_id]
+                for f in futures:
+                    if not f.set_running_or_notify_cancel():
+                        continue
+                    if error is not None:
+                        f.set_exception(error)
+                    else:
+                        f.set_result(value)
+            time.sleep(self._poll)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """Stops collecting results after all submitted jobs finish if *wait* is True.
+
+        Jobs remain in the queue even if their futures are cancelled.
+        """
+        with self._lock:
+            if cancel_futures:
+                for futures in self._pending.values():
+                    for f in futures:
+                        f.cancel()
+                self._pending.clear()
+            self._stop.set()
+            thread = self._thread
+        if wait and thread is not None:
+            thread.join()
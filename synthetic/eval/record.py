@@ -0,0 +1,116 @@
+#
+#  record.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Records trajectories of anomalous scores into memory-mapped arrays."""
+
+import os
+from collections.abc import Iterable
+from types import TracebackType
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from synthetic.eval.graph import ScoreSnapshot
+from synthetic.eval.score import Reviewer
+
+
+def index_path(path: str | os.PathLike[str]) -> str:
+    """Computes the path of the reviewer-name index of a record file.
+
+    Args:
+      path: Path to the record file.
+
+    Returns:
+      The path of the index file, which replaces the extension of the record file with ``.names``.
+    """
+    return os.path.splitext(os.fspath(path))[0] + ".names"
+
+
+class ScoreRecorder:
+    """Records anomalous scores of reviewers after every update.
+
+    Scores are written into a preallocated (iterations x reviewers) float32
+    array stored in a ``.npy`` file, which is memory-mapped, and names of the
+    reviewers are written into a separate index file, one name per line,
+    in the same order as the columns.
+    """
+
+    def __init__(
+        self, path: str | os.PathLike[str], reviewers: Iterable[Reviewer] | ScoreSnapshot, iterations: int
+    ) -> None:
+        """Creates a record file.
+
+        Args:
+          path: Path to the record file.
+          reviewers: Reviewers to be recorded, or a snapshot reader of a graph whose reviewers are recorded.
+          iterations: The number of iterations to be recorded.
+        """
+        self._reviewers: list[Reviewer] = []
+        self._snapshot: Optional[ScoreSnapshot] = None
+        if isinstance(reviewers, ScoreSnapshot):
+            self._snapshot = reviewers
+            names = reviewers.names.tolist()
+        else:
+            self._reviewers = list(reviewers)
+            names = [r.name for r in self._reviewers]
+        self._scores = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(iterations, len(names)))
+        self._iteration = 0
+        with open(index_path(path), "w") as fp:
+            fp.writelines(f"{name}\n" for name in names)
+
+    def record(self) -> None:
+        """Records the current anomalous scores as the next iteration."""
+        if self._snapshot is not None:
+            self._scores[self._iteration] = self._snapshot.scores()
+        else:
+            self._scores[self._iteration] = np.fromiter(
+                (r.anomalous_score for r in self._reviewers), dtype=np.float32, count=len(self._reviewers)
+            )
+        self._iteration += 1
+
+    def close(self) -> None:
+        """Flushes the recorded scores."""
+        self._scores.flush()
+
+    def __enter__(self) -> "ScoreRecorder":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+def read_record(path: str | os.PathLike[str]) -> tuple[list[str], npt.NDArray[np.float32]]:
+    """Reads a record file.
+
+    Args:
+      path: Path to the record file.
+
+    Returns:
+      A tuple of reviewer names and a read-only memory-mapped (iterations x reviewers) array of their scores.
+    """
+    with open(index_path(path)) as fp:
+        names = fp.read().splitlines()
+    return names, np.load(path, mmap_mode="r")
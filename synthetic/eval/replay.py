@@ -0,0 +1,213 @@
+#
+#  replay.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Replays reviews of a dataset to a graph in time order to benchmark online algorithms."""
+
+import time
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from synthetic.eval.graph import Graph, TimedGraph, takes_dates
+from synthetic.eval.score import anomaly_types
+from synthetic.loader import Dataset
+
+
+class ReplayStep(NamedTuple):
+    """Statistics of a step of a replay, which consists of feeding reviews and updating a graph."""
+
+    step: int
+    """Index of the step."""
+    reviews: int
+    """The number of reviews fed so far."""
+    time: float
+    """Simulated time of the last review fed in this step."""
+    feed_time: float
+    """Wall-clock seconds spent to add the reviews of this step, excluding the time waiting for them to arrive."""
+    update_time: float
+    """Wall-clock seconds spent in update."""
+    lag: float
+    """Wall-clock seconds the feed is behind the schedule given by the rate after the update, which is 0 if the
+    feed isn't paced."""
+    precision: float
+    """Precision of the k reviewers having the highest anomalous scores, where k is the number of anomalous reviewers
+    fed so far. It is NaN if no anomalous reviewers have been fed."""
+
+
+def review_times(dataset: Dataset, rate: Optional[float] = None) -> npt.NDArray[np.float64]:
+    """Returns timestamps of reviews.
+
+    If the dataset doesn't have timestamps, reviews are assumed to arrive in
+    the order of the review file at the given rate.
+
+    Args:
+      dataset: The dataset.
+      rate: The number of reviews per second used if the dataset doesn't have timestamps (default: 1).
+
+    Returns:
+      An array of POSIX timestamps of reviews.
+    """
+    if len(dataset.review_times) and not np.isnan(dataset.review_times).any():
+        return dataset.review_times
+    return np.arange(len(dataset.review_scores)) / (rate or 1.0)
+
+
+def _precision(reviewers: list[Any], anomalous: npt.NDArray[np.bool_]) -> float:
+    """Computes the precision of the top-k reviewers where k is the number of anomalous reviewers.
+
+    Args:
+      reviewers: Reviewer objects.
+      anomalous: Flags whether each reviewer is anomalous.
+
+    Returns:
+      The precision, or NaN if there are no anomalous reviewers.
+    """
+    k = int(anomalous.sum())
+    if k == 0:
+        return float("nan")
+    scores = np.fromiter((r.anomalous_score for r in reviewers), dtype=np.float64, count=len(reviewers))
+    return float(anomalous[np.argpartition(-scores, k - 1)[:k]].mean())
+
+
+def replay(
+    g: Graph,
+    dataset: Dataset,
+    every: Optional[int] = None,
+    interval: Optional[float] = None,
+    rate: Optional[float] = None,
+) -> Iterator[ReplayStep]:
+    """Feeds reviews to a graph in time order and updates it periodically.
+
+    Reviewers and products are added to the graph when their first reviews
+    arrive, and each review is added with its timestamp as the fourth argument
+    of ``add_review`` if the graph implements
+    :class:`synthetic.eval.graph.TimedGraph`. The graph is updated after
+    every *every* reviews and whenever *interval* seconds of simulated time
+    have passed since the last update, and after the last review.
+
+    If *rate* is given, the feed is paced like a live stream: the i-th review
+    isn't added until i / *rate* wall-clock seconds have passed since the
+    start, so that updates slower than the stream make the feed lag behind.
+
+    Args:
+      g: an empty graph.
+      dataset: the dataset to be replayed.
+      every: if given, the number of reviews between updates.
+      interval: if given, simulated seconds between updates.
+      rate: if given, the number of reviews fed per wall-clock second, which
+        is also the number of reviews per simulated second if the dataset
+        doesn't have timestamps. Otherwise, reviews are fed as fast as possible.
+
+    Yields:
+      Statistics of each step.
+    """
+    if every is None and interval is None:
+        raise ValueError("either every or interval must be given")
+    if every is not None and every < 1:
+        raise ValueError(f"every must be positive: {every}")
+    if interval is not None and interval <= 0:
+        raise ValueError(f"interval must be positive: {interval}")
+    if rate is not None and rate <= 0:
+        raise ValueError(f"rate must be positive: {rate}")
+
+    times = review_times(dataset, rate)
+    order = np.argsort(times, kind="stable")
+    types = anomaly_types(dataset.reviewer_names)
+
+    reviewer_pos = np.full(len(dataset.reviewer_ids), -1, dtype=np.intp)
+    reviewers: list[Any] = []
+    products: dict[int, Any] = {}
+    anomalous: list[bool] = []
+
+    timed: Optional[TimedGraph] = g if takes_dates(g) else None
+    step = 0
+    fed = last_fed = 0
+    last_time = 0.0
+    window = None
+    waited = 0.0
+    started = origin = time.perf_counter()
+    for i in order.tolist():
+        t = float(times[i])
+        current = int((t - float(times[order[0]])) // interval) if interval is not None else None
+        if fed > last_fed and ((every is not None and fed - last_fed >= every) or current != window):
+            yield _update(g, step, fed, last_time, started, waited, _due(origin, fed, rate), reviewers, anomalous)
+            step += 1
+            last_fed = fed
+            waited = 0.0
+            started = time.perf_counter()
+        window = current
+
+        if rate is not None and (wait := origin + fed / rate - time.perf_counter()) > 0:
+            time.sleep(wait)
+            waited += wait
+
+        r = int(dataset.review_reviewers[i])
+        if reviewer_pos[r] < 0:
+            reviewer_pos[r] = len(reviewers)
+            reviewers.append(g.new_reviewer(name=str(dataset.reviewer_names[r])))
+            anomalous.append(bool(types[r]))
+        p = int(dataset.review_products[i])
+        if p not in products:
+            products[p] = g.new_product(name=str(dataset.product_names[p]))
+
+        score = float(dataset.review_scores[i]) / 5
+        if timed is not None:
+            timed.add_review(reviewers[reviewer_pos[r]], products[p], score, datetime.fromtimestamp(t, tz=timezone.utc))
+        else:
+            g.add_review(reviewers[reviewer_pos[r]], products[p], score)
+        fed += 1
+        last_time = t
+
+    if fed > last_fed:
+        yield _update(g, step, fed, last_time, started, waited, _due(origin, fed, rate), reviewers, anomalous)
+
+
+def _due(origin: float, fed: int, rate: Optional[float]) -> Optional[float]:
+    """Returns the value of :func:`time.perf_counter` when the next review is due, or None if the feed isn't paced."""
+    return origin + fed / rate if rate is not None else None
+
+
+def _update(
+    g: Graph,
+    step: int,
+    fed: int,
+    last_time: float,
+    started: float,
+    waited: float,
+    due: Optional[float],
+    reviewers: list[Any],
+    anomalous: list[bool],
+) -> ReplayStep:
+    """Updates a graph and returns statistics of the step."""
+    fed_at = time.perf_counter()
+    g.update()
+    updated_at = time.perf_counter()
+    return ReplayStep(
+        step=step,
+        reviews=fed,
+        time=last_time,
+        feed_time=fed_at - started - waited,
+        update_time=updated_at - fed_at,
+        lag=max(updated_at - due, 0.0) if due is not None else 0.0,
+        precision=_precision(reviewers, np.array(anomalous, dtype=bool)),
+    )
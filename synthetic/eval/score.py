@@ -20,11 +20,18 @@
 #
 import math
 from collections.abc import Iterable
-from typing import Final, NamedTuple, Protocol
+from typing import Final, NamedTuple, Optional, Protocol
 
-ANOMALY_REVIEWER_TAG: Final = "anomaly"
-TYPE2_ANOMALY_REVIEWER_TAG: Final = "_1"
-TYPE3_ANOMALY_REVIEWER_TAG: Final = "_2"
+import numpy as np
+import numpy.typing as npt
+
+# The classification of reviewers lives in synthetic.anomaly so that the loader can use it, and is re-exported here.
+from synthetic.anomaly import (
+    ANOMALY_REVIEWER_TAG,
+    TYPE2_ANOMALY_REVIEWER_TAG,
+    TYPE3_ANOMALY_REVIEWER_TAG,
+    anomaly_types,
+)
 
 
 class Reviewer(Protocol):
@@ -32,6 +39,33 @@ class Reviewer(Protocol):
     anomalous_score: float
 
 
+def _arrays(reviewers: Iterable[Reviewer]) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.bool_]]:
+    """Gathers anomalous scores of reviewers and flags whether they are anomalous in one pass."""
+    reviewers = list(reviewers)
+    scores = np.fromiter((r.anomalous_score for r in reviewers), dtype=np.float64, count=len(reviewers))
+    return scores, anomaly_types([r.name for r in reviewers]) > 0
+
+
+def dcg_curve(scores: npt.ArrayLike, labels: npt.ArrayLike, k: int) -> npt.NDArray[np.float64]:
+    """Computes DCG scores of the top-1 to top-k rankings from arrays.
+
+    Reviewers having the same score are ranked in the given order.
+
+    Args:
+      scores: An array of anomalous scores.
+      labels: An array of flags whether each reviewer is anomalous.
+      k: An integer specifying the largest k.
+
+    Returns:
+      An array whose i-th element is the DCG score of the top-(i+1) ranking.
+      It's shorter than k if there are less than k reviewers.
+    """
+    top = np.asarray(labels, dtype=bool)[np.argsort(-np.asarray(scores, dtype=np.float64), kind="stable")[:k]]
+    discounts = np.log(np.maximum(np.arange(1, len(top) + 1), 2)) / math.log(2)
+    res: npt.NDArray[np.float64] = np.cumsum(top / discounts)
+    return res
+
+
 def dcg(reviewers: Iterable[Reviewer], k: int) -> float:
     """Computes a DCG score for a top-k ranking.
 
@@ -42,12 +76,8 @@ def dcg(reviewers: Iterable[Reviewer], k: int) -> float:
     Returns:
       The DCG score of the top-k ranking.
     """
-    res = 0.0
-    for i, r in enumerate(sorted(reviewers, key=lambda rv: rv.anomalous_score, reverse=True)[:k], start=1):
-        if ANOMALY_REVIEWER_TAG in r.name:
-            res += 1.0 / math.log(i, 2) if i != 1 else 1
-        i += 1
-    return res
+    curve = dcg_curve(*_arrays(reviewers), k)
+    return float(curve[-1]) if len(curve) else 0.0
 
 
 def ideal_dcg(k: int) -> float:
@@ -64,6 +94,283 @@ def ideal_dcg(k: int) -> float:
     return sum((1.0 / math.log(i, 2) for i in range(2, k + 1)), start=1.0)
 
 
+def ndcg(reviewers: Iterable[Reviewer], k: int) -> float:
+    """Computes a normalized DCG score for a top-k ranking.
+
+    Args:
+      reviewers: A collection of reviewers.
+      k: An integer specifying the k.
+
+    Returns:
+      The nDCG score of the top-k ranking.
+    """
+    return ndcg_at_k(*_arrays(reviewers), k)
+
+
+def ndcg_at_k(scores: npt.ArrayLike, labels: npt.ArrayLike, k: int) -> float:
+    """Computes a normalized DCG score for a top-k ranking from arrays.
+
+    Args:
+      scores: An array of anomalous scores.
+      labels: An array of flags whether each reviewer is anomalous.
+      k: An integer specifying the k.
+
+    Returns:
+      The nDCG score of the top-k ranking.
+    """
+    curve = dcg_curve(scores, labels, k)
+    if k == 0 or not len(curve):
+        return 0.0
+    return float(curve[-1]) / ideal_dcg(k)
+
+
+def precision(reviewers: Iterable[Reviewer], k: int) -> float:
+    """Computes the precision of a top-k ranking.
+
+    Args:
+      reviewers: A collection of reviewers.
+      k: An integer specifying the k.
+
+    Returns:
+      The fraction of anomalous reviewers in the k reviewers who have the
+      highest anomalous scores.
+    """
+    return precision_at_k(*_arrays(reviewers), k)
+
+
+def precision_at_k(scores: npt.ArrayLike, labels: npt.ArrayLike, k: int) -> float:
+    """Computes the precision of a top-k ranking from arrays.
+
+    Args:
+      scores: An array of anomalous scores.
+      labels: An array of flags whether each reviewer is anomalous.
+      k: An integer specifying the k.
+
+    Returns:
+      The fraction of anomalous reviewers in the k reviewers who have the
+      highest anomalous scores.
+    """
+    top = np.asarray(labels, dtype=bool)[np.argsort(-np.asarray(scores, dtype=np.float64), kind="stable")[:k]]
+    if not len(top):
+        return 0.0
+    return float(top.mean())
+
+
+def roc_auc(reviewers: Iterable[Reviewer]) -> float:
+    """Computes the area under the ROC curve of anomalous scores.
+
+    The area is the probability that a randomly chosen anomalous reviewer has
+    a higher anomalous score than a randomly chosen normal reviewer, where
+    ties count one half.
+
+    Args:
+      reviewers: A collection of reviewers.
+
+    Returns:
+      The area under the ROC curve, or NaN if there are no anomalous or no normal reviewers.
+    """
+    return auc(*_arrays(reviewers))
+
+
+def auc(scores: npt.ArrayLike, labels: npt.ArrayLike) -> float:
+    """Computes the area under the ROC curve from arrays.
+
+    Args:
+      scores: An array of anomalous scores.
+      labels: An array of flags whether each reviewer is anomalous.
+
+    Returns:
+      The area under the ROC curve, or NaN if there are no anomalous or no normal reviewers.
+    """
+    scores = np.asarray(scores)
+    labels = np.asarray(labels, dtype=bool)
+    positives = int(labels.sum())
+    negatives = len(labels) - positives
+    if positives == 0 or negatives == 0:
+        return float("nan")
+
+    # Average ranks of tied scores.
+    _, inverse, counts = np.unique(scores, return_inverse=True, return_counts=True)
+    ranks = (np.cumsum(counts) - (counts - 1) / 2)[inverse]
+    return float((ranks[labels].sum() - positives * (positives + 1) / 2) / (positives * negatives))
+
+
+SKETCH_BINS: Final = 4096
+"""Default number of bins of :class:`ScoreSketch`."""
+
+
+class Estimate(NamedTuple):
+    """An approximate value and a bound of its absolute error."""
+
+    value: float
+    error: float
+
+
+class ScoreSketch:
+    """Approximates metrics of anomalous scores given in chunks with memory independent of the number of reviewers.
+
+    Scores of anomalous and normal reviewers are counted in histograms of
+    fixed bins over [low, high] plus two bins for scores below and above the
+    range, so that the area under the ROC curve and the numbers of reviewers
+    above thresholds are estimated with error bounds. The k highest scores are
+    kept in a bounded buffer, so that precision and nDCG of the top-k ranking
+    are exact, where reviewers having the same score are ranked in the given
+    order as :meth:`dcg_curve` does. NaN scores are ignored.
+    """
+
+    def __init__(
+        self, k: int, bins: int = SKETCH_BINS, low: float = 0.0, high: float = 1.0, thresholds: npt.ArrayLike = ()
+    ) -> None:
+        """Creates an empty sketch.
+
+        Args:
+          k: The largest k of top-k rankings to be evaluated.
+          bins: The number of bins of the same width over [low, high].
+          low: The lower end of the range of scores.
+          high: The upper end of the range of scores.
+          thresholds: Thresholds added to the bin edges so that :meth:`at_least` counts reviewers exactly for them.
+        """
+        if bins < 1 or not low < high:
+            raise ValueError(f"invalid bins: {bins} over [{low}, {high}]")
+        self.k = k
+        self.edges: npt.NDArray[np.float64] = np.union1d(
+            np.linspace(low, high, bins + 1), np.asarray(thresholds, dtype=np.float64)
+        )
+        """Edges of the bins."""
+        self._counts = np.zeros((2, len(self.edges) + 1), dtype=np.int64)
+        self._top_scores = np.empty(0, dtype=np.float64)
+        self._top_labels = np.empty(0, dtype=np.bool_)
+        self._top_index = np.empty(0, dtype=np.int64)
+        self._seen = 0
+
+    @property
+    def positives(self) -> int:
+        """The number of anomalous reviewers added."""
+        return int(self._counts[1].sum())
+
+    @property
+    def negatives(self) -> int:
+        """The number of normal reviewers added."""
+        return int(self._counts[0].sum())
+
+    @property
+    def top_index(self) -> npt.NDArray[np.int64]:
+        """Positions of the reviewers in the top-k ranking among all reviewers added, in the order of the ranking."""
+        return self._top_index.copy()
+
+    def add(self, scores: npt.ArrayLike, labels: npt.ArrayLike) -> None:
+        """Adds a chunk of reviewers.
+
+        Args:
+          scores: An array of anomalous scores.
+          labels: An array of flags whether each reviewer is anomalous.
+        """
+        valid = ~np.isnan(np.asarray(scores, dtype=np.float64))
+        index = np.flatnonzero(valid) + self._seen
+        self._seen += len(valid)
+        values = np.asarray(scores, dtype=np.float64)[valid]
+        flags = np.asarray(labels, dtype=bool)[valid]
+
+        # Bin i + 1 holds scores in [edges[i], edges[i + 1]), and the first and the last bins hold the outliers.
+        bins = np.searchsorted(self.edges, values, side="right")
+        width = self._counts.shape[1]
+        self._counts += np.bincount(flags * width + bins, minlength=2 * width).reshape(2, width)
+
+        if self.k <= 0:
+            return
+        if len(values) > self.k:
+            # Keep every reviewer tied with the k-th highest score so that ties are broken by the order.
+            kth = np.partition(values, len(values) - self.k)[len(values) - self.k]
+            candidates = values >= kth
+            values, flags, index = values[candidates], flags[candidates], index[candidates]
+        values = np.concatenate([self._top_scores, values])
+        index = np.concatenate([self._top_index, index])
+        top = np.lexsort((index, -values))[: self.k]
+        self._top_scores = values[top]
+        self._top_labels = np.concatenate([self._top_labels, flags])[top]
+        self._top_index = index[top]
+
+    def auc(self) -> Estimate:
+        """Estimates the area under the ROC curve.
+
+        Pairs of anomalous and normal reviewers in different bins are compared
+        exactly, and pairs in the same bin count one half, so the error is at
+        most a half of the fraction of such pairs.
+
+        Returns:
+          The estimate, or NaN if there are no anomalous or no normal reviewers.
+        """
+        negatives, positives = self._counts.astype(np.float64)
+        pairs = float(positives.sum() * negatives.sum())
+        if pairs == 0:
+            return Estimate(math.nan, math.nan)
+        below = np.cumsum(negatives) - negatives
+        ties = float(positives @ negatives)
+        return Estimate(float((positives @ below + ties / 2) / pairs), float(ties / 2 / pairs))
+
+    def at_least(
+        self, thresholds: npt.ArrayLike
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        """Estimates the numbers of reviewers whose scores are at least each threshold.
+
+        Args:
+          thresholds: An array of thresholds.
+
+        Returns:
+          The numbers of anomalous reviewers and normal reviewers, and bounds
+          of the errors of their sums, which are 0 for thresholds at bin edges.
+          Reviewers in the bin containing a threshold aren't counted.
+        """
+        thresholds = np.asarray(thresholds, dtype=np.float64)
+        suffix = np.cumsum(self._counts[:, ::-1], axis=1)[:, ::-1]
+        suffix = np.concatenate([suffix, np.zeros((2, 1), dtype=np.int64)], axis=1)
+        # Edge i is the lower end of bin i + 1, so bins from j + 1 hold scores at least edge j.
+        j = np.searchsorted(self.edges, thresholds, side="left")
+        exact = (j < len(self.edges)) & (self.edges[np.minimum(j, len(self.edges) - 1)] == thresholds)
+        error = np.where(exact, 0, self._counts.sum(axis=0)[j])
+        return suffix[1, j + 1], suffix[0, j + 1], error.astype(np.int64)
+
+    def dcg_curve(self) -> npt.NDArray[np.float64]:
+        """Computes DCG scores of the top-1 to top-k rankings exactly.
+
+        Returns:
+          An array whose i-th element is the DCG score of the top-(i+1) ranking.
+        """
+        discounts = np.log(np.maximum(np.arange(1, len(self._top_labels) + 1), 2)) / math.log(2)
+        res: npt.NDArray[np.float64] = np.cumsum(self._top_labels / discounts)
+        return res
+
+    def ndcg(self, k: Optional[int] = None) -> float:
+        """Computes the nDCG score of the top-k ranking exactly.
+
+        Args:
+          k: An integer at most the k of this sketch (default: the k of this sketch).
+
+        Returns:
+          The nDCG score.
+        """
+        k = self.k if k is None else min(k, self.k)
+        curve = self.dcg_curve()[:k]
+        if k <= 0 or not len(curve):
+            return 0.0
+        return float(curve[-1]) / ideal_dcg(k)
+
+    def precision(self, k: Optional[int] = None) -> float:
+        """Computes the precision of the top-k ranking exactly.
+
+        Args:
+          k: An integer at most the k of this sketch (default: the k of this sketch).
+
+        Returns:
+          The fraction of anomalous reviewers in the top-k ranking.
+        """
+        k = self.k if k is None else min(k, self.k)
+        top = self._top_labels[:k]
+        if not len(top):
+            return 0.0
+        return float(top.mean())
+
+
 class AnomalousReviews(NamedTuple):
     type1: int
     type2: int
@@ -0,0 +1,319 @@
+#
+#  significance.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Tests whether differences in metrics between two methods are significant.
+
+Reviewers are resampled by bootstrap to compute a confidence interval of the
+difference, and scores of the two methods are swapped at random to compute a
+p-value of a paired permutation test. Resamples are evaluated in batches of
+arrays, and batches can be spread across processes.
+"""
+
+from collections.abc import Callable
+from concurrent.futures import Executor
+from typing import Any, Final, NamedTuple, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+BATCH_ELEMENTS: Final = 1 << 22
+"""The maximum number of elements of a (resamples x reviewers) array evaluated at once."""
+
+BatchMetric = Callable[[npt.NDArray[np.float64], npt.NDArray[np.bool_], int], npt.NDArray[np.float64]]
+"""A function computing a metric of each row of score and label arrays with a parameter k."""
+
+
+def batch_auc(scores: npt.NDArray[np.float64], labels: npt.NDArray[np.bool_], _k: int = 0) -> npt.NDArray[np.float64]:
+    """Computes the area under the ROC curve of each row.
+
+    Tied scores get their average ranks.
+
+    Args:
+      scores: A (rows x reviewers) array of anomalous scores.
+      labels: A (rows x reviewers) array of flags whether each reviewer is anomalous.
+
+    Returns:
+      An array of the areas, which are NaN for rows without anomalous or normal reviewers.
+    """
+    rows, n = scores.shape
+    order = np.argsort(scores, axis=1, kind="stable")
+    s = np.take_along_axis(scores, order, axis=1)
+    sorted_labels = np.take_along_axis(labels, order, axis=1)
+
+    pos = np.broadcast_to(np.arange(n), (rows, n))
+    first = np.ones((rows, n), dtype=bool)
+    first[:, 1:] = s[:, 1:] != s[:, :-1]
+    last = np.ones((rows, n), dtype=bool)
+    last[:, :-1] = first[:, 1:]
+    start = np.maximum.accumulate(np.where(first, pos, 0), axis=1)
+    end = np.minimum.accumulate(np.where(last, pos, n - 1)[:, ::-1], axis=1)[:, ::-1]
+    ranks = (start + end) / 2 + 1
+
+    positives = sorted_labels.sum(axis=1)
+    negatives = n - positives
+    with np.errstate(divide="ignore", invalid="ignore"):
+        res: npt.NDArray[np.float64] = ((ranks * sorted_labels).sum(axis=1) - positives * (positives + 1) / 2) / (
+            positives * negatives
+        )
+    return res
+
+
+def batch_ndcg(scores: npt.NDArray[np.float64], labels: npt.NDArray[np.bool_], k: int) -> npt.NDArray[np.float64]:
+    """Computes nDCG of the top-k ranking of each row.
+
+    Reviewers having the same score are ranked in the given order as :func:`synthetic.eval.score.ndcg_at_k` does,
+    and only the top-k reviewers of each row are sorted.
+
+    Args:
+      scores: A (rows x reviewers) array of anomalous scores.
+      labels: A (rows x reviewers) array of flags whether each reviewer is anomalous.
+      k: The length of the ranking.
+
+    Returns:
+      An array of the nDCG scores, which are NaN for rows without anomalous reviewers.
+    """
+    rows, n = scores.shape
+    k = min(k, n)
+    if k <= 0:
+        return np.full(rows, np.nan)
+    if np.isnan(scores).any():
+        # NaN scores are ranked last like in a sort.
+        scores = np.where(np.isnan(scores), -np.inf, scores)
+    # The top-k reviewers are kept in their order so that a stable sort ranks tied ones in the given order.
+    top = np.sort(np.argpartition(-scores, k - 1, axis=1)[:, :k], axis=1)
+    kth = np.min(np.take_along_axis(scores, top, axis=1), axis=1, keepdims=True)
+    ties = np.count_nonzero(scores >= kth, axis=1) > k
+    if ties.any():
+        # Reviewers tied with the k-th score fill the rest of the ranking in their order.
+        tied = scores[ties] == kth[ties]
+        above = scores[ties] > kth[ties]
+        selected = above | (tied & (np.cumsum(tied, axis=1) <= k - above.sum(axis=1, keepdims=True)))
+        top[ties] = np.nonzero(selected)[1].reshape(-1, k)
+    top = np.take_along_axis(top, np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1, kind="stable"), axis=1)
+    discounts = 1 / np.maximum(np.log2(np.arange(1, k + 1)), 1)
+    gains = (np.take_along_axis(labels, top, axis=1) * discounts).sum(axis=1)
+    ideal = np.concatenate(([0.0], np.cumsum(discounts)))[np.minimum(labels.sum(axis=1), k)]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        res: npt.NDArray[np.float64] = gains / ideal
+    return res
+
+
+METRICS: Final[dict[str, BatchMetric]] = {"auc": batch_auc, "ndcg": batch_ndcg}
+"""Supported metrics keyed by their names."""
+
+
+class Comparison(NamedTuple):
+    """A result of comparing two methods."""
+
+    metric: str
+    a: float
+    """The metric of the method A."""
+    b: float
+    """The metric of the method B."""
+    difference: float
+    """The metric of A minus the one of B."""
+    low: float
+    """The lower bound of the bootstrap confidence interval of the difference."""
+    high: float
+    """The upper bound of the bootstrap confidence interval of the difference."""
+    p_value: float
+    """The two-sided p-value of the paired permutation test."""
+    resamples: int
+
+
+def _ranks(scores: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    """Normalizes scores into their average ranks, which don't change rank-based metrics."""
+    _, inverse, counts = np.unique(scores, return_inverse=True, return_counts=True)
+    return (np.cumsum(counts) - (counts - 1) / 2)[inverse] / len(scores)
+
+
+def _tie_groups(scores: npt.NDArray[np.float64]) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+    """Sorts scores once for :func:`_weighted_auc`.
+
+    Returns:
+      The indices sorting the scores and the starts of groups of tied scores in the sorted order.
+    """
+    order = np.argsort(scores, kind="stable")
+    s = scores[order]
+    starts = np.flatnonzero(np.concatenate(([True], s[1:] != s[:-1]))) if len(s) else np.empty(0, dtype=np.intp)
+    return order, starts
+
+
+def _weighted_auc(
+    weights: npt.NDArray[Any], labels: npt.NDArray[np.bool_], starts: npt.NDArray[np.intp]
+) -> npt.NDArray[np.float64]:
+    """Computes the area under the ROC curve of each row of weights of reviewers sorted by their scores.
+
+    The area is the rank sum statistic, i.e., the fraction of pairs of anomalous and normal reviewers where the
+    anomalous one has the higher score counting ties as halves, which needs no sorting per row.
+
+    Args:
+      weights: A (rows x reviewers) array of how many times each reviewer is in each row, in the sorted order.
+      labels: Flags whether each reviewer is anomalous, in the sorted order.
+      starts: Starts of groups of tied scores computed by :func:`_tie_groups`.
+
+    Returns:
+      An array of the areas, which are NaN for rows without anomalous or normal reviewers.
+    """
+    positives = np.add.reduceat(weights * labels, starts, axis=1, dtype=np.float64)
+    negatives = np.add.reduceat(weights * ~labels, starts, axis=1, dtype=np.float64)
+    below = np.cumsum(negatives, axis=1) - negatives
+    with np.errstate(divide="ignore", invalid="ignore"):
+        res: npt.NDArray[np.float64] = (positives * (below + negatives / 2)).sum(axis=1) / (
+            positives.sum(axis=1) * negatives.sum(axis=1)
+        )
+    return res
+
+
+def _bootstrap(
+    metric: str,
+    k: int,
+    a: npt.NDArray[np.float64],
+    b: npt.NDArray[np.float64],
+    labels: npt.NDArray[np.bool_],
+    size: int,
+    seed: np.random.SeedSequence,
+) -> npt.NDArray[np.float64]:
+    """Computes differences of the metric for bootstrap resamples of reviewers.
+
+    AUC is computed from how many times each reviewer is drawn with the scores sorted only once.
+    """
+    rng = np.random.default_rng(seed)
+    fn = METRICS[metric]
+    n = len(a)
+    batch = max(BATCH_ELEMENTS // max(n, 1), 1)
+    order_a, starts_a = _tie_groups(a)
+    order_b, starts_b = _tie_groups(b)
+    res = []
+    for i in range(0, size, batch):
+        rows = min(batch, size - i)
+        idx = rng.integers(0, n, size=(rows, n))
+        if metric != "auc":
+            res.append(fn(a[idx], labels[idx], k) - fn(b[idx], labels[idx], k))
+            continue
+        counts = np.bincount((idx + n * np.arange(rows)[:, np.newaxis]).ravel(), minlength=rows * n)
+        counts = counts.reshape(rows, n)
+        res.append(
+            _weighted_auc(counts[:, order_a], labels[order_a], starts_a)
+            - _weighted_auc(counts[:, order_b], labels[order_b], starts_b)
+        )
+    return np.concatenate(res) if res else np.empty(0)
+
+
+def _permutation(
+    metric: str,
+    k: int,
+    a: npt.NDArray[np.float64],
+    b: npt.NDArray[np.float64],
+    labels: npt.NDArray[np.bool_],
+    size: int,
+    seed: np.random.SeedSequence,
+) -> npt.NDArray[np.float64]:
+    """Computes differences of the metric when scores of the two methods are swapped at random per reviewer.
+
+    AUC is computed over the scores of both methods sorted only once, where each row selects one of the two scores
+    of each reviewer.
+    """
+    rng = np.random.default_rng(seed)
+    fn = METRICS[metric]
+    n = len(a)
+    batch = max(BATCH_ELEMENTS // max(2 * n, 1), 1)
+    tiled = np.broadcast_to(labels, (batch, n))
+    order, starts = _tie_groups(np.concatenate((a, b)))
+    both = np.concatenate((labels, labels))[order]
+    res = []
+    for i in range(0, size, batch):
+        rows = min(batch, size - i)
+        swap = rng.random((rows, n)) < 0.5
+        if metric != "auc":
+            res.append(fn(np.where(swap, b, a), tiled[:rows], k) - fn(np.where(swap, a, b), tiled[:rows], k))
+            continue
+        # Columns are the scores of A followed by the ones of B, and A's side takes B's score if swapped.
+        side_a = np.concatenate((~swap, swap), axis=1)[:, order]
+        res.append(_weighted_auc(side_a, both, starts) - _weighted_auc(~side_a, both, starts))
+    return np.concatenate(res) if res else np.empty(0)
+
+
+def compare(
+    a: npt.ArrayLike,
+    b: npt.ArrayLike,
+    labels: npt.ArrayLike,
+    metric: str = "auc",
+    resamples: int = 10000,
+    alpha: float = 0.05,
+    seed: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    jobs: int = 1,
+) -> Comparison:
+    """Compares a metric of two methods with bootstrap and permutation tests.
+
+    Args:
+      a: anomalous scores of reviewers given by the method A.
+      b: anomalous scores of the same reviewers given by the method B.
+      labels: flags whether each reviewer is anomalous.
+      metric: ``auc`` or ``ndcg``; nDCG is computed for the top-k ranking where k is the number of anomalous reviewers.
+      resamples: the number of resamples of each test.
+      alpha: the significance level of the confidence interval.
+      seed: seed of the random number generator.
+      executor: if given, resamples are split into *jobs* parts evaluated in it.
+      jobs: the number of parts.
+
+    Returns:
+      The result of the comparison.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"unknown metric: {metric}")
+    a = _ranks(np.asarray(a, dtype=np.float64))
+    b = _ranks(np.asarray(b, dtype=np.float64))
+    labels = np.asarray(labels, dtype=bool)
+    if not a.shape == b.shape == labels.shape:
+        raise ValueError("a, b, and labels must have the same length")
+    k = int(labels.sum())
+
+    fn = METRICS[metric]
+    score_a = float(fn(a[np.newaxis], labels[np.newaxis], k)[0])
+    score_b = float(fn(b[np.newaxis], labels[np.newaxis], k)[0])
+
+    parts = max(jobs if executor else 1, 1)
+    sizes = [resamples // parts + (i < resamples % parts) for i in range(parts)]
+    seeds = np.random.SeedSequence(seed).spawn(2 * parts)
+    results = {}
+    for kind, fn_resample, ss in (
+        ("bootstrap", _bootstrap, seeds[:parts]),
+        ("permutation", _permutation, seeds[parts:]),
+    ):
+        args = ([metric] * parts, [k] * parts, [a] * parts, [b] * parts, [labels] * parts, sizes, ss)
+        chunks = executor.map(fn_resample, *args) if executor else map(fn_resample, *args)
+        results[kind] = np.concatenate(list(chunks))
+
+    bootstrap = results["bootstrap"][~np.isnan(results["bootstrap"])]
+    null = results["permutation"][~np.isnan(results["permutation"])]
+    difference = score_a - score_b
+    low, high = np.quantile(bootstrap, [alpha / 2, 1 - alpha / 2]) if len(bootstrap) else (np.nan, np.nan)
+    return Comparison(
+        metric=metric,
+        a=score_a,
+        b=score_b,
+        difference=difference,
+        low=float(low),
+        high=float(high),
+        p_value=float((1 + np.count_nonzero(np.abs(null) >= abs(difference) - 1e-12)) / (len(null) + 1)),
+        resamples=resamples,
+    )
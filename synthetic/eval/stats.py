@@ -0,0 +1,167 @@
+#
+#  stats.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Profiles characteristics of a dataset."""
+
+from typing import Any, Final, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from synthetic.eval.score import anomaly_types
+from synthetic.loader import Dataset
+
+TYPES: Final = ("normal", "type1", "type2", "type3")
+"""Names of the types of reviewers in the order of :meth:`synthetic.eval.score.anomaly_types`."""
+
+SCORE_BINS: Final = np.linspace(0, 5, 11)
+"""Edges of the bins of score histograms."""
+
+
+def distribution(values: npt.NDArray[np.int64]) -> dict[str, Any]:
+    """Summarizes a degree distribution.
+
+    Args:
+      values: Degrees of nodes.
+
+    Returns:
+      A dictionary of the minimum, maximum, mean, median, 90th and 99th
+      percentiles, and a histogram whose bins are ``[0, 1)``, ``[1, 2)``,
+      ``[2, 4)``, ``[4, 8)``, and so on.
+    """
+    if not len(values):
+        return {"nodes": 0}
+    top = int(values.max())
+    edges = np.concatenate(([0], 2 ** np.arange(top.bit_length() + 1)))
+    counts, _ = np.histogram(values, bins=edges)
+    p50, p90, p99 = np.percentile(values, [50, 90, 99]).tolist()
+    return {
+        "nodes": len(values),
+        "min": int(values.min()),
+        "max": top,
+        "mean": float(values.mean()),
+        "median": p50,
+        "p90": p90,
+        "p99": p99,
+        "bins": edges[:-1].tolist(),
+        "counts": counts.tolist(),
+    }
+
+
+def _density(edges: int, rows: int, columns: int) -> Optional[float]:
+    """Computes the density of a block of rows x columns having the given number of edges."""
+    return edges / (rows * columns) if rows and columns else None
+
+
+class DatasetStats:
+    """Accumulates statistics of a dataset.
+
+    Reviews can be added chunk by chunk, e.g., from
+    :meth:`synthetic.loader.iter_dataset`, and each chunk is processed with
+    vectorized operations only. All chunks must have the same reviewers and
+    products.
+    """
+
+    def __init__(self) -> None:
+        self._types: Optional[npt.NDArray[np.int8]] = None
+        self._reviewer_degrees = np.zeros(0, dtype=np.int64)
+        self._product_degrees = np.zeros(0, dtype=np.int64)
+        self._histograms = np.zeros((len(TYPES), len(SCORE_BINS) - 1), dtype=np.int64)
+        self._sums = np.zeros(len(TYPES))
+        self._targets = np.zeros((len(TYPES), 0), dtype=bool)
+
+    def add(self, dataset: Dataset) -> None:
+        """Adds reviews of a dataset.
+
+        Args:
+          dataset: The dataset.
+        """
+        if self._types is None:
+            self._types = anomaly_types(dataset.reviewer_names)
+            self._reviewer_degrees = np.zeros(len(dataset.reviewer_ids), dtype=np.int64)
+            self._product_degrees = np.zeros(len(dataset.product_ids), dtype=np.int64)
+            self._targets = np.zeros((len(TYPES), len(dataset.product_ids)), dtype=bool)
+
+        self._reviewer_degrees += np.bincount(dataset.review_reviewers, minlength=len(self._reviewer_degrees))
+        self._product_degrees += np.bincount(dataset.review_products, minlength=len(self._product_degrees))
+
+        types = self._types[dataset.review_reviewers]
+        bins = np.clip(np.searchsorted(SCORE_BINS, dataset.review_scores, side="right") - 1, 0, len(SCORE_BINS) - 2)
+        self._histograms += np.bincount(types * (len(SCORE_BINS) - 1) + bins, minlength=self._histograms.size).reshape(
+            self._histograms.shape
+        )
+        self._sums += np.bincount(types, weights=dataset.review_scores, minlength=len(TYPES))
+        self._targets[types, dataset.review_products] = True
+
+    def summary(self) -> dict[str, Any]:
+        """Summarizes the added reviews.
+
+        Returns:
+          A dictionary of the numbers of nodes and reviews, the degree
+          distributions of reviewers and products, the score histogram, the
+          number, mean, and histogram of scores of each type of reviewers, and
+          the collusion blocks, i.e., the anomalous reviewers of each type and
+          the products they review, with their densities.
+        """
+        types = self._types if self._types is not None else np.zeros(0, dtype=np.int8)
+        reviews = self._histograms.sum(axis=1)
+        reviewers = np.bincount(types, minlength=len(TYPES))
+        products = self._targets.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = self._sums / reviews
+        anomalous = int(reviews[1:].sum())
+        targeted = int(self._targets[1:].any(axis=0).sum())
+
+        return {
+            "reviewers": len(self._reviewer_degrees),
+            "products": len(self._product_degrees),
+            "reviews": int(reviews.sum()),
+            "density": _density(int(reviews.sum()), len(self._reviewer_degrees), len(self._product_degrees)),
+            "reviewer_degrees": distribution(self._reviewer_degrees),
+            "product_degrees": distribution(self._product_degrees),
+            "scores": {"bins": SCORE_BINS[:-1].tolist(), "counts": self._histograms.sum(axis=0).tolist()},
+            "types": {
+                name: {
+                    "reviewers": int(reviewers[t]),
+                    "reviews": int(reviews[t]),
+                    "mean_score": float(means[t]) if reviews[t] else None,
+                    "counts": self._histograms[t].tolist(),
+                }
+                for t, name in enumerate(TYPES)
+            },
+            "collusion": {
+                **{
+                    name: {
+                        "reviewers": int(reviewers[t]),
+                        "products": int(products[t]),
+                        "reviews": int(reviews[t]),
+                        "density": _density(int(reviews[t]), int(reviewers[t]), int(products[t])),
+                    }
+                    for t, name in enumerate(TYPES)
+                    if t
+                },
+                "anomalous": {
+                    "reviewers": int(reviewers[1:].sum()),
+                    "products": targeted,
+                    "reviews": anomalous,
+                    "density": _density(anomalous, int(reviewers[1:].sum()), targeted),
+                },
+            },
+        }
@@ -0,0 +1,249 @@
+#
+#  tune.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Searches parameters of an algorithm with successive halving and Hyperband.
+
+The budget of a trial is the number of updates of a graph: many parameter
+settings are evaluated after a few updates, and only the best ones are
+evaluated again with more updates. Graphs which can export and import their
+scores continue from the scores of the previous round, so that only the extra
+updates are run.
+"""
+
+import itertools
+import math
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Executor
+from functools import cache
+from typing import Final, NamedTuple, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from synthetic.eval.cache import GraphCache
+from synthetic.eval.evaluator import Evaluator as GraphEvaluator
+from synthetic.eval.graph import GraphConstructor, WarmStartGraph, export_scores, list_installed_graphs
+from synthetic.eval.score import auc, ndcg_at_k, precision_at_k
+from synthetic.scores import Scores
+
+Params = tuple[tuple[str, float], ...]
+"""A setting of parameters, i.e., pairs of a parameter name and its value."""
+
+METRICS: Final[dict[str, Callable[[npt.NDArray[np.float64], npt.NDArray[np.bool_]], float]]] = {
+    "auc": auc,
+    "ndcg": lambda scores, labels: ndcg_at_k(scores, labels, int(labels.sum())),
+    "precision": lambda scores, labels: precision_at_k(scores, labels, int(labels.sum())),
+}
+"""Metrics to be maximized keyed by their names, which take anomalous scores and flags whether reviewers are anomalous.
+
+ndcg and precision are computed for the top-k ranking where k is the number of anomalous reviewers.
+"""
+
+
+class Trial(NamedTuple):
+    """A result of evaluating a parameter setting."""
+
+    bracket: int
+    """Index of the Hyperband bracket."""
+    rung: int
+    """Index of the round of successive halving in the bracket."""
+    params: Params
+    """The parameter setting."""
+    loop: int
+    """The number of updates."""
+    score: float
+    """The value of the metric."""
+
+
+class Outcome(NamedTuple):
+    """A value of the metric and the scores an evaluation continues from."""
+
+    score: float
+    """The value of the metric."""
+    scores: Optional[Scores]
+    """Exported scores of the graph, or None if the graph can't continue from them."""
+
+
+Evaluator = Callable[[Params, int, Optional[Scores]], Outcome]
+"""A function evaluating a parameter setting after a given number of updates starting from exported scores if given."""
+
+
+def grid(space: dict[str, Sequence[float]]) -> list[Params]:
+    """Enumerates all parameter settings in a grid.
+
+    Args:
+      space: Candidate values keyed by parameter names.
+
+    Returns:
+      A list of parameter settings.
+    """
+    return [tuple(zip(space, values)) for values in itertools.product(*space.values())]
+
+
+@cache
+def _installed_graphs() -> dict[str, GraphConstructor]:
+    return list_installed_graphs()
+
+
+def evaluate(
+    method: str,
+    metric: str,
+    dataset: Optional[str],
+    sample: Optional[float],
+    seed: Optional[int],
+    params: Params,
+    loop: int,
+    warm_start: Optional[Scores] = None,
+    cache: Optional[GraphCache] = None,
+) -> Outcome:
+    """Evaluates a parameter setting of an installed algorithm.
+
+    This function is meant to be bound with :func:`functools.partial` except
+    *params*, *loop*, and *warm_start* and passed to :func:`successive_halving`
+    or :func:`hyperband`, and it can run in worker processes.
+
+    Args:
+      method: name of the algorithm.
+      metric: name of the metric in :data:`METRICS`.
+      dataset: directory of an external dataset. If None, the synthetic dataset is used.
+      sample: if set, the fraction of reviewers to be loaded.
+      seed: seed used to sample reviewers.
+      params: the parameter setting.
+      loop: the number of updates.
+      warm_start: if given, scores exported by a previous evaluation the graph starts from.
+      cache: if given, the cache of loaded graphs.
+
+    Returns:
+      The value of the metric and the scores of the graph if it implements
+      :class:`synthetic.eval.graph.WarmStartGraph`.
+    """
+    runner = GraphEvaluator(dataset, sample=sample, seed=seed, cache=cache, graphs=_installed_graphs())
+    g = runner.graph(method, params, warm_start)
+    snapshot = runner.run(g, loop)
+    return Outcome(
+        METRICS[metric](snapshot.scores(), snapshot.types > 0),
+        export_scores(g) if isinstance(g, WarmStartGraph) else None,
+    )
+
+
+def successive_halving(
+    evaluator: Evaluator,
+    configs: Sequence[Params],
+    min_loop: int,
+    max_loop: int,
+    eta: int = 3,
+    executor: Optional[Executor] = None,
+    bracket: int = 0,
+) -> Iterator[Trial]:
+    """Runs successive halving.
+
+    All settings are evaluated with *min_loop* updates, the best 1/*eta* of
+    them, but at least one, are evaluated again with *eta* times more updates,
+    and so on until the number of updates reaches *max_loop*. Settings whose evaluation
+    returned scores continue from them with only the extra updates, and the
+    others start over.
+
+    Args:
+      evaluator: function evaluating a parameter setting.
+      configs: parameter settings.
+      min_loop: the number of updates in the first round.
+      max_loop: the maximum number of updates.
+      eta: the reduction factor.
+      executor: if given, evaluations in each round run in it.
+      bracket: index of the bracket reported in the results.
+
+    Yields:
+      Results of all evaluations.
+    """
+    if eta < 2:
+        raise ValueError(f"eta must be greater than 1: {eta}")
+
+    rung = 0
+    done = 0
+    loop = min(max(min_loop, 1), max_loop)
+    states: list[Optional[Scores]] = [None] * len(configs)
+    while configs:
+        loops = [loop if s is None else loop - done for s in states]
+        outcomes = list(
+            executor.map(evaluator, configs, loops, states) if executor else map(evaluator, configs, loops, states)
+        )
+        yield from (Trial(bracket, rung, c, loop, o.score) for c, o in zip(configs, outcomes, strict=True))
+
+        if loop >= max_loop:
+            return
+        scores = np.asarray([o.score for o in outcomes], dtype=np.float64)
+        # At least the best setting survives so that it's evaluated with max_loop updates.
+        survivors = np.argsort(-np.nan_to_num(scores, nan=-np.inf), kind="stable")[: max(1, len(configs) // eta)]
+        configs = [configs[i] for i in survivors]
+        states = [outcomes[i].scores for i in survivors]
+        rung += 1
+        done = loop
+        loop = min(loop * eta, max_loop)
+
+
+def hyperband(
+    evaluator: Evaluator,
+    configs: Sequence[Params],
+    max_loop: int,
+    eta: int = 3,
+    executor: Optional[Executor] = None,
+    seed: Optional[int] = None,
+) -> Iterator[Trial]:
+    """Runs Hyperband.
+
+    Hyperband runs successive halving in several brackets, each of which
+    trades the number of settings for the number of updates in the first
+    round. Settings of each bracket are sampled from *configs*.
+
+    Args:
+      evaluator: function evaluating a parameter setting.
+      configs: candidate parameter settings.
+      max_loop: the maximum number of updates.
+      eta: the reduction factor.
+      executor: if given, evaluations in each round run in it.
+      seed: seed used to sample settings.
+
+    Yields:
+      Results of all evaluations.
+    """
+    if eta < 2:
+        raise ValueError(f"eta must be greater than 1: {eta}")
+
+    rng = np.random.default_rng(seed)
+    s_max = int(math.log(max_loop, eta) + 1e-9) if max_loop > 0 else 0
+    for s in range(s_max, -1, -1):
+        n = min(math.ceil((s_max + 1) / (s + 1) * eta**s), len(configs))
+        sampled = [configs[i] for i in sorted(rng.choice(len(configs), size=n, replace=False))]
+        yield from successive_halving(
+            evaluator, sampled, max(max_loop // eta**s, 1), max_loop, eta, executor, bracket=s_max - s
+        )
+
+
+def best_trial(trials: Sequence[Trial]) -> Trial:
+    """Finds the best trial among the ones with the largest number of updates.
+
+    Args:
+      trials: results of evaluations.
+
+    Returns:
+      The trial having the highest score.
+    """
+    loop = max(t.loop for t in trials)
+    return max((t for t in trials if t.loop == loop), key=lambda t: -math.inf if math.isnan(t.score) else t.score)
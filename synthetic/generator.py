@@ -0,0 +1,475 @@
+#
+#  generator.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Provide a generator of synthetic review datasets of arbitrary sizes and injection of anomalous reviewers.
+
+Generated datasets mimic the bundled one: normal reviewers review products
+chosen by popularity with scores around the quality of each product, and
+anomalous reviewers are injected into them.
+
+Injected anomalous reviewers have `anomaly` in their names, i.e., independent
+anomalous reviewers review random products with scores opposite to their mean
+scores, and type-2 and type-3 anomalous reviewers, which have `_1` and `_2` in
+their names, respectively, collude to give low scores to a few target
+products. Anomalous reviewers can be injected into any dataset, e.g., a real
+one, to evaluate algorithms with known ground truth.
+"""
+
+import os
+import shutil
+import tempfile
+from os import path
+from typing import Final, NamedTuple, TextIO
+
+import numpy as np
+import numpy.typing as npt
+
+from synthetic.loader import (
+    PRODUCT_FILE,
+    REVIEW_FILE,
+    REVIEWER_FILE,
+    Dataset,
+    dataset_file,
+    line_chunks,
+    lookup,
+    open_table,
+    parse_nodes,
+    parse_reviews,
+)
+
+ANOMALOUS_RATES: Final = (0.027, 0.01, 0.02)
+"""Default fractions of type-1, type-2, and type-3 anomalous reviewers, which are the ones of the bundled dataset."""
+
+_TAGS: Final = np.array(["", "(anomaly)", "_1(anomaly)", "_2(anomaly)"])
+"""Suffixes of names of each type of reviewers, which :meth:`synthetic.anomaly.anomaly_types` recognizes."""
+
+_MAX_SCORE: Final = np.nextafter(5.0, 0.0)
+_WRITE_CHUNK: Final = 1 << 20
+"""The number of lines written at once."""
+_TMP_PREFIX: Final = ".inject-"
+"""Prefix of temporary directories where injected datasets are written."""
+
+
+def _degrees(rng: np.random.Generator, size: int, products: int) -> npt.NDArray[np.intp]:
+    """Draw heavy-tailed numbers of reviews, which are at least two before duplicated reviews are removed."""
+    return np.minimum(1 + rng.zipf(2.0, size), products).astype(np.intp)
+
+
+def _unique_reviews(
+    reviewers: npt.NDArray[np.intp], products: npt.NDArray[np.intp], size: int
+) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+    """Remove duplicated pairs of a reviewer and a product, sorting reviews by reviewers."""
+    pairs = np.sort(reviewers.astype(np.int64) * size + products)
+    pairs = pairs[np.concatenate((pairs[:1] == pairs[:1], pairs[1:] != pairs[:-1]))]
+    return (pairs // size).astype(np.intp), (pairs % size).astype(np.intp)
+
+
+class Injection(NamedTuple):
+    """Anomalous reviewers injected into a dataset."""
+
+    reviewer_ids: npt.NDArray[np.int64]
+    reviewer_names: npt.NDArray[np.str_]
+    review_reviewers: npt.NDArray[np.intp]
+    """Positions of the reviewers of the injected reviews in :attr:`reviewer_ids`."""
+    review_products: npt.NDArray[np.intp]
+    """Positions of the products of the injected reviews in the dataset."""
+    review_scores: npt.NDArray[np.float64]
+    review_times: npt.NDArray[np.float64]
+
+
+def _counts(rates: tuple[float, float, float], reviewers: int) -> npt.NDArray[np.intp]:
+    """Compute the numbers of each type of anomalous reviewers."""
+    if any(r < 0 for r in rates):
+        raise ValueError(f"rates must not be negative: {rates}")
+    return np.round(np.asarray(rates) * reviewers).astype(np.intp)
+
+
+class PrefixConflictError(ValueError):
+    """Raised if names of injected reviewers conflict with names of existing reviewers."""
+
+
+class DestinationError(ValueError):
+    """Raised if the destination of a dataset with injected reviewers is the source directory."""
+
+
+def _planted_names(
+    counts: npt.NDArray[np.intp], first_id: int, prefix: str
+) -> tuple[npt.NDArray[np.int8], npt.NDArray[np.int64], npt.NDArray[np.str_]]:
+    """Compute types, IDs, and names of anomalous reviewers, which depend only on their numbers and the prefix."""
+    types = np.repeat(np.arange(1, 4, dtype=np.int8), counts)
+    reviewer_ids = np.arange(first_id, first_id + len(types), dtype=np.int64)
+    return types, reviewer_ids, np.char.add(np.char.add(prefix, reviewer_ids.astype(np.str_)), _TAGS[types])
+
+
+def _check_prefix(
+    reviewer_names: npt.NDArray[np.str_], counts: npt.NDArray[np.intp], first_id: int, prefix: str
+) -> None:
+    """Check that names of anomalous reviewers to be injected don't conflict with existing ones.
+
+    Raises:
+      PrefixConflictError: if some names conflict.
+    """
+    if np.isin(_planted_names(counts, first_id, prefix)[2], reviewer_names).any():
+        raise PrefixConflictError(
+            f"names of injected reviewers conflict with existing ones; change the prefix: {prefix}"
+        )
+
+
+def _plant(
+    rng: np.random.Generator,
+    counts: npt.NDArray[np.intp],
+    first_id: int,
+    means: npt.NDArray[np.float64],
+    times: tuple[float, float] | None = None,
+    prefix: str = "s",
+) -> Injection:
+    """Create anomalous reviewers and their reviews.
+
+    Args:
+      rng: Random number generator.
+      counts: The numbers of type-1, type-2, and type-3 anomalous reviewers.
+      first_id: ID of the first anomalous reviewer, and the others have the following IDs.
+      means: Mean scores of products, which are NaN for products without reviews.
+      times: If given, the range of timestamps of the reviews.
+      prefix: Prefix of the names of the anomalous reviewers.
+
+    Returns:
+      The anomalous reviewers and their reviews.
+    """
+    products = len(means)
+    types, reviewer_ids, names = _planted_names(counts, first_id, prefix)
+    if not products:
+        types = types[:0]
+        reviewer_ids = reviewer_ids[:0]
+        names = names[:0]
+
+    # Independent anomalous reviewers review random products.
+    independent = np.flatnonzero(types == 1)
+    review_reviewers = np.repeat(independent, _degrees(rng, len(independent), products))
+    review_products = rng.integers(0, max(products, 1), len(review_reviewers))
+
+    # Colluding anomalous reviewers give two reviews to their own target products.
+    for t in (2, 3):
+        members = np.flatnonzero(types == t)
+        if not len(members):
+            continue
+        targets = rng.choice(products, size=min(max(len(members), 2), products), replace=False)
+        first = rng.integers(0, len(targets), len(members))
+        chosen = [first]
+        if len(targets) > 1:
+            chosen.append((first + rng.integers(1, len(targets), len(members))) % len(targets))
+        review_reviewers = np.concatenate((review_reviewers, np.repeat(members, len(chosen))))
+        review_products = np.concatenate((review_products, targets[np.column_stack(chosen).ravel()]))
+    review_reviewers, review_products = _unique_reviews(review_reviewers, review_products, max(products, 1))
+
+    independent_reviews = types[review_reviewers] == 1
+    scores = rng.uniform(0, 1.5, len(review_reviewers))
+    scores[independent_reviews] = (
+        5
+        - np.nan_to_num(means, nan=2.5)[review_products[independent_reviews]]
+        + rng.normal(0, 1, np.count_nonzero(independent_reviews))
+    )
+
+    return Injection(
+        reviewer_ids=reviewer_ids,
+        reviewer_names=names,
+        review_reviewers=review_reviewers,
+        review_products=review_products,
+        review_scores=np.clip(scores, 0, _MAX_SCORE),
+        review_times=rng.uniform(*times, len(review_reviewers)) if times else np.full(len(review_reviewers), np.nan),
+    )
+
+
+def _inject(dataset: Dataset, counts: npt.NDArray[np.intp], rng: np.random.Generator, prefix: str) -> Dataset:
+    """Inject the given numbers of anomalous reviewers into a dataset."""
+    reviews = np.bincount(dataset.review_products, minlength=len(dataset.product_ids))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = np.bincount(dataset.review_products, dataset.review_scores, len(dataset.product_ids)) / reviews
+    timed = bool(len(dataset.review_times)) and not np.isnan(dataset.review_times).any()
+    times = (float(dataset.review_times.min()), float(dataset.review_times.max())) if timed else None
+
+    first_id = int(dataset.reviewer_ids.max(initial=0)) + 1
+    _check_prefix(dataset.reviewer_names, counts, first_id, prefix)
+    planted = _plant(rng, counts, first_id, means, times, prefix)
+
+    return Dataset(
+        reviewer_ids=np.concatenate((dataset.reviewer_ids, planted.reviewer_ids)),
+        reviewer_names=np.concatenate((dataset.reviewer_names, planted.reviewer_names)),
+        product_ids=dataset.product_ids,
+        product_names=dataset.product_names,
+        review_reviewers=np.concatenate(
+            (dataset.review_reviewers, planted.review_reviewers + len(dataset.reviewer_ids))
+        ),
+        review_products=np.concatenate((dataset.review_products, planted.review_products)),
+        review_scores=np.concatenate((dataset.review_scores, planted.review_scores)),
+        review_times=np.concatenate((dataset.review_times, planted.review_times)),
+    )
+
+
+def inject(
+    dataset: Dataset,
+    rates: tuple[float, float, float] = ANOMALOUS_RATES,
+    seed: int | None = None,
+    prefix: str = "s",
+) -> Dataset:
+    """Inject anomalous reviewers into a dataset.
+
+    Args:
+      dataset: The dataset.
+      rates: The numbers of type-1, type-2, and type-3 anomalous reviewers to
+        be injected relative to the number of reviewers in the dataset.
+      seed: Seed of the random number generator.
+      prefix: Prefix of the names of the injected reviewers, which are
+        followed by their IDs and the tags of their types.
+
+    Returns:
+      A new dataset which has the injected reviewers after the existing ones.
+
+    Raises:
+      PrefixConflictError: if names of the injected reviewers conflict with existing ones.
+    """
+    return _inject(dataset, _counts(rates, len(dataset.reviewer_ids)), np.random.default_rng(seed), prefix)
+
+
+def generate_dataset(
+    reviewers: int,
+    products: int | None = None,
+    rates: tuple[float, float, float] = ANOMALOUS_RATES,
+    seed: int | None = None,
+    times: tuple[float, float] | None = None,
+) -> Dataset:
+    """Generate a synthetic dataset.
+
+    Args:
+      reviewers: The number of reviewers.
+      products: The number of products. If None, it's about 46% of the
+        reviewers as in the bundled dataset.
+      rates: Fractions of type-1, type-2, and type-3 anomalous reviewers.
+      seed: Seed of the random number generator.
+      times: If given, the range of POSIX timestamps of reviews, which arrive
+        uniformly in it. Otherwise, reviews don't have timestamps.
+
+    Returns:
+      The generated dataset.
+    """
+    if reviewers < 1:
+        raise ValueError(f"reviewers must be positive: {reviewers}")
+    if times is not None and not times[0] <= times[1]:
+        raise ValueError(f"invalid range of timestamps: {times}")
+    if products is None:
+        products = max(reviewers * 459 // 1000, 1)
+    rng = np.random.default_rng(seed)
+    counts = _counts(rates, reviewers)
+    normal = reviewers - int(counts.sum())
+
+    # Normal reviewers choose products by popularity and give scores around their quality.
+    popularity = 1 / np.arange(1, products + 1) ** 0.8
+    review_reviewers = np.repeat(np.arange(normal), _degrees(rng, normal, products))
+    review_products = rng.permutation(products)[
+        rng.choice(products, size=len(review_reviewers), p=popularity / popularity.sum())
+    ]
+    review_reviewers, review_products = _unique_reviews(review_reviewers, review_products, products)
+    scores = rng.uniform(0.5, 4.5, products)[review_products] + rng.normal(0, 1, len(review_reviewers))
+    # Timestamps are drawn from a child generator so that they don't change the other columns, and anomalous
+    # reviews are injected in the range of the timestamps of the normal ones.
+    review_times = (
+        rng.spawn(1)[0].uniform(*times, len(review_reviewers)) if times else np.full(len(review_reviewers), np.nan)
+    )
+
+    reviewer_ids = np.arange(1, normal + 1, dtype=np.int64)
+    dataset = Dataset(
+        reviewer_ids=reviewer_ids,
+        reviewer_names=np.char.add("s", reviewer_ids.astype(np.str_)),
+        product_ids=np.arange(reviewers + 1, reviewers + products + 1, dtype=np.int64),
+        product_names=np.char.add("o", np.arange(1, products + 1).astype(np.str_)),
+        review_reviewers=review_reviewers,
+        review_products=review_products,
+        review_scores=np.clip(scores, 0, _MAX_SCORE),
+        review_times=review_times,
+    )
+    return _inject(dataset, counts, rng, "s")
+
+
+def _write_nodes(fp: TextIO, ids: npt.NDArray[np.int64], names: npt.NDArray[np.str_]) -> None:
+    """Write ``id name`` lines."""
+    for i in range(0, len(ids), _WRITE_CHUNK):
+        lines = np.char.add(np.char.add(ids[i : i + _WRITE_CHUNK].astype(np.str_), " "), names[i : i + _WRITE_CHUNK])
+        fp.write("".join(np.char.add(lines, "\n").tolist()))
+
+
+def _write_reviews(
+    fp: TextIO,
+    reviewer_ids: npt.NDArray[np.int64],
+    product_ids: npt.NDArray[np.int64],
+    scores: npt.NDArray[np.float64],
+    times: npt.NDArray[np.float64] | None,
+) -> None:
+    """Write ``reviewer-id product-id score [timestamp]`` lines."""
+    for i in range(0, len(scores), _WRITE_CHUNK):
+        chunk = slice(i, i + _WRITE_CHUNK)
+        columns = [reviewer_ids[chunk], product_ids[chunk], scores[chunk]]
+        if times is not None:
+            columns.append(times[chunk])
+        np.savetxt(fp, np.column_stack(columns), fmt=["%d", "%d", "%.17g", "%.17g"][: len(columns)])
+
+
+def write_dataset(dataset: Dataset, directory: str | os.PathLike[str]) -> None:
+    """Write a dataset in the same format as the bundled one.
+
+    Timestamps of reviews are written as the fourth column unless they are NaN.
+
+    Args:
+      dataset: The dataset.
+      directory: Directory where ``reviewer.dat``, ``product.dat``, and ``review.dat`` are written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with open(path.join(directory, REVIEWER_FILE), "w") as fp:
+        _write_nodes(fp, dataset.reviewer_ids, dataset.reviewer_names)
+    with open(path.join(directory, PRODUCT_FILE), "w") as fp:
+        _write_nodes(fp, dataset.product_ids, dataset.product_names)
+
+    timed = bool(len(dataset.review_times)) and not np.isnan(dataset.review_times).any()
+    with open(path.join(directory, REVIEW_FILE), "w") as fp:
+        _write_reviews(
+            fp,
+            dataset.reviewer_ids[dataset.review_reviewers],
+            dataset.product_ids[dataset.review_products],
+            dataset.review_scores,
+            dataset.review_times if timed else None,
+        )
+
+
+def _copy_table(source: str, fp: TextIO) -> None:
+    """Copy a possibly compressed table, ending it with a newline."""
+    last = b"\n"
+    with open_table(source) as src:
+        for chunk in line_chunks(src):
+            if chunk:
+                fp.write(chunk.decode())
+                last = chunk[-1:]
+    if last != b"\n":
+        fp.write("\n")
+
+
+def _inject_files(
+    source: str | os.PathLike[str] | None,
+    destination: str,
+    reviewer_ids: npt.NDArray[np.int64],
+    product_ids: npt.NDArray[np.int64],
+    counts: npt.NDArray[np.intp],
+    first_id: int,
+    seed: int | None,
+    prefix: str,
+) -> Injection:
+    """Write a dataset with injected reviewers into an empty directory; see :meth:`inject_files`."""
+    sums = np.zeros(len(product_ids))
+    reviews = np.zeros(len(product_ids), dtype=np.int64)
+    timed: bool | None = None
+    times = (np.inf, -np.inf)
+    last = b"\n"
+    with open_table(dataset_file(source, REVIEW_FILE)) as src, open(path.join(destination, REVIEW_FILE), "w") as fp:
+        for chunk in line_chunks(src):
+            values = parse_reviews(chunk)
+            products = lookup(product_ids, values.products, "product")
+            sums += np.bincount(products, values.scores, len(product_ids))
+            reviews += np.bincount(products, minlength=len(product_ids))
+            if len(values.times):
+                timed = not np.isnan(values.times[0])
+                if timed:
+                    times = (min(times[0], float(values.times.min())), max(times[1], float(values.times.max())))
+            if chunk:
+                fp.write(chunk.decode())
+                last = chunk[-1:]
+        if last != b"\n":
+            fp.write("\n")
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = sums / reviews
+        planted = _plant(np.random.default_rng(seed), counts, first_id, means, times if timed else None, prefix)
+        _write_reviews(
+            fp,
+            planted.reviewer_ids[planted.review_reviewers],
+            product_ids[planted.review_products],
+            planted.review_scores,
+            planted.review_times if timed else None,
+        )
+
+    with open(path.join(destination, REVIEWER_FILE), "w") as fp:
+        _copy_table(dataset_file(source, REVIEWER_FILE), fp)
+        _write_nodes(fp, planted.reviewer_ids, planted.reviewer_names)
+    with open(path.join(destination, PRODUCT_FILE), "w") as fp:
+        _copy_table(dataset_file(source, PRODUCT_FILE), fp)
+    return planted
+
+
+def inject_files(
+    source: str | os.PathLike[str] | None,
+    destination: str | os.PathLike[str],
+    rates: tuple[float, float, float] = ANOMALOUS_RATES,
+    seed: int | None = None,
+    prefix: str = "s",
+) -> Injection:
+    """Inject anomalous reviewers into a dataset stored in files.
+
+    The review table is streamed chunk by chunk to the destination, computing
+    mean scores of products on the way, and then the injected reviewers and
+    reviews are appended. Only the reviewer and product tables and one chunk
+    of the review table are kept in memory. See :meth:`inject` for details.
+
+    Args:
+      source: Directory of the dataset. If None, the bundled dataset is used.
+      destination: Directory where the new dataset is written.
+      rates: The numbers of type-1, type-2, and type-3 anomalous reviewers to
+        be injected relative to the number of reviewers in the dataset.
+      seed: Seed of the random number generator.
+      prefix: Prefix of the names of the injected reviewers.
+
+    The tables are written into a temporary directory next to the destination
+    and then moved into it, so that the destination isn't left half-written.
+
+    Returns:
+      The injected reviewers and reviews.
+
+    Raises:
+      PrefixConflictError: if names of the injected reviewers conflict with
+        existing ones, which is checked before anything is written.
+      DestinationError: if the destination is the source directory.
+    """
+    destination = path.abspath(destination)
+    if path.isdir(destination) and path.samefile(path.dirname(dataset_file(source, REVIEWER_FILE)), destination):
+        raise DestinationError(f"destination must differ from the source: {destination}")
+    with open_table(dataset_file(source, REVIEWER_FILE)) as fp:
+        reviewer_ids, reviewer_names = parse_nodes(fp.read())
+    with open_table(dataset_file(source, PRODUCT_FILE)) as fp:
+        product_ids, _ = parse_nodes(fp.read())
+    counts = _counts(rates, len(reviewer_ids))
+    first_id = int(reviewer_ids.max(initial=0)) + 1
+    _check_prefix(reviewer_names, counts, first_id, prefix)
+
+    os.makedirs(path.dirname(destination), exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=path.dirname(destination), prefix=_TMP_PREFIX)
+    try:
+        planted = _inject_files(source, tmp, reviewer_ids, product_ids, counts, first_id, seed, prefix)
+        os.makedirs(destination, exist_ok=True)
+        for name in (REVIEW_FILE, PRODUCT_FILE, REVIEWER_FILE):
+            os.replace(path.join(tmp, name), path.join(destination, name))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return planted
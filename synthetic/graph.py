@@ -0,0 +1,264 @@
+#
+#  graph.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Provide a review graph stored in arrays and baseline algorithms on top of it.
+
+:class:`ArrayGraph` keeps reviews in compact columns and gives reviewers and
+products as small records which refer to positions in those columns, so that
+algorithms can update scores of all nodes at once with NumPy.
+:class:`DeviationGraph` and :class:`MutualGraph` are baseline algorithms
+without any dependencies other than NumPy.
+"""
+
+from abc import ABC, abstractmethod
+from array import array
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from synthetic.scores import Scores
+
+
+class Reviewer:
+    """A reviewer in an :class:`ArrayGraph`."""
+
+    __slots__ = ("_graph", "_index", "name")
+
+    def __init__(self, graph: "ArrayGraph", index: int, name: str) -> None:
+        self._graph = graph
+        self._index = index
+        self.name = name
+
+    @property
+    def anomalous_score(self) -> float:
+        """Anomalous score of this reviewer."""
+        return self._graph._anomalous[self._index]
+
+    @anomalous_score.setter
+    def anomalous_score(self, v: float) -> None:
+        self._graph._anomalous[self._index] = v
+
+    def __repr__(self) -> str:
+        return f"Reviewer({self.name!r}, {self.anomalous_score})"
+
+
+class Product:
+    """A product in an :class:`ArrayGraph`."""
+
+    __slots__ = ("_graph", "_index", "name")
+
+    def __init__(self, graph: "ArrayGraph", index: int, name: str) -> None:
+        self._graph = graph
+        self._index = index
+        self.name = name
+
+    @property
+    def summary(self) -> float:
+        """Summary of the review scores of this product."""
+        return self._graph._summary[self._index]
+
+    @summary.setter
+    def summary(self, v: float) -> None:
+        self._graph._summary[self._index] = v
+
+    def __repr__(self) -> str:
+        return f"Product({self.name!r}, {self.summary})"
+
+
+class ArrayGraph(ABC):
+    """A bipartite review graph stored in arrays.
+
+    Reviews are appended to typed arrays, and :meth:`update` of subclasses
+    views them as NumPy arrays without copying. The views are dropped before
+    it returns, since the arrays can't grow while they are exported. Scores are expected to be
+    normalized in [0, 1] as :meth:`synthetic.load` does.
+    """
+
+    def __init__(self) -> None:
+        self._reviewers: list[Reviewer] = []
+        self._products: list[Product] = []
+        self._anomalous = array("d")
+        self._summary = array("d")
+        self._review_reviewers = array("q")
+        self._review_products = array("q")
+        self._review_scores = array("d")
+
+    @property
+    def reviewers(self) -> Sequence[Reviewer]:
+        """Reviewers in this graph."""
+        return self._reviewers
+
+    @property
+    def products(self) -> Sequence[Product]:
+        """Products in this graph."""
+        return self._products
+
+    def new_reviewer(self, name: str) -> Reviewer:
+        """Add a new reviewer to this graph.
+
+        Args:
+          name: Name of the new reviewer.
+
+        Returns:
+          The new created reviewer.
+        """
+        r = Reviewer(self, len(self._reviewers), name)
+        self._reviewers.append(r)
+        self._anomalous.append(0.0)
+        return r
+
+    def new_product(self, name: str) -> Product:
+        """Add a new product to this graph.
+
+        Args:
+          name: Name of the new product.
+
+        Returns:
+          The new created product.
+        """
+        p = Product(self, len(self._products), name)
+        self._products.append(p)
+        self._summary.append(0.0)
+        return p
+
+    def add_review(self, reviewer: Reviewer, product: Product, score: float, _date: Any = None) -> None:
+        """Add a new review from the given reviewer to the given product.
+
+        Args:
+          reviewer: Reviewer who posts the review.
+          product: Product which receives the review.
+          score: The review score in [0, 1].
+        """
+        self._review_reviewers.append(reviewer._index)
+        self._review_products.append(product._index)
+        self._review_scores.append(score)
+
+    def _columns(self) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+        """Views the reviewer, product, and score columns of reviews as arrays."""
+        return (
+            np.frombuffer(self._review_reviewers, dtype=np.int64),
+            np.frombuffer(self._review_products, dtype=np.int64),
+            np.frombuffer(self._review_scores, dtype=np.float64),
+        )
+
+    def _deviations(self, weights: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        """Sets summaries of products to weighted means of their scores and computes new anomalous scores.
+
+        Args:
+          weights: Weights of reviewers.
+
+        Returns:
+          Mean absolute deviations of the scores of each reviewer from the summaries.
+        """
+        reviewers, products, scores = self._columns()
+        w = weights[reviewers]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            summary = np.bincount(products, weights=w * scores, minlength=len(self._products)) / np.bincount(
+                products, weights=w, minlength=len(self._products)
+            )
+            summary = np.nan_to_num(summary)
+            deviations = np.bincount(
+                reviewers, weights=np.abs(scores - summary[products]), minlength=len(self._reviewers)
+            ) / np.bincount(reviewers, minlength=len(self._reviewers))
+        np.frombuffer(self._summary, dtype=np.float64)[:] = summary
+        return np.nan_to_num(deviations)
+
+    def _set_anomalous_scores(self, scores: npt.NDArray[np.float64]) -> float:
+        """Sets anomalous scores of reviewers.
+
+        Returns:
+          The maximum change of the scores.
+        """
+        current = np.frombuffer(self._anomalous, dtype=np.float64)
+        diff = float(np.abs(scores - current).max()) if len(current) else 0.0
+        current[:] = scores
+        return diff
+
+    def reviewer_index(self) -> list[str]:
+        """Returns names of reviewers in the order of :meth:`scores_array`."""
+        return [r.name for r in self._reviewers]
+
+    def scores_array(self) -> npt.NDArray[np.float64]:
+        """Returns a copy of anomalous scores of reviewers.
+
+        A view would keep the internal storage exported and make adding reviewers fail with :class:`BufferError`.
+        """
+        return np.array(self._anomalous, dtype=np.float64)
+
+    def export_scores(self) -> Scores:
+        """Exports anomalous scores of reviewers and summaries of products."""
+        return Scores(
+            reviewers=dict(zip((r.name for r in self._reviewers), self._anomalous.tolist(), strict=True)),
+            products=dict(zip((p.name for p in self._products), self._summary.tolist(), strict=True)),
+        )
+
+    def import_scores(self, scores: Scores) -> None:
+        """Sets anomalous scores of reviewers and summaries of products.
+
+        Args:
+          scores: Scores to be set. Reviewers and products not in it keep their current scores.
+        """
+        for r in self._reviewers:
+            if r.name in scores.reviewers:
+                r.anomalous_score = scores.reviewers[r.name]
+        for p in self._products:
+            if p.name in scores.products:
+                p.summary = scores.products[p.name]
+
+    @abstractmethod
+    def update(self) -> float:
+        """Updates scores of reviewers and products.
+
+        Returns:
+          The maximum change of anomalous scores.
+        """
+
+
+class DeviationGraph(ArrayGraph):
+    """Scores reviewers by mean absolute deviations of their scores from the mean scores of products."""
+
+    def update(self) -> float:
+        """Updates scores of reviewers and products.
+
+        Returns:
+          The maximum change of anomalous scores.
+        """
+        return self._set_anomalous_scores(self._deviations(np.ones(len(self._reviewers))))
+
+
+class MutualGraph(ArrayGraph):
+    """Scores reviewers and products mutually.
+
+    Each update sets the summary of each product to the mean of its scores
+    weighted by one minus the anomalous scores of the reviewers, and then sets
+    the anomalous score of each reviewer to the mean absolute deviation of the
+    reviewer's scores from the summaries, like mutually reinforcing analysis.
+    """
+
+    def update(self) -> float:
+        """Updates scores of reviewers and products.
+
+        Returns:
+          The maximum change of anomalous scores.
+        """
+        weights = np.maximum(1 - self.scores_array(), 1e-9)
+        return self._set_anomalous_scores(self._deviations(weights))
@@ -0,0 +1,295 @@
+#
+#  index.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Provide a random-access index over the review table of a dataset.
+
+The index consists of NumPy files in a directory. Reviewers are numbered in
+the order of their names, and products are numbered in the order of the
+product table. For each reviewer and each product, the index has a compressed
+sparse row (CSR) list of its reviews, i.e., byte offsets of the review lines
+in the review table and the positions of the other end nodes. The index files
+are memory-mapped so that loading a small subgraph touches only the pages it
+needs.
+"""
+
+import json
+import mmap
+import os
+from collections.abc import Iterable, Iterator
+from os import path
+from typing import Any, Final, NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+from synthetic.loader import (
+    GT,
+    OPENERS,
+    PRODUCT_FILE,
+    REVIEW_FILE,
+    REVIEWER_FILE,
+    Dataset,
+    ReviewTable,
+    add_dataset,
+    concatenate_reviews,
+    dataset_file,
+    line_chunks,
+    lookup,
+    open_table,
+    parse_nodes,
+    parse_reviews,
+)
+
+_META_FILE: Final = "meta.json"
+_ARRAYS: Final = (
+    "reviewer_ids",
+    "reviewer_names",
+    "product_ids",
+    "product_names",
+    "reviewer_indptr",
+    "reviewer_offsets",
+    "reviewer_products",
+    "product_indptr",
+    "product_offsets",
+    "product_reviewers",
+)
+"""Names of the arrays an index consists of, each of which is stored in ``<name>.npy``."""
+
+_WHITESPACE: Final = np.zeros(256, dtype=bool)
+_WHITESPACE[list(b" \t\n\r\v\f")] = True
+
+
+class Index(NamedTuple):
+    """Memory-mapped arrays of an index."""
+
+    review_file: str
+    """Path to the indexed review table."""
+    reviewer_ids: npt.NDArray[np.int64]
+    reviewer_names: npt.NDArray[np.str_]
+    """Reviewer names in ascending order."""
+    product_ids: npt.NDArray[np.int64]
+    product_names: npt.NDArray[np.str_]
+    reviewer_indptr: npt.NDArray[np.int64]
+    """Reviews of the i-th reviewer are in the range ``reviewer_indptr[i]:reviewer_indptr[i + 1]``."""
+    reviewer_offsets: npt.NDArray[np.int64]
+    """Byte offsets of the review lines grouped by reviewers."""
+    reviewer_products: npt.NDArray[np.intp]
+    """Positions of the products receiving the reviews grouped by reviewers."""
+    product_indptr: npt.NDArray[np.int64]
+    """Reviews of the i-th product are in the range ``product_indptr[i]:product_indptr[i + 1]``."""
+    product_offsets: npt.NDArray[np.int64]
+    """Byte offsets of the review lines grouped by products."""
+    product_reviewers: npt.NDArray[np.intp]
+    """Positions of the reviewers posting the reviews grouped by products."""
+
+
+def _review_lines(filename: str) -> Iterator[tuple[ReviewTable, npt.NDArray[np.int64]]]:
+    """Parse a plain review table with the byte offsets of its lines.
+
+    Args:
+      filename: Path to the review table.
+
+    Yields:
+      Pairs of the columns of reviews and an array of the offsets of the
+      corresponding lines, chunk by chunk.
+    """
+    base = 0
+    with open(filename, "rb") as fp:
+        for chunk in line_chunks(fp):
+            buf = np.frombuffer(chunk, dtype=np.uint8)
+            ends = np.append(np.flatnonzero(buf == ord("\n")), len(buf))
+            starts = np.concatenate(([0], ends[:-1] + 1))
+            # Blank lines don't have reviews.
+            filled = np.concatenate(([0], np.cumsum(~_WHITESPACE[buf])))
+            lines = starts[filled[ends] > filled[starts]]
+            yield parse_reviews(chunk), lines + base
+            base += len(chunk)
+
+
+def _csr(rows: npt.NDArray[np.intp], size: int, *columns: npt.NDArray[Any]) -> tuple[npt.NDArray[Any], ...]:
+    """Group columns of reviews by rows.
+
+    Args:
+      rows: Row positions of reviews.
+      size: The number of rows.
+      columns: Columns to be grouped.
+
+    Returns:
+      The index pointer array followed by the grouped columns.
+    """
+    order = np.argsort(rows, kind="stable")
+    indptr = np.searchsorted(rows[order], np.arange(size + 1)).astype(np.int64)
+    return (indptr, *(c[order] for c in columns))
+
+
+def build_index(index: str | os.PathLike[str], dataset: str | os.PathLike[str] | None = None) -> None:
+    """Build an index over the review table of a dataset.
+
+    The review table must not be compressed because reviews are read by
+    seeking their lines.
+
+    Args:
+      index: Directory where the index is stored.
+      dataset: Directory of the dataset. If None, the bundled dataset is used.
+    """
+    review_file = path.abspath(dataset_file(dataset, REVIEW_FILE))
+    if path.splitext(review_file)[1] in OPENERS:
+        raise ValueError(f"cannot index a compressed review table: {review_file}")
+
+    with open_table(dataset_file(dataset, REVIEWER_FILE)) as fp:
+        reviewer_ids, reviewer_names = parse_nodes(fp.read())
+    with open_table(dataset_file(dataset, PRODUCT_FILE)) as fp:
+        product_ids, product_names = parse_nodes(fp.read())
+    tables, chunks = zip(*_review_lines(review_file), strict=True)
+    reviews, offsets = concatenate_reviews(tables), np.concatenate(chunks)
+
+    # Renumber reviewers in the order of their names.
+    order = np.argsort(reviewer_names, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    reviewers = rank[lookup(reviewer_ids, reviews.reviewers, "reviewer")]
+    products = lookup(product_ids, reviews.products, "product")
+
+    arrays = dict(
+        zip(
+            _ARRAYS,
+            (
+                reviewer_ids[order],
+                reviewer_names[order],
+                product_ids,
+                product_names,
+                *_csr(reviewers, len(order), offsets, products),
+                *_csr(products, len(product_ids), offsets, reviewers),
+            ),
+            strict=True,
+        )
+    )
+
+    os.makedirs(index, exist_ok=True)
+    for name, a in arrays.items():
+        np.save(path.join(index, name + ".npy"), a)
+    with open(path.join(index, _META_FILE), "w") as fp:
+        json.dump({"review_file": review_file, "size": path.getsize(review_file)}, fp)
+
+
+def open_index(index: str | os.PathLike[str]) -> Index:
+    """Open an index built by :meth:`build_index`.
+
+    Args:
+      index: Directory of the index.
+
+    Returns:
+      The memory-mapped index.
+    """
+    with open(path.join(index, _META_FILE)) as fp:
+        meta = json.load(fp)
+    if not path.exists(meta["review_file"]) or path.getsize(meta["review_file"]) != meta["size"]:
+        raise ValueError(f"the review table has been changed since the index was built: {meta['review_file']}")
+    return Index(meta["review_file"], *(np.load(path.join(index, name + ".npy"), mmap_mode="r") for name in _ARRAYS))
+
+
+def _gather(
+    indptr: npt.NDArray[np.int64], rows: npt.NDArray[np.intp]
+) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+    """Compute positions of the elements in the given rows of a CSR list.
+
+    Args:
+      indptr: The index pointer array.
+      rows: Row positions.
+
+    Returns:
+      A pair of the element positions and the rows they belong to.
+    """
+    starts = np.asarray(indptr[rows], dtype=np.intp)
+    lengths = np.asarray(indptr[rows + 1], dtype=np.intp) - starts
+    heads = np.cumsum(lengths) - lengths
+    return np.repeat(starts - heads, lengths) + np.arange(lengths.sum()), np.repeat(rows, lengths)
+
+
+def _read_lines(filename: str, offsets: npt.NDArray[np.int64]) -> bytes:
+    """Read lines starting at the given offsets."""
+    if not len(offsets):
+        return b""
+    with open(filename, "rb") as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        lines = []
+        for start in offsets.tolist():
+            end = mm.find(b"\n", start)
+            lines.append(mm[start : end if end >= 0 else len(mm)])
+        return b"\n".join(lines)
+
+
+def load_subgraph(g: GT, reviewers: Iterable[str], index: str | os.PathLike[str] | Index, hops: int = 1) -> GT:
+    """Load the neighbourhood of reviewers using an index.
+
+    The neighbourhood consists of the nodes reachable from the given reviewers
+    within *hops* edges and the reviews between them, i.e., the reviewers
+    themselves when *hops* is 0, their products when *hops* is 1, the other
+    reviewers of those products when *hops* is 2, and so on. Only the index
+    entries and the review lines of the neighbourhood are read.
+
+    Args:
+      g: an instance of bipartite graph.
+      reviewers: names of the reviewers.
+      index: directory of an index built by :meth:`build_index`, or an index opened by :meth:`open_index`.
+      hops: the maximum number of edges from the given reviewers.
+
+    Returns:
+      The graph instance *g*.
+    """
+    if hops < 0:
+        raise ValueError(f"hops must not be negative: {hops}")
+    idx = index if isinstance(index, Index) else open_index(index)
+
+    names = np.asarray(list(reviewers), dtype=np.str_)
+    rs = np.searchsorted(idx.reviewer_names, names)
+    found = rs < len(idx.reviewer_names)
+    found[found] = idx.reviewer_names[rs[found]] == names[found]
+    if not np.all(found):
+        raise ValueError(f"unknown reviewer: {names[~found][0]}")
+    rs = np.unique(rs)
+
+    ps = np.empty(0, dtype=np.intp)
+    for hop in range(hops):
+        if hop % 2 == 0:
+            ps = np.union1d(ps, idx.reviewer_products[_gather(idx.reviewer_indptr, rs)[0]])
+        else:
+            rs = np.union1d(rs, idx.product_reviewers[_gather(idx.product_indptr, ps)[0]])
+
+    entries, owners = _gather(idx.reviewer_indptr, rs)
+    products = np.asarray(idx.reviewer_products[entries])
+    offsets = np.asarray(idx.reviewer_offsets[entries])
+    inside = np.isin(products, ps)
+    order = np.argsort(offsets[inside])
+    owners, products, offsets = owners[inside][order], products[inside][order], offsets[inside][order]
+    reviews = parse_reviews(_read_lines(idx.review_file, offsets))
+
+    return add_dataset(
+        g,
+        Dataset(
+            reviewer_ids=np.asarray(idx.reviewer_ids[rs]),
+            reviewer_names=np.asarray(idx.reviewer_names[rs]),
+            product_ids=np.asarray(idx.product_ids[ps]),
+            product_names=np.asarray(idx.product_names[ps]),
+            review_reviewers=np.searchsorted(rs, owners),
+            review_products=np.searchsorted(ps, products),
+            review_scores=reviews.scores,
+            review_times=reviews.times,
+        ),
+    )
@@ -20,12 +20,47 @@
 #
 """Provide a loading method of synthetic dataset."""
 
+import bz2
+import gzip
+import hashlib
+import io
+import lzma
+import os
+import warnings
+import zlib
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from os import path
-from typing import Any, Final, Protocol, TypeVar
+from typing import Any, Final, Generic, Literal, NamedTuple, Protocol, TypeVar
 
-_REVIEWER_FILE: Final = "reviewer.dat"
-_PRODUCT_FILE: Final = "product.dat"
-_REVIEW_FILE: Final = "review.dat"
+import numpy as np
+import numpy.typing as npt
+
+from synthetic.anomaly import anomaly_types
+
+REVIEWER_FILE: Final = "reviewer.dat"
+"""Name of the reviewer table of a dataset."""
+PRODUCT_FILE: Final = "product.dat"
+"""Name of the product table of a dataset."""
+REVIEW_FILE: Final = "review.dat"
+"""Name of the review table of a dataset."""
+
+OPENERS: Final[dict[str, Callable[[str], io.BufferedIOBase]]] = {
+    ".gz": lambda name: gzip.open(name, "rb"),
+    ".bz2": lambda name: bz2.open(name, "rb"),
+    ".xz": lambda name: lzma.open(name, "rb"),
+}
+"""Openers of compressed tables keyed by their suffixes."""
+
+_CHUNK_SIZE: Final = 64 * 1024 * 1024
+"""Size of chunks in bytes that a review table is split into."""
+
+_BINARY_SUFFIX: Final = ".npy"
+"""Suffix of the files storing columns of a dataset in the binary form."""
+
+_GREEDY_BATCH: Final = 4096
+"""The maximum number of reviewers assigned to shards at once by the greedy partitioner."""
 
 
 def _fullpath(filename: str) -> str:
@@ -40,6 +75,497 @@ def _fullpath(filename: str) -> str:
     return path.join(path.dirname(__file__), filename)
 
 
+def dataset_file(dataset: str | os.PathLike[str] | None, filename: str) -> str:
+    """Compute the path of a file in a dataset directory.
+
+    If the file doesn't exist but a compressed one, i.e., the file with
+    ``.gz``, ``.bz2``, or ``.xz`` suffix, exists, the path of the compressed
+    one is returned.
+
+    Args:
+      dataset: Directory of the dataset. If None, the bundled dataset is used.
+      filename: Filename.
+
+    Returns:
+      The path of the given file in the dataset directory.
+    """
+    if dataset is None:
+        return _fullpath(filename)
+    res = path.join(dataset, filename)
+    for suffix in OPENERS:
+        if not path.exists(res) and path.exists(res + suffix):
+            return res + suffix
+    return res
+
+
+def open_table(filename: str) -> io.BufferedIOBase:
+    """Open a table in binary mode, decompressing it if necessary.
+
+    Args:
+      filename: Path to the table.
+
+    Returns:
+      A readable binary file object.
+    """
+    _, ext = path.splitext(filename)
+    if ext in OPENERS:
+        return OPENERS[ext](filename)
+    return open(filename, "rb")
+
+
+class Dataset(NamedTuple):
+    """Columns of a review dataset.
+
+    Reviews refer to reviewers and products by their positions in
+    :attr:`reviewer_ids` and :attr:`product_ids`, respectively.
+    """
+
+    reviewer_ids: npt.NDArray[np.int64]
+    reviewer_names: npt.NDArray[np.str_]
+    product_ids: npt.NDArray[np.int64]
+    product_names: npt.NDArray[np.str_]
+    review_reviewers: npt.NDArray[np.intp]
+    review_products: npt.NDArray[np.intp]
+    review_scores: npt.NDArray[np.float64]
+    """Raw review scores, which are in [0, 5)."""
+    review_times: npt.NDArray[np.float64]
+    """POSIX timestamps of reviews, which are NaN if the dataset doesn't have them."""
+
+
+class ReviewTable(NamedTuple):
+    """Columns of reviews parsed from a review table."""
+
+    reviewers: npt.NDArray[np.int64]
+    """IDs of the reviewers."""
+    products: npt.NDArray[np.int64]
+    """IDs of the products."""
+    scores: npt.NDArray[np.float64]
+    """Raw review scores."""
+    times: npt.NDArray[np.float64]
+    """POSIX timestamps of the reviews, which are NaN if the table doesn't have them."""
+
+
+def concatenate_reviews(tables: Iterable[ReviewTable]) -> ReviewTable:
+    """Concatenate review columns parsed from chunks of a review table.
+
+    Args:
+      tables: Columns of the chunks.
+
+    Returns:
+      The columns of all the chunks.
+    """
+    columns = list(zip(*tables, strict=True))
+    if not columns:
+        return parse_reviews(b"")
+    return ReviewTable(*(np.concatenate(c) for c in columns))
+
+
+def _parse_ids(tokens: Sequence[bytes], name: str) -> npt.NDArray[np.int64]:
+    """Parse tokens as 64-bit integer IDs exactly.
+
+    Args:
+      tokens: The tokens.
+      name: Name of the IDs used in an error message.
+
+    Returns:
+      The ID array.
+    """
+    try:
+        return np.array(tokens, dtype=np.bytes_).astype(np.int64)
+    except (ValueError, OverflowError) as e:
+        raise ValueError(f"{name}s must be 64-bit integers: {e}") from e
+
+
+def parse_nodes(buf: bytes) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.str_]]:
+    """Parse a reviewer or product table consisting of ``id name`` lines.
+
+    Args:
+      buf: Whole contents of the table.
+
+    Returns:
+      A tuple of an ID array and a name array.
+    """
+    tokens = buf.split()
+    if len(tokens) % 2:
+        raise ValueError("each line must consist of an ID and a name")
+    ids = _parse_ids(tokens[0::2], "ID")
+    names = np.array([t.decode() for t in tokens[1::2]], dtype=np.str_)
+    return ids, names
+
+
+def _parse_tokens(tokens: Sequence[bytes], columns: int) -> ReviewTable:
+    """Parse tokens of a review table column by column, which is exact but slower than parsing it at once."""
+    if len(tokens) % columns:
+        raise ValueError("each line must consist of a reviewer ID, a product ID, a score, and an optional timestamp")
+    try:
+        scores = np.array(tokens[2::columns], dtype=np.bytes_).astype(np.float64)
+        times = (
+            np.array(tokens[3::columns], dtype=np.bytes_).astype(np.float64)
+            if columns == 4
+            else np.full(len(scores), np.nan)
+        )
+    except ValueError as e:
+        raise ValueError(f"scores and timestamps must be numbers: {e}") from e
+    return ReviewTable(
+        reviewers=_parse_ids(tokens[0::columns], "reviewer ID"),
+        products=_parse_ids(tokens[1::columns], "product ID"),
+        scores=scores,
+        times=times,
+    )
+
+
+def parse_reviews(buf: bytes) -> ReviewTable:
+    """Parse a review table consisting of ``reviewer-id product-id score [timestamp]`` lines.
+
+    The optional timestamp is a POSIX time of the review, and all lines must
+    have it if the first line has it. IDs must be 64-bit integers, and are
+    parsed exactly even if they are too large for a float.
+
+    Args:
+      buf: Whole contents of the table.
+
+    Returns:
+      The columns of the reviews.
+    """
+    end = buf.find(b"\n")
+    columns = len(buf[: end if end >= 0 else len(buf)].split()) or 3
+    if columns not in (3, 4):
+        raise ValueError("each line must consist of a reviewer ID, a product ID, a score, and an optional timestamp")
+
+    with warnings.catch_warnings():
+        # Older NumPy reports unparsable data with a DeprecationWarning instead of an error.
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            values = np.fromstring(buf, dtype=np.float64, sep=" ")
+        except (ValueError, DeprecationWarning):
+            # Parse the table again to report which column is malformed.
+            return _parse_tokens(buf.split(), columns)
+    if len(values) % columns:
+        raise ValueError("each line must consist of a reviewer ID, a product ID, a score, and an optional timestamp")
+    values = values.reshape(-1, columns)
+    ids = values[:, :2]
+    # Integers below 2**53 are exact as floats, and the others are parsed again as integers.
+    if not np.all((np.abs(ids) < 2**53) & (ids == np.trunc(ids))):
+        return _parse_tokens(buf.split(), columns)
+    return ReviewTable(
+        reviewers=ids[:, 0].astype(np.int64),
+        products=ids[:, 1].astype(np.int64),
+        scores=values[:, 2].copy(),
+        times=values[:, 3].copy() if columns == 4 else np.full(len(values), np.nan),
+    )
+
+
+def lookup(ids: npt.NDArray[np.int64], keys: npt.NDArray[np.int64], kind: str) -> npt.NDArray[np.intp]:
+    """Find the positions of the given keys in an ID array.
+
+    Args:
+      ids: ID array.
+      keys: IDs to be looked up.
+      kind: Kind of the IDs used in an error message.
+
+    Returns:
+      An array of positions in *ids*.
+    """
+    order = np.argsort(ids)
+    sorted_ids = ids[order]
+    pos = np.searchsorted(sorted_ids, keys)
+    found = pos < len(ids)
+    found[found] = sorted_ids[pos[found]] == keys[found]
+    if not np.all(found):
+        raise ValueError(f"unknown {kind} ID: {keys[~found][0]}")
+    return order[pos]
+
+
+def _parse_range(filename: str, start: int, end: int) -> ReviewTable:
+    """Parse a byte range of a plain review table.
+
+    Args:
+      filename: Path to the review table.
+      start: Offset of the first byte, which must be the beginning of a line.
+      end: Offset of the end of the range, which must be the end of a line.
+
+    Returns:
+      The columns of the reviews.
+    """
+    with open(filename, "rb") as fp:
+        fp.seek(start)
+        return parse_reviews(fp.read(end - start))
+
+
+def _chunk_ranges(filename: str, chunks: int) -> list[tuple[int, int]]:
+    """Split a file into byte ranges aligned on newlines.
+
+    Args:
+      filename: Path to the file.
+      chunks: The maximum number of ranges.
+
+    Returns:
+      A list of pairs of the start and end offsets.
+    """
+    size = path.getsize(filename)
+    bounds = [0]
+    with open(filename, "rb") as fp:
+        for i in range(1, chunks):
+            fp.seek(max(size * i // chunks - 1, bounds[-1]))
+            fp.readline()
+            if bounds[-1] < fp.tell() < size:
+                bounds.append(fp.tell())
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def line_chunks(fp: io.BufferedIOBase) -> Iterator[bytes]:
+    """Read a stream in chunks consisting of whole lines.
+
+    Args:
+      fp: Readable binary stream.
+
+    Yields:
+      Chunks of about :data:`_CHUNK_SIZE` bytes, each of which ends with a newline
+      except the last one.
+    """
+    rest = b""
+    while chunk := fp.read(_CHUNK_SIZE):
+        buf = rest + chunk
+        cut = buf.rfind(b"\n") + 1
+        yield buf[:cut]
+        rest = buf[cut:]
+    yield rest
+
+
+def _bounded_map(
+    executor: Executor, fn: Callable[[bytes], ReviewTable], chunks: Iterator[bytes], limit: int
+) -> Iterator[ReviewTable]:
+    """Map a function over chunks in an executor keeping at most *limit* chunks in flight.
+
+    Unlike :meth:`Executor.map`, chunks are read from the iterator only when
+    a slot is free, so that a decompressed stream isn't buffered in memory.
+
+    Yields:
+      The results in the order of the chunks.
+    """
+    pending: deque[Future[ReviewTable]] = deque()
+    for chunk in chunks:
+        if len(pending) >= limit:
+            yield pending.popleft().result()
+        pending.append(executor.submit(fn, chunk))
+    while pending:
+        yield pending.popleft().result()
+
+
+def _read_reviews(filename: str, workers: int) -> ReviewTable:
+    """Read a review table.
+
+    A plain table larger than one chunk is split into byte ranges aligned on
+    newlines, and *workers* processes parse them. A compressed table is
+    decompressed as a stream, and the worker processes parse decompressed
+    chunks, at most two per process at a time.
+
+    Args:
+      filename: Path to the review table.
+      workers: The number of processes parsing the table.
+
+    Returns:
+      The columns of the reviews.
+    """
+    _, ext = path.splitext(filename)
+    if ext in OPENERS:
+        with open_table(filename) as fp:
+            if workers <= 1:
+                return concatenate_reviews(map(parse_reviews, line_chunks(fp)))
+            with ProcessPoolExecutor(workers) as executor:
+                return concatenate_reviews(_bounded_map(executor, parse_reviews, line_chunks(fp), 2 * workers))
+
+    ranges = _chunk_ranges(filename, min(workers, path.getsize(filename) // _CHUNK_SIZE + 1))
+    if len(ranges) == 1:
+        return _parse_range(filename, *ranges[0])
+    with ProcessPoolExecutor(workers) as executor:
+        starts, ends = zip(*ranges, strict=True)
+        return concatenate_reviews(executor.map(_parse_range, [filename] * len(ranges), starts, ends))
+
+
+def _binary_files(dataset: str | os.PathLike[str]) -> list[str]:
+    """Compute the paths of the files storing columns of a dataset in the binary form."""
+    return [path.join(dataset, name + _BINARY_SUFFIX) for name in Dataset._fields]
+
+
+def is_binary(dataset: str | os.PathLike[str]) -> bool:
+    """Check whether a dataset directory stores the binary form written by :meth:`write_binary`.
+
+    Args:
+      dataset: Directory of the dataset.
+
+    Returns:
+      True if the directory has all the columns in the binary form.
+    """
+    return all(path.exists(f) for f in _binary_files(dataset))
+
+
+def write_binary(dataset: Dataset, directory: str | os.PathLike[str]) -> None:
+    """Write a dataset in the binary form.
+
+    Each column is stored in a ``.npy`` file named after the field of
+    :class:`Dataset`, and :meth:`read_dataset` memory-maps them instead of
+    parsing text tables.
+
+    Args:
+      dataset: The dataset.
+      directory: Directory where the columns are written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for filename, column in zip(_binary_files(directory), dataset, strict=True):
+        np.save(filename, column, allow_pickle=False)
+
+
+def _read_binary(dataset: str | os.PathLike[str]) -> Dataset:
+    """Memory-map columns of a dataset stored in the binary form."""
+    return Dataset(*(np.load(f, mmap_mode="r", allow_pickle=False) for f in _binary_files(dataset)))
+
+
+def read_dataset(dataset: str | os.PathLike[str] | None = None, workers: int = 1) -> Dataset:
+    """Read a dataset into arrays.
+
+    The dataset directory must have ``reviewer.dat``, ``product.dat``, and
+    ``review.dat`` in the same format as the bundled dataset. Lines of
+    ``review.dat`` may have a POSIX timestamp of the review as the fourth
+    column. Each of the files can be compressed with gzip, bzip2, or xz and
+    have ``.gz``, ``.bz2``, or ``.xz`` suffix, respectively.
+
+    If the directory stores the binary form written by :meth:`write_binary`
+    instead, the columns are memory-mapped read-only.
+
+    Args:
+      dataset: Directory of the dataset. If None, the bundled dataset is used.
+      workers: The number of processes parsing the review table (default: 1).
+
+    Returns:
+      The columns of the dataset.
+    """
+    if dataset is not None and is_binary(dataset):
+        return _read_binary(dataset)
+    with open_table(dataset_file(dataset, REVIEWER_FILE)) as fp:
+        reviewer_ids, reviewer_names = parse_nodes(fp.read())
+    with open_table(dataset_file(dataset, PRODUCT_FILE)) as fp:
+        product_ids, product_names = parse_nodes(fp.read())
+    reviews = _read_reviews(dataset_file(dataset, REVIEW_FILE), workers)
+
+    return Dataset(
+        reviewer_ids=reviewer_ids,
+        reviewer_names=reviewer_names,
+        product_ids=product_ids,
+        product_names=product_names,
+        review_reviewers=lookup(reviewer_ids, reviews.reviewers, "reviewer"),
+        review_products=lookup(product_ids, reviews.products, "product"),
+        review_scores=reviews.scores,
+        review_times=reviews.times,
+    )
+
+
+def read_reviewer_names(dataset: str | os.PathLike[str] | None = None) -> npt.NDArray[np.str_]:
+    """Read only names of reviewers in a dataset without reading reviews.
+
+    Args:
+      dataset: Directory of the dataset in the text or the binary form. If None, the bundled dataset is used.
+
+    Returns:
+      The names of the reviewers in the order of the reviewer table.
+    """
+    if dataset is not None and is_binary(dataset):
+        res: npt.NDArray[np.str_] = np.load(
+            path.join(dataset, "reviewer_names" + _BINARY_SUFFIX), mmap_mode="r", allow_pickle=False
+        )
+        return res
+    with open_table(dataset_file(dataset, REVIEWER_FILE)) as fp:
+        return parse_nodes(fp.read())[1]
+
+
+def iter_dataset(dataset: str | os.PathLike[str] | None = None) -> Iterator[Dataset]:
+    """Read a dataset chunk by chunk.
+
+    Only one chunk of the review table is kept in memory at a time, which is
+    decompressed as a stream if the table is compressed.
+
+    Args:
+      dataset: Directory of the dataset. If None, the bundled dataset is used.
+
+    Yields:
+      Datasets each of which has all reviewers and products and the reviews in
+      a chunk of about :data:`_CHUNK_SIZE` bytes of the review table.
+    """
+    if dataset is not None and is_binary(dataset):
+        res = _read_binary(dataset)
+        # Each review takes 8 bytes in each of the 4 review columns.
+        step = _CHUNK_SIZE // 32
+        for i in range(0, max(len(res.review_scores), 1), step):
+            yield res._replace(
+                review_reviewers=res.review_reviewers[i : i + step],
+                review_products=res.review_products[i : i + step],
+                review_scores=res.review_scores[i : i + step],
+                review_times=res.review_times[i : i + step],
+            )
+        return
+
+    with open_table(dataset_file(dataset, REVIEWER_FILE)) as fp:
+        reviewer_ids, reviewer_names = parse_nodes(fp.read())
+    with open_table(dataset_file(dataset, PRODUCT_FILE)) as fp:
+        product_ids, product_names = parse_nodes(fp.read())
+
+    with open_table(dataset_file(dataset, REVIEW_FILE)) as fp:
+        for chunk in line_chunks(fp):
+            reviews = parse_reviews(chunk)
+            yield Dataset(
+                reviewer_ids=reviewer_ids,
+                reviewer_names=reviewer_names,
+                product_ids=product_ids,
+                product_names=product_names,
+                review_reviewers=lookup(reviewer_ids, reviews.reviewers, "reviewer"),
+                review_products=lookup(product_ids, reviews.products, "product"),
+                review_scores=reviews.scores,
+                review_times=reviews.times,
+            )
+
+
+def count_reviews(dataset: str | os.PathLike[str] | None = None) -> int:
+    """Count reviews of a dataset without parsing them.
+
+    Args:
+      dataset: Directory of the dataset. If None, the bundled dataset is used.
+
+    Returns:
+      The number of lines of the review table, or the length of the
+      review columns if the dataset is stored in the binary form.
+    """
+    if dataset is not None and is_binary(dataset):
+        return len(np.load(_binary_files(dataset)[Dataset._fields.index("review_scores")], mmap_mode="r"))
+    res = 0
+    with open_table(dataset_file(dataset, REVIEW_FILE)) as fp:
+        for chunk in line_chunks(fp):
+            res += chunk.count(b"\n") + int(bool(chunk) and not chunk.endswith(b"\n"))
+    return res
+
+
+def dataset_digest(dataset: str | os.PathLike[str] | None = None) -> str:
+    """Compute a digest of the contents of a dataset.
+
+    Args:
+      dataset: Directory of the dataset. If None, the bundled dataset is used.
+
+    Returns:
+      The SHA-256 hex digest of the reviewer, product, and review tables, or
+      of the columns if the dataset is stored in the binary form.
+    """
+    h = hashlib.sha256()
+    filenames = (
+        _binary_files(dataset)
+        if dataset is not None and is_binary(dataset)
+        else [dataset_file(dataset, f) for f in (REVIEWER_FILE, PRODUCT_FILE, REVIEW_FILE)]
+    )
+    for filename in filenames:
+        with open(filename, "rb") as fp:
+            h.update(hashlib.file_digest(fp, "sha256").digest())
+    return h.hexdigest()
+
+
 RT = TypeVar("RT")
 PT = TypeVar("PT")
 
@@ -82,34 +608,426 @@ class Graph(Protocol[RT, PT]):
 GT = TypeVar("GT", bound=Graph)
 
 
-def load(g: GT) -> GT:
+def sample_dataset(dataset: Dataset, fraction: float, seed: int | None = None) -> Dataset:
+    """Sample reviewers of a dataset keeping the ratio of each type of reviewers.
+
+    Reviewers are sampled from each of normal, type-1, type-2, and type-3
+    anomalous reviewers independently, and the result is the subgraph induced
+    by the sampled reviewers, i.e., it consists of their reviews and the
+    products which receive those reviews. At least one reviewer is sampled
+    from each type which the dataset has, so that small fractions don't drop
+    any type.
+
+    Args:
+      dataset: The dataset to be sampled.
+      fraction: Fraction of reviewers to be sampled, which must be in (0, 1].
+      seed: Seed of the random number generator.
+
+    Returns:
+      The sampled dataset.
+    """
+    if not 0 < fraction <= 1:
+        raise ValueError(f"fraction must be in (0, 1]: {fraction}")
+
+    rng = np.random.default_rng(seed)
+    types = anomaly_types(dataset.reviewer_names)
+    reviewers = np.sort(
+        np.concatenate(
+            [
+                rng.choice(idx, size=min(max(round(len(idx) * fraction), 1), len(idx)), replace=False)
+                for idx in (np.flatnonzero(types == t) for t in range(4))
+            ]
+        )
+    )
+
+    return _induced_dataset(dataset, reviewers)
+
+
+def _induced_dataset(
+    dataset: Dataset, reviewers: npt.NDArray[np.intp], reviews: npt.NDArray[np.intp] | None = None
+) -> Dataset:
+    """Compute the subgraph induced by a set of reviewers.
+
+    Args:
+      dataset: The original dataset.
+      reviewers: Sorted positions of reviewers in the dataset.
+      reviews: Sorted positions of the reviews of the reviewers if they are known.
+
+    Returns:
+      The dataset consisting of the given reviewers, their reviews, and the
+      products which receive those reviews.
+    """
+    if reviews is None:
+        reviews = np.flatnonzero(np.isin(dataset.review_reviewers, reviewers))
+    products = np.unique(dataset.review_products[reviews])
+
+    reviewer_pos = np.full(len(dataset.reviewer_ids), -1, dtype=np.intp)
+    reviewer_pos[reviewers] = np.arange(len(reviewers))
+    product_pos = np.full(len(dataset.product_ids), -1, dtype=np.intp)
+    product_pos[products] = np.arange(len(products))
+
+    return Dataset(
+        reviewer_ids=dataset.reviewer_ids[reviewers],
+        reviewer_names=dataset.reviewer_names[reviewers],
+        product_ids=dataset.product_ids[products],
+        product_names=dataset.product_names[products],
+        review_reviewers=reviewer_pos[dataset.review_reviewers[reviews]],
+        review_products=product_pos[dataset.review_products[reviews]],
+        review_scores=dataset.review_scores[reviews],
+        review_times=dataset.review_times[reviews],
+    )
+
+
+def _file_order(dataset: Dataset) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+    """Keep reviewers, products, and reviews in the order of the files."""
+    return (
+        np.arange(len(dataset.reviewer_ids), dtype=np.intp),
+        np.arange(len(dataset.product_ids), dtype=np.intp),
+        np.arange(len(dataset.review_scores), dtype=np.intp),
+    )
+
+
+def _sort_reviews(
+    dataset: Dataset, reviewers: npt.NDArray[np.intp], products: npt.NDArray[np.intp], by_product: bool = False
+) -> npt.NDArray[np.intp]:
+    """Sort reviews by the new positions of their reviewers and then products, or the other way around."""
+    reviewer_pos = np.empty(len(reviewers), dtype=np.intp)
+    reviewer_pos[reviewers] = np.arange(len(reviewers))
+    product_pos = np.empty(len(products), dtype=np.intp)
+    product_pos[products] = np.arange(len(products))
+    keys = (product_pos[dataset.review_products], reviewer_pos[dataset.review_reviewers])
+    return np.lexsort(keys[::-1] if by_product else keys).astype(np.intp)
+
+
+def _degree_order(dataset: Dataset) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+    """Order reviewers and products by their degrees in descending order."""
+    reviewers = np.argsort(
+        -np.bincount(dataset.review_reviewers, minlength=len(dataset.reviewer_ids)), kind="stable"
+    ).astype(np.intp)
+    products = np.argsort(
+        -np.bincount(dataset.review_products, minlength=len(dataset.product_ids)), kind="stable"
+    ).astype(np.intp)
+    return reviewers, products, _sort_reviews(dataset, reviewers, products)
+
+
+def _rcm_order(dataset: Dataset) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+    """Order reviewers and products with the reverse Cuthill-McKee algorithm.
+
+    Reviewers and products are nodes of one bipartite graph. Each connected
+    component is traversed in breadth-first order from a node of the minimum
+    degree, visiting unvisited neighbours of each node in increasing order of
+    their degrees, and the whole order is reversed at last so that nodes
+    sharing reviews get close positions.
+    """
+    n_reviewers = len(dataset.reviewer_ids)
+    n = n_reviewers + len(dataset.product_ids)
+    src = np.concatenate([dataset.review_reviewers, n_reviewers + dataset.review_products])
+    dst = np.concatenate([n_reviewers + dataset.review_products, dataset.review_reviewers])
+    neighbors = dst[np.argsort(src, kind="stable")]
+    degree = np.bincount(src, minlength=n)
+    offsets = np.concatenate([[0], np.cumsum(degree)])
+
+    visited = degree == 0
+    levels = [np.flatnonzero(visited)]
+    starts = np.argsort(degree, kind="stable")
+    i = 0
+    while True:
+        while i < n and visited[starts[i]]:
+            i += 1
+        if i == n:
+            break
+        frontier = starts[i : i + 1]
+        visited[frontier] = True
+        while len(frontier):
+            levels.append(frontier)
+            # Gather neighbours of the frontier with the positions of their parents in it.
+            counts = degree[frontier]
+            edges = np.repeat(offsets[frontier] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            children = neighbors[edges]
+            parents = np.repeat(np.arange(len(frontier)), counts)
+            unvisited = ~visited[children]
+            children, parents = children[unvisited], parents[unvisited]
+
+            # Each child is appended by the first parent in the frontier which reaches it.
+            first = np.lexsort((parents, children))
+            children, parents = children[first], parents[first]
+            head = np.ones(len(children), dtype=np.bool_)
+            head[1:] = children[1:] != children[:-1]
+            children, parents = children[head], parents[head]
+
+            frontier = children[np.lexsort((degree[children], parents))]
+            visited[frontier] = True
+
+    order = np.concatenate(levels)[::-1]
+    reviewers = order[order < n_reviewers].astype(np.intp)
+    products = (order[order >= n_reviewers] - n_reviewers).astype(np.intp)
+    return reviewers, products, _sort_reviews(dataset, reviewers, products)
+
+
+def _product_order(dataset: Dataset) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+    """Group reviews by products and order reviewers by their first reviews in that order."""
+    products = np.arange(len(dataset.product_ids), dtype=np.intp)
+    reviews = np.argsort(dataset.review_products, kind="stable")
+    reviewed, first = np.unique(dataset.review_reviewers[reviews], return_index=True)
+    reviewers = np.concatenate(
+        [reviewed[np.argsort(first)], np.setdiff1d(np.arange(len(dataset.reviewer_ids)), reviewed)]
+    ).astype(np.intp)
+    return reviewers, products, _sort_reviews(dataset, reviewers, products, by_product=True)
+
+
+_ORDERS: Final = {"file": _file_order, "degree": _degree_order, "rcm": _rcm_order, "product": _product_order}
+"""Supported orders of nodes."""
+
+ORDERS: Final = tuple(_ORDERS)
+"""Names of supported orders of nodes, which are passed to :meth:`reorder_dataset` and :meth:`load`."""
+
+Order = Literal["file", "degree", "rcm", "product"]
+
+
+def reorder_dataset(dataset: Dataset, order: Order) -> Dataset:
+    """Reorder reviewers, products, and reviews of a dataset for memory locality.
+
+    Graphs create nodes and add reviews in the order of the dataset, so the
+    order decides which nodes array-backed algorithms access close together
+    in their update loops.
+
+    * ``file`` keeps the order of the files.
+    * ``degree`` orders reviewers and products by their degrees in descending
+      order, and reviews by their reviewers and then products.
+    * ``rcm`` orders reviewers and products with the reverse Cuthill-McKee
+      algorithm, which places nodes sharing reviews close together, and
+      reviews by their reviewers and then products.
+    * ``product`` groups reviews by their products, and orders reviewers by
+      their first reviews in that order.
+
+    Args:
+      dataset: The dataset.
+      order: Name of the order.
+
+    Returns:
+      The reordered dataset, which has the same reviewers, products, and reviews.
+    """
+    if order not in _ORDERS:
+        raise ValueError(f"unknown order: {order}")
+    if order == "file":
+        return dataset
+
+    reviewers, products, reviews = _ORDERS[order](dataset)
+    reviewer_pos = np.empty(len(reviewers), dtype=np.intp)
+    reviewer_pos[reviewers] = np.arange(len(reviewers))
+    product_pos = np.empty(len(products), dtype=np.intp)
+    product_pos[products] = np.arange(len(products))
+    return Dataset(
+        reviewer_ids=dataset.reviewer_ids[reviewers],
+        reviewer_names=dataset.reviewer_names[reviewers],
+        product_ids=dataset.product_ids[products],
+        product_names=dataset.product_names[products],
+        review_reviewers=reviewer_pos[dataset.review_reviewers[reviews]],
+        review_products=product_pos[dataset.review_products[reviews]],
+        review_scores=dataset.review_scores[reviews],
+        review_times=dataset.review_times[reviews],
+    )
+
+
+def add_dataset(g: GT, dataset: Dataset) -> GT:
+    """Add reviewers, products, and reviews in a dataset to a graph.
+
+    Args:
+      g: an instance of bipartite graph.
+      dataset: the dataset to be added.
+
+    Returns:
+      The graph instance *g*.
+    """
+    reviewers = [g.new_reviewer(name=name) for name in dataset.reviewer_names.tolist()]
+    products = [g.new_product(name=name) for name in dataset.product_names.tolist()]
+    for r, p, score in zip(
+        dataset.review_reviewers.tolist(), dataset.review_products.tolist(), (dataset.review_scores / 5).tolist()
+    ):
+        g.add_review(reviewers[r], products[p], score)
+
+    return g
+
+
+def load(
+    g: GT,
+    path: str | os.PathLike[str] | Dataset | None = None,
+    workers: int = 1,
+    fraction: float | None = None,
+    seed: int | None = None,
+    order: Order = "file",
+) -> GT:
     """Load synthetic dataset.
 
+    If *fraction* is given, only the subgraph induced by the given fraction of
+    reviewers is loaded. See :meth:`sample_dataset` for more details.
+
+    Reviewers and products are created, and reviews are added, in the given
+    *order*. See :meth:`reorder_dataset` for the supported orders.
+
     Args:
       g: an instance of bipartite graph.
+      path: directory of an external dataset in the same format as the bundled
+        one, or a dataset already read by :meth:`read_dataset`, which lets
+        several graphs be loaded without parsing the files again. If None,
+        the bundled synthetic dataset is loaded.
+      workers: the number of processes parsing the review table of the dataset.
+      fraction: if given, the fraction of reviewers to be sampled.
+      seed: seed used to sample reviewers.
+      order: name of the order of reviewers, products, and reviews.
 
     Returns:
       The graph instance *g*.
     """
-    reviewers = {}  # Reviewers dict.
-    products = {}  # Products dict.
+    if order not in _ORDERS:
+        raise ValueError(f"unknown order: {order}")
+    dataset = path if isinstance(path, Dataset) else read_dataset(path, workers)
+    if fraction is not None:
+        dataset = sample_dataset(dataset, fraction, seed)
+    return add_dataset(g, reorder_dataset(dataset, order))
 
-    # Load reviewers
-    with open(_fullpath(_REVIEWER_FILE)) as fp:
-        for line in fp:
-            rid, name = line.strip().split(" ")
-            reviewers[rid] = g.new_reviewer(name=name)
 
-    # Load products
-    with open(_fullpath(_PRODUCT_FILE)) as fp:
-        for line in fp:
-            pid, name = line.strip().split(" ")
-            products[pid] = g.new_product(name=name)
+class Shard(NamedTuple, Generic[GT]):
+    """A graph holding a part of reviewers."""
 
-    # Load review
-    with open(_fullpath(_REVIEW_FILE)) as fp:
-        for line in fp:
-            rid, pid, score = line.strip().split(" ")
-            g.add_review(reviewers[rid], products[pid], float(score) / 5)
+    graph: GT
+    """The graph consisting of the reviewers assigned to this shard, their reviews and the reviewed products."""
+    ghost_products: list[str]
+    """Names of the products in this shard which are also in the other shards."""
+    cut_reviews: int
+    """The number of reviews in this shard which are posted to the ghost products."""
 
-    return g
+
+def _hash_partition(dataset: Dataset, k: int) -> npt.NDArray[np.intp]:
+    """Assign reviewers to shards by hash values of their names.
+
+    Args:
+      dataset: The dataset.
+      k: The number of shards.
+
+    Returns:
+      An array of shard indices for the reviewers.
+    """
+    return np.array([zlib.crc32(name.encode()) % k for name in dataset.reviewer_names.tolist()], dtype=np.intp)
+
+
+def _greedy_partition(dataset: Dataset, k: int) -> npt.NDArray[np.intp]:
+    """Assign reviewers to shards so that reviewers sharing products tend to be in the same shard.
+
+    Each reviewer is assigned to the shard which already has the most products
+    the reviewer reviews, weighted by the remaining capacity of the shard,
+    i.e., linear deterministic greedy partitioning. Reviewers are assigned in
+    batches of at most :data:`_GREEDY_BATCH` against the shards of the earlier
+    batches, so that their neighbours are counted with NumPy over the reviews
+    sorted by reviewers. Shards which have each product are kept in a bitmask
+    per product instead of a dense (shards x products) matrix, and ties are
+    broken in the order of the sizes of the shards in a round-robin fashion so
+    that reviewers without any neighbours are spread over the shards.
+
+    Args:
+      dataset: The dataset.
+      k: The number of shards.
+
+    Returns:
+      An array of shard indices for the reviewers.
+    """
+    n = len(dataset.reviewer_ids)
+    order = np.argsort(dataset.review_reviewers, kind="stable")
+    owners = dataset.review_reviewers[order]
+    neighbors = dataset.review_products[order]
+    indptr = np.searchsorted(owners, np.arange(n + 1))
+
+    # Bit s of masks[p] is set if shard s has product p.
+    masks = np.zeros((len(dataset.product_ids), (k + 7) // 8), dtype=np.uint8)
+    capacity = n / k + 1
+    sizes = np.zeros(k)
+    res = np.empty(n, dtype=np.intp)
+    # Small batches keep the shards balanced within each batch.
+    batch = max(1, min(_GREEDY_BATCH, n // (8 * k)))
+    for start in range(0, n, batch):
+        end = min(start + batch, n)
+        products = neighbors[indptr[start] : indptr[end]]
+        rows = owners[indptr[start] : indptr[end]] - start
+        reviews, shards = np.nonzero(np.unpackbits(masks[products], axis=1, count=k, bitorder="little"))
+        counts = np.bincount(rows[reviews] * k + shards, minlength=(end - start) * k).reshape(end - start, k)
+        gains = counts * (1 - sizes / capacity)
+
+        preference = np.argsort(sizes, kind="stable")
+        best = (gains == gains.max(axis=1, keepdims=True))[:, preference]
+        nth = np.arange(end - start) % best.sum(axis=1)
+        assigned = preference[np.argmax(np.cumsum(best, axis=1) > nth[:, None], axis=1)]
+        res[start:end] = assigned
+
+        sizes += np.bincount(assigned, minlength=k)
+        owned = assigned[rows]
+        np.bitwise_or.at(masks, (products, owned // 8), np.left_shift(1, owned % 8).astype(np.uint8))
+    return res
+
+
+_PARTITIONERS: Final = {"hash": _hash_partition, "greedy": _greedy_partition}
+"""Supported partitioners."""
+
+
+def load_partitioned(
+    factory: Callable[[], GT],
+    k: int,
+    path: str | os.PathLike[str] | None = None,
+    workers: int = 1,
+    partitioner: Literal["hash", "greedy"] = "hash",
+) -> list[Shard[GT]]:
+    """Load a dataset into graphs each of which has a part of reviewers.
+
+    Reviewers are partitioned into *k* shards, and each shard gets a new graph
+    created by *factory* with the reviewers assigned to it, their reviews, and
+    the products receiving those reviews. A product reviewed by reviewers in
+    several shards is created in each of them and reported as a ghost product.
+
+    Partitioner ``hash`` assigns reviewers by hash values of their names, and
+    ``greedy`` assigns reviewers sharing many products to the same shard to
+    reduce ghost products.
+
+    The dataset is read into arrays and never loaded into a single graph.
+
+    Args:
+      factory: a function creating an empty graph.
+      k: the number of shards.
+      path: directory of an external dataset. If None, the bundled synthetic dataset is loaded.
+      workers: the number of processes parsing the review table of the dataset.
+      partitioner: name of the partitioner, ``hash`` or ``greedy``.
+
+    Returns:
+      A list of *k* shards.
+    """
+    if k < 1:
+        raise ValueError(f"k must be positive: {k}")
+    if partitioner not in _PARTITIONERS:
+        raise ValueError(f"unknown partitioner: {partitioner}")
+
+    dataset = read_dataset(path, workers)
+    assignments = _PARTITIONERS[partitioner](dataset, k)
+
+    # Count the number of shards each product appears in.
+    n = max(len(dataset.product_ids), 1)
+    pairs = np.unique(assignments[dataset.review_reviewers] * n + dataset.review_products)
+    ghost = np.bincount(pairs % n, minlength=len(dataset.product_ids)) > 1
+
+    # Group reviewers and reviews by their shards at once; stable sorts keep them in the order of the files.
+    review_shards = assignments[dataset.review_reviewers]
+    reviewer_order = np.argsort(assignments, kind="stable")
+    review_order = np.argsort(review_shards, kind="stable")
+    reviewer_bounds = np.concatenate(([0], np.cumsum(np.bincount(assignments, minlength=k))))
+    review_bounds = np.concatenate(([0], np.cumsum(np.bincount(review_shards, minlength=k))))
+
+    res = []
+    for shard in range(k):
+        reviewers = reviewer_order[reviewer_bounds[shard] : reviewer_bounds[shard + 1]]
+        reviews = review_order[review_bounds[shard] : review_bounds[shard + 1]]
+        products = np.unique(dataset.review_products[reviews])
+        res.append(
+            Shard(
+                graph=add_dataset(factory(), _induced_dataset(dataset, reviewers, reviews)),
+                ghost_products=dataset.product_names[products[ghost[products]]].tolist(),
+                cut_reviews=int(np.count_nonzero(ghost[dataset.review_products[reviews]])),
+            )
+        )
+    return res
@@ -0,0 +1,46 @@
+#
+#  scores.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Provide scores of reviewers and products exported from review graphs.
+
+This module doesn't depend on other modules of this package, so that both
+graphs in :mod:`synthetic.graph` and the evaluation tools in
+:mod:`synthetic.eval` can use it.
+"""
+
+import json
+from typing import IO, NamedTuple
+
+
+class Scores(NamedTuple):
+    """Scores of reviewers and products keyed by their names."""
+
+    reviewers: dict[str, float]
+    products: dict[str, float]
+
+    def dump(self, fp: IO[str]) -> None:
+        """Writes the scores to a file in JSON."""
+        json.dump(self._asdict(), fp)
+
+    @classmethod
+    def load(cls, fp: IO[str]) -> "Scores":
+        """Reads scores written by :meth:`dump`."""
+        obj = json.load(fp)
+        return cls(reviewers=obj.get("reviewers", {}), products=obj.get("products", {}))
@@ -0,0 +1,228 @@
+#
+#  store.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Provide a content-addressed store of generated and converted datasets.
+
+Each entry is a directory named after a key computed from the parameters of
+the generator or the digest of the source dataset, and it stores the dataset
+in the binary form written by :meth:`synthetic.loader.write_binary`, so that
+:meth:`synthetic.loader.read_dataset` memory-maps it instead of parsing text
+tables.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Any, Final, Optional
+
+from synthetic.generator import ANOMALOUS_RATES, generate_dataset
+from synthetic.loader import Dataset, dataset_digest, is_binary, read_dataset, write_binary
+
+LOGGER: Final = logging.getLogger(__name__)
+
+_VERSION: Final = 1
+"""Version of the binary form, which is a part of keys so that old entries aren't used."""
+
+_TMP_PREFIX: Final = ".tmp-"
+"""Prefix of directories being written or removed, which are never returned as entries."""
+
+
+class DatasetStore:
+    """A size-capped store of datasets in the binary form keyed by their contents.
+
+    Entries are written into temporary directories which are renamed to the
+    entry directories, so that concurrent workers never see partial entries.
+    If several workers miss the same entry at once, each of them builds it
+    and the first rename wins. The least recently used entries are removed
+    when the total size exceeds the limit.
+    """
+
+    def __init__(self, root: str | os.PathLike[str], max_bytes: int) -> None:
+        """Creates a store.
+
+        Args:
+          root: Store directory, which is created if it doesn't exist.
+          max_bytes: The maximum total size of stored datasets in bytes.
+        """
+        self._root = os.fspath(root)
+        self._max_bytes = max_bytes
+        os.makedirs(self._root, exist_ok=True)
+
+    @staticmethod
+    def _key(obj: dict[str, Any]) -> str:
+        return hashlib.sha256(json.dumps({**obj, "version": _VERSION}, sort_keys=True).encode()).hexdigest()
+
+    @staticmethod
+    def generator_key(
+        reviewers: int,
+        products: Optional[int] = None,
+        rates: tuple[float, float, float] = ANOMALOUS_RATES,
+        seed: int = 0,
+        times: Optional[tuple[float, float]] = None,
+    ) -> str:
+        """Computes the key of a generated dataset.
+
+        Args:
+          reviewers: the number of reviewers.
+          products: the number of products, or None for the default.
+          rates: fractions of type-1, type-2, and type-3 anomalous reviewers.
+          seed: seed of the generator.
+          times: the range of timestamps of reviews, or None if they don't have timestamps.
+
+        Returns:
+          The key.
+        """
+        params: dict[str, Any] = {"reviewers": reviewers, "products": products, "rates": list(rates), "seed": seed}
+        if times is not None:
+            params["times"] = list(times)
+        return DatasetStore._key({"generator": params})
+
+    @staticmethod
+    def source_key(source: str | os.PathLike[str] | None) -> str:
+        """Computes the key of a converted dataset.
+
+        Args:
+          source: directory of the source dataset. If None, the bundled dataset is used.
+
+        Returns:
+          The key, which depends only on the contents of the source.
+        """
+        return DatasetStore._key({"source": dataset_digest(source)})
+
+    def path(self, key: str) -> str:
+        """Computes the directory of an entry.
+
+        Args:
+          key: The key.
+
+        Returns:
+          The directory, which may not exist.
+        """
+        return os.path.join(self._root, key)
+
+    def get(self, key: str) -> Optional[str]:
+        """Looks up an entry.
+
+        Args:
+          key: The key.
+
+        Returns:
+          The directory of the entry, which can be passed to
+          :meth:`synthetic.loader.read_dataset`, or None if it isn't stored.
+        """
+        res = self.path(key)
+        if not is_binary(res):
+            return None
+        try:
+            os.utime(res)
+        except FileNotFoundError:
+            return None
+        return res
+
+    def put(self, key: str, dataset: Dataset) -> str:
+        """Stores a dataset.
+
+        Args:
+          key: The key.
+          dataset: The dataset.
+
+        Returns:
+          The directory of the entry.
+        """
+        res = self.path(key)
+        tmp = tempfile.mkdtemp(dir=self._root, prefix=_TMP_PREFIX)
+        try:
+            write_binary(dataset, tmp)
+            os.rename(tmp, res)
+        except OSError:
+            # Another worker has stored the same entry.
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not is_binary(res):
+                raise
+        self._evict(key)
+        return res
+
+    def generated(
+        self,
+        reviewers: int,
+        products: Optional[int] = None,
+        rates: tuple[float, float, float] = ANOMALOUS_RATES,
+        seed: int = 0,
+        times: Optional[tuple[float, float]] = None,
+    ) -> str:
+        """Returns a generated dataset, generating it if it isn't stored.
+
+        See :meth:`synthetic.generator.generate_dataset` for the arguments.
+
+        Returns:
+          The directory of the entry.
+        """
+        key = self.generator_key(reviewers, products, rates, seed, times)
+        if (res := self.get(key)) is not None:
+            return res
+        LOGGER.info("Generating a dataset of %d reviewers with seed %d.", reviewers, seed)
+        return self.put(key, generate_dataset(reviewers, products, rates, seed, times))
+
+    def converted(self, source: str | os.PathLike[str] | None, workers: int = 1) -> str:
+        """Returns a dataset converted into the binary form, converting it if it isn't stored.
+
+        Args:
+          source: directory of the source dataset. If None, the bundled dataset is used.
+          workers: the number of processes parsing the review table of the source.
+
+        Returns:
+          The directory of the entry.
+        """
+        key = self.source_key(source)
+        if (res := self.get(key)) is not None:
+            return res
+        LOGGER.info("Converting a dataset %s.", source)
+        return self.put(key, read_dataset(source, workers))
+
+    def _evict(self, keep: str) -> None:
+        """Removes the least recently used entries except *keep* until the total size fits the limit."""
+        entries = []
+        for entry in os.scandir(self._root):
+            if entry.name.startswith(_TMP_PREFIX) or entry.name == keep or not entry.is_dir():
+                continue
+            try:
+                size = sum(f.stat().st_size for f in os.scandir(entry.path))
+                entries.append((entry.stat().st_mtime, size, entry.path))
+            except FileNotFoundError:
+                continue
+
+        total = sum(size for _, size, _ in entries) + sum(
+            f.stat().st_size for f in os.scandir(self.path(keep)) if f.is_file()
+        )
+        for _, size, path in sorted(entries):
+            if total <= self._max_bytes:
+                break
+            # Rename the entry first so that readers never see a partially removed one.
+            tmp = tempfile.mkdtemp(dir=self._root, prefix=_TMP_PREFIX)
+            try:
+                os.rename(path, tmp)
+            except OSError:
+                os.rmdir(tmp)
+                continue
+            shutil.rmtree(tmp, ignore_errors=True)
+            total -= size
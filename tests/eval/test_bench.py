@@ -0,0 +1,111 @@
+#
+#  test_bench.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+import io
+import json
+import time
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from synthetic.eval import bench, cli
+from synthetic.eval.bench import SizeResult, fit, scale_bench
+from synthetic.store import DatasetStore
+from tests.graph import Graph
+
+
+class SlowGraph(Graph):
+    def update(self) -> float:
+        time.sleep(60)
+        return 0.0
+
+
+def test_scale_bench() -> None:
+    results = list(scale_bench(Graph, [100, 1000], 2, seed=0))
+
+    assert [r.reviewers for r in results] == [100, 1000]
+    assert all(r.completed for r in results)
+    assert all(len(r.updates) == 2 for r in results)
+    assert results[0].reviews < results[1].reviews
+    assert all(r.peak_memory is not None and r.peak_memory > 0 for r in results)
+
+
+def test_memory_growth(mocker: MockerFixture) -> None:
+    baseline = bench._peak_memory()
+    assert baseline is not None
+    growth = bench._memory_growth(baseline)
+    assert growth is not None and growth >= 0
+
+    # resource isn't available on Windows.
+    mocker.patch.dict("sys.modules", {"resource": None})
+    assert bench._peak_memory() is None
+    assert bench._memory_growth(baseline) is None
+
+
+def test_scale_bench_with_order() -> None:
+    results = list(scale_bench(Graph, [100], 1, seed=0, order="rcm"))
+    assert results[0].completed
+    assert results[0].order == "rcm"
+
+
+def test_scale_bench_with_store(tmp_path: Path) -> None:
+    store = DatasetStore(tmp_path, 1 << 30)
+    for _ in range(2):
+        results = list(scale_bench(Graph, [100], 1, seed=0, store=store))
+        assert results[0].completed
+    assert store.get(store.generator_key(100, seed=0)) is not None
+
+    with pytest.raises(ValueError):
+        list(scale_bench(Graph, [100], 1, store=store))
+
+
+def test_scale_bench_budget() -> None:
+    start = time.perf_counter()
+    results = list(scale_bench(SlowGraph, [100, 1000], 2, budget=1, seed=0))
+
+    assert time.perf_counter() - start < 30
+    assert len(results) == 1
+    assert not results[0].completed
+    assert results[0].load is not None
+    assert results[0].updates == []
+
+
+def test_fit() -> None:
+    results = [SizeResult(n, n, n, 1.0, 2 * n**1.5, None, [3 * n], None, True) for n in (10, 100, 1000)]
+
+    res = fit(results)
+    assert set(res) == {"load", "update"}
+    assert res["load"].exponent == pytest.approx(1.5)
+    assert res["load"].coefficient == pytest.approx(2)
+    assert res["update"].exponent == pytest.approx(1)
+    assert fit(results[:1]) == {}
+
+
+def test_scale_bench_command(mocker: MockerFixture) -> None:
+    mocker.patch.object(cli, "INSTALLED_GRAPHS", {"mock": lambda **_: Graph()})
+
+    output = io.StringIO()
+    assert cli.scale_bench.callback is not None
+    cli.scale_bench.callback(method="mock", sizes="1000,100", loop=1, budget=None, param=[], seed=0, output=output)
+
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [r["reviewers"] for r in lines[:-1]] == [100, 1000]
+    assert set(lines[-1]["fit"]) >= {"load", "construct"}
@@ -0,0 +1,134 @@
+#
+#  test_cache.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+import os
+from importlib.metadata import version
+from pathlib import Path
+
+import numpy as np
+from pytest_mock import MockerFixture
+
+import synthetic
+from synthetic.eval import cache, cli, evaluator
+from synthetic.eval.cache import GraphCache, package_version
+from synthetic.graph import DeviationGraph
+from synthetic.loader import dataset_digest
+from tests.graph import Graph
+
+
+def test_key() -> None:
+    digest = dataset_digest()
+    assert GraphCache.key("m", [("a", 1.0), ("b", 2.0)], digest) == GraphCache.key(
+        "m", [("b", 2.0), ("a", 1.0)], digest
+    )
+    assert GraphCache.key("m", [("a", 1.0)], digest) != GraphCache.key("m", [("a", 2.0)], digest)
+    assert GraphCache.key("m", [], digest) != GraphCache.key("m", [], digest, 0.5, 1)
+    assert GraphCache.key("m", [], digest, version="1.0") != GraphCache.key("m", [], digest, version="1.1")
+
+
+def test_key_format(mocker: MockerFixture) -> None:
+    digest = dataset_digest()
+    key = GraphCache.key("m", [], digest)
+    mocker.patch.object(cache, "FORMAT_VERSION", cache.FORMAT_VERSION + 1)
+    assert GraphCache.key("m", [], digest) != key
+
+
+def test_package_version() -> None:
+    assert package_version(DeviationGraph) == version("rgmining-synthetic-dataset")
+    assert package_version(np.zeros) == np.__version__
+    assert package_version(print) is None
+
+
+def test_get_and_put(tmp_path: Path) -> None:
+    cache = GraphCache(tmp_path, 2**30)
+    assert cache.get("key") is None
+
+    g = synthetic.load(Graph())
+    assert cache.put("key", g)
+    restored = cache.get("key")
+    assert isinstance(restored, Graph)
+    assert restored.reviewers == g.reviewers
+    assert restored.reviews == g.reviews
+    assert [p.name for p in tmp_path.iterdir()] == ["key.pickle"]
+
+
+def test_put_unpicklable(tmp_path: Path) -> None:
+    g = Graph()
+    g.callback = lambda: None  # type: ignore[attr-defined]
+    cache = GraphCache(tmp_path, 2**30)
+    assert not cache.put("key", g)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_evict(tmp_path: Path) -> None:
+    g = synthetic.load(Graph())
+    cache = GraphCache(tmp_path, 2**30)
+    cache.put("a", g)
+    size = (tmp_path / "a.pickle").stat().st_size
+
+    cache = GraphCache(tmp_path, size * 2)
+    cache.put("b", g)
+    os.utime(tmp_path / "a.pickle", (0, 0))
+    os.utime(tmp_path / "b.pickle", (1, 1))
+    assert cache.get("a") is not None
+    cache.put("c", g)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.pickle", "c.pickle"]
+
+
+def test_load_graph_with_cache(tmp_path: Path, mocker: MockerFixture) -> None:
+    constructor = mocker.MagicMock(side_effect=lambda **_: Graph())
+    mocker.patch.object(cli, "INSTALLED_GRAPHS", {"mock": constructor})
+    cache = GraphCache(tmp_path, 2**30)
+
+    g1 = cli.load_graph("mock", [("x", "1")], cache=cache)
+    g2 = cli.load_graph("mock", [("x", "1")], cache=cache)
+    assert constructor.call_count == 1
+    assert g1 is not g2
+    assert g1.reviewers == g2.reviewers
+
+    cli.load_graph("mock", [("x", "2")], cache=cache)
+    assert constructor.call_count == 2
+
+
+def test_build_graph_with_cache(tmp_path: Path, mocker: MockerFixture) -> None:
+    constructor = mocker.MagicMock(side_effect=lambda **_: Graph())
+    mocker.patch.object(cli, "INSTALLED_GRAPHS", {"mock": constructor})
+    cache = GraphCache(tmp_path, 2**30)
+
+    g1 = cli.build_graph(cli.new_evaluator(cache=cache), "mock", [("x", "1")])
+    # A cached graph is restored without reading the dataset.
+    read_dataset = mocker.spy(evaluator, "read_dataset")
+    g2 = cli.build_graph(cli.new_evaluator(cache=cache), "mock", [("x", "1")])
+    assert constructor.call_count == 1
+    assert read_dataset.call_count == 0
+    assert g1 is not g2
+    assert g1.reviewers == g2.reviewers
+
+    cli.build_graph(cli.new_evaluator(cache=cache), "mock", [("x", "2")])
+    assert constructor.call_count == 2
+
+
+def test_evaluator_digest_once(tmp_path: Path, mocker: MockerFixture) -> None:
+    digest = mocker.spy(evaluator, "dataset_digest")
+    e = evaluator.Evaluator(cache=GraphCache(tmp_path, 2**30), graphs={"mock": lambda **_: Graph()})
+    for x in (1.0, 2.0, 1.0):
+        e.graph("mock", {"x": x})
+    assert digest.call_count == 1
@@ -18,14 +18,22 @@
 #  You should have received a copy of the GNU General Public License
 #  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
 #
+import io
+import json
+from pathlib import Path
 from random import random
 from typing import NoReturn
 
+import click
 import pytest
 from pytest_mock import MockerFixture
 
 from synthetic.eval import cli
 from synthetic.eval.cli import load_graph
+from synthetic.eval.graph import Scores
+from synthetic.loader import read_dataset
+from tests.eval.test_graph import WarmStartMock
+from tests.graph import Graph
 
 
 def test_load_graph(mocker: MockerFixture) -> None:
@@ -35,13 +43,25 @@ def test_load_graph(mocker: MockerFixture) -> None:
     graph = mocker.MagicMock()
     graph_constructor = mocker.MagicMock(return_value=graph)
     mocker.patch.object(cli, "INSTALLED_GRAPHS", {method: graph_constructor})
-    load = mocker.patch("synthetic.load", side_effect=lambda v: v)
+    load = mocker.patch("synthetic.load", side_effect=lambda v, **_: v)
 
     g = load_graph(method, [(key, str(value)) for key, value in params.items()])
     assert g == graph
 
     graph_constructor.assert_called_with(**params)
-    load.assert_called_with(graph)
+    load.assert_called_with(graph, path=None, workers=1, fraction=None, seed=None)
+
+
+def test_load_graph_with_dataset(mocker: MockerFixture) -> None:
+    method = "test-method"
+    dataset = "test-dataset"
+
+    graph = mocker.MagicMock()
+    mocker.patch.object(cli, "INSTALLED_GRAPHS", {method: mocker.MagicMock(return_value=graph)})
+    load = mocker.patch("synthetic.load", side_effect=lambda v, **_: v)
+
+    assert load_graph(method, [], dataset, 2, 0.5, 3) == graph
+    load.assert_called_with(graph, path=dataset, workers=2, fraction=0.5, seed=3)
 
 
 def test_load_graph_error(mocker: MockerFixture) -> None:
@@ -57,3 +77,185 @@ def test_load_graph_error(mocker: MockerFixture) -> None:
     with pytest.raises(SystemExit) as e:
         load_graph(method, [])
     assert msg in str(e.value)
+
+
+def test_build_graph(mocker: MockerFixture) -> None:
+    method = "test-method"
+    params = {"positive": random(), "negative": -random(), "zero": 0.0}
+
+    graph = mocker.MagicMock()
+    graph_constructor = mocker.MagicMock(return_value=graph)
+    mocker.patch.object(cli, "INSTALLED_GRAPHS", {method: graph_constructor})
+    load = mocker.patch("synthetic.load", side_effect=lambda v, **_: v)
+
+    evaluator = cli.new_evaluator(sample=0.5, seed=3)
+    assert cli.build_graph(evaluator, method, [(key, str(value)) for key, value in params.items()]) == graph
+
+    graph_constructor.assert_called_with(**params)
+    load.assert_called_with(graph, path=evaluator.dataset)
+    assert 0 < len(evaluator.dataset.reviewer_names) < 1000
+
+
+def test_build_graph_error(mocker: MockerFixture) -> None:
+    method = "test-method"
+    msg = "test error message"
+
+    def raise_error() -> NoReturn:
+        raise TypeError(msg)
+
+    graph_constructor = mocker.MagicMock(side_effect=raise_error)
+    mocker.patch.object(cli, "INSTALLED_GRAPHS", {method: graph_constructor})
+
+    with pytest.raises(SystemExit) as e:
+        cli.build_graph(cli.new_evaluator(), method, [])
+    assert msg in str(e.value)
+
+
+def test_warm_start(mocker: MockerFixture) -> None:
+    mocker.patch.object(cli, "INSTALLED_GRAPHS", {"mock": lambda **_: WarmStartMock()})
+    import_scores = mocker.spy(WarmStartMock, "import_scores")
+
+    saved = io.StringIO()
+    assert cli.ranking.callback is not None
+    cli.ranking.callback(method="mock", loop=1, param=[], output=io.StringIO(), save_scores=saved)
+    saved.seek(0)
+    scores = Scores.load(saved)
+    assert len(scores.reviewers) == 1000
+    assert sum(scores.reviewers.values()) == 57
+
+    saved.seek(0)
+    output = io.StringIO()
+    cli.ranking.callback(method="mock", loop=1, param=[], output=output, warm_start=saved)
+    import_scores.assert_called_once()
+    assert import_scores.call_args.args[1] == scores
+    assert json.loads(output.getvalue())["error"] == 0
+
+
+def test_ranking_pipeline(mocker: MockerFixture) -> None:
+    mocker.patch.object(cli, "INSTALLED_GRAPHS", {"mock": lambda **_: Graph()})
+    assert cli.ranking.callback is not None
+
+    outputs = []
+    for pipeline in (False, True):
+        output = io.StringIO()
+        cli.ranking.callback(method="mock", loop=5, param=[], output=output, pipeline=pipeline)
+        outputs.append([json.loads(line) for line in output.getvalue().splitlines()])
+
+    assert outputs[0] == outputs[1]
+    assert [r["loop"] for r in outputs[1]] == list(range(5))
+    assert all(r["error"] == 0 for r in outputs[1])
+
+
+def test_inject(tmp_path: Path) -> None:
+    output = io.StringIO()
+    assert cli.inject.callback is not None
+    cli.inject.callback(
+        destination=str(tmp_path), type1=0.01, type2=0.01, type3=0.0, prefix="injected", seed=0, output=output
+    )
+
+    res = json.loads(output.getvalue())
+    assert (res["type1"], res["type2"], res["type3"]) == (10, 10, 0)
+    assert len(read_dataset(tmp_path).reviewer_ids) == 1000 + 20
+
+
+def test_inject_error(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "reviewer.dat").write_text("1 s2(anomaly)\n")
+    (source / "product.dat").write_text("2 p1\n")
+    (source / "review.dat").write_text("1 2 1.0\n")
+    assert cli.inject.callback is not None
+    with pytest.raises(click.BadParameter) as e:
+        cli.inject.callback(
+            destination=str(tmp_path / "a"),
+            type1=1.0,
+            type2=0.0,
+            type3=0.0,
+            prefix="s",
+            seed=0,
+            output=io.StringIO(),
+            dataset=str(source),
+        )
+    assert e.value.param_hint == "--prefix"
+
+    # A review of an unknown product is a dataset error, not a prefix error.
+    (source / "review.dat").write_text("1 3 1.0\n")
+    with pytest.raises(click.BadParameter) as e:
+        cli.inject.callback(
+            destination=str(tmp_path / "b"),
+            type1=1.0,
+            type2=0.0,
+            type3=0.0,
+            prefix="t",
+            seed=0,
+            output=io.StringIO(),
+            dataset=str(source),
+        )
+    assert e.value.param_hint == "--dataset"
+
+    # Writing into the source directory is an error of the destination.
+    with pytest.raises(click.BadParameter) as e:
+        cli.inject.callback(
+            destination=str(source),
+            type1=1.0,
+            type2=0.0,
+            type3=0.0,
+            prefix="t",
+            seed=0,
+            output=io.StringIO(),
+            dataset=str(source),
+        )
+    assert e.value.param_hint == "DESTINATION"
+
+
+@pytest.mark.parametrize("kind", ["threshold", "ranking", "dcg"])
+def test_evaluate_scores(mocker: MockerFixture, tmp_path: Path, kind: str) -> None:
+    mocker.patch.object(cli, "INSTALLED_GRAPHS", {"mock": lambda **_: Graph()})
+    command = getattr(cli, kind)
+    assert command.callback is not None
+    assert cli.evaluate_scores.callback is not None
+
+    record = tmp_path / "scores.npy"
+    saved = io.StringIO()
+    expect = io.StringIO()
+    command.callback(method="mock", loop=2, param=[], output=expect, save_scores=saved, record_scores=str(record))
+    expect_records = [json.loads(line) for line in expect.getvalue().splitlines()][-1 if kind == "ranking" else 0 :]
+    for r in expect_records:
+        r.pop("loop", None)
+
+    saved.seek(0)
+    text = tmp_path / "scores.txt"
+    text.write_text("".join(f"{name} {score}\n" for name, score in Scores.load(saved).reviewers.items()))
+
+    for path in (record, text):
+        output = io.StringIO()
+        cli.evaluate_scores.callback(kind=kind, scores=str(path), output=output)
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        for r in records:
+            assert r.pop("loop", 0) == 0
+        assert records == expect_records
+
+
+@pytest.mark.parametrize("kind", ["threshold", "ranking", "dcg"])
+def test_approx(mocker: MockerFixture, tmp_path: Path, kind: str) -> None:
+    mocker.patch.object(cli, "INSTALLED_GRAPHS", {"mock": lambda **_: Graph()})
+    command = getattr(cli, kind)
+    assert command.callback is not None
+    assert cli.evaluate_scores.callback is not None
+
+    record = tmp_path / "scores.npy"
+    expect = io.StringIO()
+    command.callback(method="mock", loop=2, param=[], output=expect, record_scores=str(record))
+    status = tmp_path / "status.json"
+    output = io.StringIO()
+    command.callback(method="mock", loop=2, param=[], output=output, status_file=str(status), approx=64)
+    assert output.getvalue() == expect.getvalue()
+    metrics = json.loads(status.read_text())
+    assert metrics["auc"] == 1.0
+    assert metrics["auc_error"] is not None
+
+    expect = io.StringIO()
+    cli.evaluate_scores.callback(kind=kind, scores=str(record), output=expect)
+    output = io.StringIO()
+    cli.evaluate_scores.callback(kind=kind, scores=str(record), output=output, approx=64)
+    assert output.getvalue() == expect.getvalue()
@@ -0,0 +1,143 @@
+#
+#  test_evaluator.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+import json
+from typing import Optional
+
+import numpy as np
+import pytest
+from numpy import testing
+from pytest_mock import MockerFixture
+
+from synthetic import graph
+from synthetic.eval import Evaluator, evaluator
+from synthetic.eval.evaluator import THRESHOLDS, dcg_result, ranking_result, threshold_result
+from synthetic.eval.graph import Scores, ScoreSnapshot
+from synthetic.eval.score import auc, dcg_curve, ideal_dcg
+from tests.graph import Graph
+
+
+@pytest.mark.parametrize("bins", [None, 16])
+def test_threshold_result(bins: Optional[int]) -> None:
+    rng = np.random.default_rng(0)
+    scores = rng.random(200)
+    scores[:3] = [0.0, 1.0, np.nan]
+    types = rng.integers(0, 4, size=200).astype(np.int8)
+
+    res = threshold_result(scores, types, bins)
+    if bins is None:
+        assert res.auc == auc(scores, types > 0)
+        assert res.auc_error == 0
+    else:
+        valid = ~np.isnan(scores)
+        assert 0 < res.auc_error <= 0.05
+        assert abs(res.auc - auc(scores[valid], types[valid] > 0)) <= res.auc_error
+    for i, th in enumerate(THRESHOLDS):
+        a = scores >= th
+        assert res.true_positive[i] == np.count_nonzero(a & (types > 0))
+        assert res.false_positive[i] == np.count_nonzero(a & (types == 0))
+        assert res.false_negative[i] == np.count_nonzero(~a & (types > 0))
+        assert res.true_negative[i] == np.count_nonzero(~a & (types == 0))
+    assert res.records()[1] == {
+        "threshold": THRESHOLDS[1],
+        "true-positive": res.true_positive[1],
+        "true-negative": res.true_negative[1],
+        "false-positive": res.false_positive[1],
+        "false-negative": res.false_negative[1],
+    }
+
+
+@pytest.mark.parametrize("bins", [None, 16])
+def test_ranking_result(bins: Optional[int]) -> None:
+    scores = np.array([0.9, 0.5, 0.5, 0.1, 0.8])
+    types = np.array([1, 0, 2, 3, 0], dtype=np.int8)
+
+    res = ranking_result(scores, types, 3, bins)
+    testing.assert_array_equal(res.found, [2, 1, 0, 0])
+    testing.assert_array_equal(res.precisions, [1, 0, 0])
+    assert res.error_rate == 2 / 5
+
+    record = res.record()
+    assert record["a1"] == 1
+    assert record["a2"] == 0
+    assert record["a3"] == 0
+    assert record["error"] == 2
+    assert record["error-rate"] == 2 / 5
+    assert record["loop"] == 3
+
+
+def test_ranking_result_missing_type() -> None:
+    scores = np.array([0.9, 0.5, 0.1])
+    types = np.array([1, 0, 0], dtype=np.int8)
+
+    record = ranking_result(scores, types, 0).record()
+    assert record["a1-precision"] == 1.0
+    assert record["a2-precision"] is None
+    assert record["a3-precision"] is None
+    assert "NaN" not in json.dumps(record)
+
+
+@pytest.mark.parametrize("bins", [None, 16])
+def test_dcg_result(bins: Optional[int]) -> None:
+    scores = np.array([0.9, 0.8, 0.7, 0.1])
+    types = np.array([1, 0, 2, 0], dtype=np.int8)
+
+    res = dcg_result(scores, types, bins)
+    testing.assert_allclose(res.ndcg, dcg_curve(scores, types > 0, 2) / [ideal_dcg(1), ideal_dcg(2)])
+    assert res.ndcg[0] == 1
+    assert res.records()[0] == {"k": 1, "score": 1.0}
+
+
+def test_evaluator(mocker: MockerFixture) -> None:
+    read_dataset = mocker.spy(evaluator, "read_dataset")
+    ev = Evaluator(sample=0.2, seed=1, graphs={"mock": lambda **_: Graph(), "mutual": graph.MutualGraph})
+    assert ev.methods == ["mock", "mutual"]
+
+    hook = mocker.MagicMock()
+    g = ev.graph("mock")
+    snapshot = ev.run(g, 3, hooks=[hook])
+    assert [c.args[0] for c in hook.call_args_list] == [0, 1, 2]
+    assert all(c.args[1] is snapshot for c in hook.call_args_list)
+    assert len(snapshot) == len(ev.dataset.reviewer_names)
+
+    assert ev.threshold(snapshot).auc == 1.0
+    assert ev.ranking(snapshot).found[0] == 0
+    testing.assert_allclose(ev.dcg(snapshot).ndcg, 1.0)
+
+    # Graphs of other algorithms are loaded from the same dataset.
+    m = ev.graph("mutual")
+    assert isinstance(m, graph.MutualGraph)
+    assert list(ScoreSnapshot(m).names) == ev.dataset.reviewer_names.tolist()
+    assert read_dataset.call_count == 1
+
+
+def test_evaluator_warm_start() -> None:
+    ev = Evaluator(sample=0.1, seed=0, graphs={"mutual": graph.MutualGraph})
+    name = ev.dataset.reviewer_names[0]
+    g = ev.graph("mutual", warm_start=Scores({name: 0.7}, {}))
+    assert ScoreSnapshot(g).scores()[0] == 0.7
+
+
+def test_evaluator_errors() -> None:
+    ev = Evaluator(graphs={"mutual": graph.MutualGraph})
+    with pytest.raises(ValueError):
+        ev.graph("unknown")
+    with pytest.raises(TypeError):
+        ev.graph("mutual", {"unknown": 1.0})
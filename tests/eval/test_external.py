@@ -0,0 +1,108 @@
+#
+#  test_external.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+import gzip
+import logging
+from pathlib import Path
+
+import numpy as np
+import pytest
+from numpy import testing
+from pytest_mock import MockerFixture
+
+from synthetic.eval import external
+from synthetic.eval.evaluator import dcg_result, ranking_result, threshold_result
+from synthetic.eval.external import join_scores, read_external_scores, read_score_chunks
+from synthetic.eval.record import index_path
+from synthetic.eval.score import anomaly_types
+from synthetic.loader import read_dataset, read_reviewer_names, write_binary
+
+
+def test_read_score_chunks_text(tmp_path: Path) -> None:
+    path = tmp_path / "scores.txt.gz"
+    with gzip.open(path, "wt") as fp:
+        fp.write("a 0.5\nb  1e-3\n\nc nan\n")
+
+    chunks = list(read_score_chunks(path))
+    testing.assert_array_equal(np.concatenate([names for names, _ in chunks]), ["a", "b", "c"])
+    testing.assert_array_equal(np.concatenate([scores for _, scores in chunks]), [0.5, 1e-3, np.nan])
+
+    path = tmp_path / "broken.txt"
+    path.write_text("a 0.5\nb\n")
+    with pytest.raises(ValueError):
+        list(read_score_chunks(path))
+    path.write_text("a b\n")
+    with pytest.raises(ValueError):
+        list(read_score_chunks(path))
+
+
+def test_read_score_chunks_npy(mocker: MockerFixture, tmp_path: Path) -> None:
+    mocker.patch.object(external, "CHUNK_REVIEWERS", 2)
+    path = tmp_path / "scores.npy"
+    np.save(path, np.arange(15, dtype=np.float32).reshape(3, 5))
+    Path(index_path(path)).write_text("a\nb\nc\nd\ne\n")
+
+    chunks = list(read_score_chunks(path))
+    assert [len(names) for names, _ in chunks] == [2, 2, 1]
+    testing.assert_array_equal(np.concatenate([names for names, _ in chunks]), ["a", "b", "c", "d", "e"])
+    testing.assert_array_equal(np.concatenate([scores for _, scores in chunks]), [10, 11, 12, 13, 14])
+
+    np.save(path, np.arange(4, dtype=np.float64))
+    with pytest.raises(ValueError):
+        list(read_score_chunks(path))
+    np.save(path, np.arange(6, dtype=np.float64))
+    with pytest.raises(ValueError):
+        list(read_score_chunks(path))
+
+
+def test_join_scores(caplog: pytest.LogCaptureFixture) -> None:
+    names = np.array(["c", "a", "b", "d"])
+    chunks = [(np.array(["a", "x"]), np.array([1.0, 2.0])), (np.array(["d", "c"]), np.array([3.0, 4.0]))]
+
+    with caplog.at_level(logging.WARNING):
+        res = join_scores(names, chunks)
+    testing.assert_array_equal(res, [4.0, 1.0, np.nan, 3.0])
+    assert "Ignored 1 scores" in caplog.text
+    assert "1 reviewers in the dataset" in caplog.text
+
+    testing.assert_array_equal(join_scores(np.empty(0, dtype=np.str_), chunks), [])
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_read_external_scores(tmp_path: Path, binary: bool) -> None:
+    dataset = None
+    if binary:
+        dataset = str(tmp_path / "dataset")
+        write_binary(read_dataset(), dataset)
+    names = read_reviewer_names(dataset)
+    types = anomaly_types(names)
+    rng = np.random.default_rng(0)
+    scores = np.round(rng.random(len(names)) * 0.5 + (types > 0) * 0.4, 2).astype(np.float64)
+
+    path = tmp_path / "scores.txt"
+    shuffled = rng.permutation(len(names))
+    path.write_text("".join(f"{names[i]} {float(scores[i])!r}\n" for i in shuffled))
+
+    values, res = read_external_scores(path, dataset)
+    testing.assert_array_equal(values, scores)
+    testing.assert_array_equal(res, types)
+
+    assert threshold_result(values, res).records() == threshold_result(scores, types).records()
+    assert ranking_result(values, res, 0).record() == ranking_result(scores, types, 0).record()
+    assert dcg_result(values, res).records() == dcg_result(scores, types).records()
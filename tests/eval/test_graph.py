@@ -0,0 +1,118 @@
+#
+#  test_graph.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+import io
+from collections.abc import Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from synthetic.eval.graph import (
+    ScoreArrayGraph,
+    Scores,
+    ScoreSnapshot,
+    WarmStartGraph,
+    export_scores,
+    import_scores,
+)
+from tests.graph import Graph
+
+
+class WarmStartMock(Graph):
+    """A mock graph which supports exporting and importing scores."""
+
+    product_scores: dict[str, float]
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.product_scores = {}
+
+    def export_scores(self) -> Scores:
+        return Scores(reviewers={r.name: r.anomalous_score for r in self.reviewers}, products=dict(self.product_scores))
+
+    def import_scores(self, scores: Scores) -> None:
+        for r in self.reviewers:
+            r.anomalous_score = scores.reviewers.get(r.name, r.anomalous_score)
+        self.product_scores.update(scores.products)
+
+
+class ScoreArrayMock(Graph):
+    """A mock graph which gives scores as an array and has no reviewer objects."""
+
+    def __init__(self, names: Sequence[str]) -> None:
+        super().__init__()
+        self.names = list(names)
+        self.scores = np.zeros(len(self.names))
+
+    def reviewer_index(self) -> Sequence[str]:
+        return self.names
+
+    def scores_array(self) -> npt.NDArray[np.float64]:
+        return self.scores
+
+
+def test_export_scores() -> None:
+    g = Graph()
+    g.new_reviewer("r1").anomalous_score = 0.5
+    assert not isinstance(g, WarmStartGraph)
+    assert export_scores(g) == Scores(reviewers={"r1": 0.5}, products={})
+    assert not import_scores(g, Scores(reviewers={"r1": 1.0}, products={}))
+
+
+def test_import_scores() -> None:
+    g = WarmStartMock()
+    g.new_reviewer("r1")
+    g.new_reviewer("r2").anomalous_score = 0.2
+    assert isinstance(g, WarmStartGraph)
+
+    buf = io.StringIO()
+    Scores(reviewers={"r1": 0.7}, products={"p1": 0.3}).dump(buf)
+    buf.seek(0)
+    assert import_scores(g, Scores.load(buf))
+    assert export_scores(g) == Scores(reviewers={"r1": 0.7, "r2": 0.2}, products={"p1": 0.3})
+
+
+def test_score_snapshot() -> None:
+    g = Graph()
+    g.new_reviewer("r1").anomalous_score = 0.5
+    r2 = g.new_reviewer("r2(anomaly)")
+    assert not isinstance(g, ScoreArrayGraph)
+
+    snapshot = ScoreSnapshot(g)
+    order = snapshot.names.tolist()
+    assert sorted(order) == ["r1", "r2(anomaly)"]
+    np.testing.assert_array_equal(snapshot.types, [int("anomaly" in name) for name in order])
+    r2.anomalous_score = 0.9
+    np.testing.assert_array_equal(snapshot.scores(), [0.5 if name == "r1" else 0.9 for name in order])
+
+
+def test_score_snapshot_with_array() -> None:
+    g = ScoreArrayMock(["r1", "r2_1(anomaly)"])
+    assert isinstance(g, ScoreArrayGraph)
+
+    snapshot = ScoreSnapshot(g)
+    assert len(snapshot) == 2
+    np.testing.assert_array_equal(snapshot.types, [0, 2])
+
+    g.scores[:] = [0.1, 0.8]
+    scores = snapshot.scores()
+    g.scores[:] = 0
+    np.testing.assert_array_equal(scores, [0.1, 0.8])
+    assert export_scores(g) == Scores(reviewers={"r1": 0.0, "r2_1(anomaly)": 0.0}, products={})
@@ -0,0 +1,78 @@
+#
+#  test_plot.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from synthetic.eval import cli
+from synthetic.eval.plot import Record, render, render_in_background
+
+RECORDS = {
+    "threshold": [
+        {
+            "threshold": th,
+            "true-positive": 57 - i,
+            "true-negative": 900 + i,
+            "false-positive": 43 - i,
+            "false-negative": i,
+        }
+        for i, th in enumerate([0.0, 0.5, 1.0])
+    ],
+    "ranking": [
+        {"a1-precision": 0.1 * i, "a2-precision": 0.2, "a3-precision": 0.3, "error-rate": 0.01, "loop": i}
+        for i in range(3)
+    ],
+    "dcg": [{"k": k, "score": 1 / k} for k in range(1, 58)],
+}
+
+
+@pytest.mark.parametrize(("kind", "records"), RECORDS.items())
+def test_render(tmp_path: Path, kind: str, records: list[Record]) -> None:
+    output = tmp_path / "result.png"
+    render(kind, records, str(output))
+    assert output.read_bytes().startswith(b"\x89PNG")
+
+
+def test_render_in_background(tmp_path: Path) -> None:
+    output = tmp_path / "result.png"
+    p = render_in_background("dcg", RECORDS["dcg"], str(output))
+    p.join()
+    assert p.exitcode == 0
+    assert output.exists()
+
+
+def test_plot_command(tmp_path: Path) -> None:
+    results = tmp_path / "results.jsonl"
+    results.write_text("".join(json.dumps(r) + "\n" for r in RECORDS["threshold"]))
+    output = tmp_path / "result.png"
+
+    res = CliRunner().invoke(cli.main, ["plot", "threshold", str(results), str(output)])
+    assert res.exit_code == 0, res.output
+    assert output.exists()
+
+
+def test_cli_imports_no_matplotlib() -> None:
+    code = "import sys, synthetic.eval.cli; sys.exit('matplotlib' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], check=False).returncode == 0
@@ -0,0 +1,117 @@
+#
+#  test_progress.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+import io
+import json
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from synthetic.eval import cli
+from synthetic.eval.progress import Progress, resident_memory
+from tests.graph import Graph
+
+
+def test_status_file(tmp_path: Path) -> None:
+    path = tmp_path / "status.json"
+    with Progress("mock", 3, status_file=str(path), interval=0.01) as progress:
+        assert json.loads(path.read_text())["state"] == "loading"
+        progress.reviews = 100
+        progress.start_update(0)
+        time.sleep(0.05)
+        running = json.loads(path.read_text())
+        assert running["state"] == "running"
+        assert running["running_update_seconds"] > 0
+        progress.finish_update(0.5, 0.75, 0.01)
+
+        status = json.loads(path.read_text())
+        assert status["iteration"] == 0
+        assert status["updates_total"] == 1
+        assert status["precision"] == 0.5
+        assert status["auc"] == 0.75
+        assert status["auc_error"] == 0.01
+        assert status["throughput_reviews_per_second"] == pytest.approx(100 / status["update_seconds"])
+        assert status["resident_memory_bytes"] > 0
+
+    assert json.loads(path.read_text())["state"] == "finished"
+    assert [p.name for p in tmp_path.iterdir()] == ["status.json"]
+
+
+def test_metrics_server() -> None:
+    with Progress("mock", 3, port=0) as progress:
+        assert progress.port
+        progress.start_update(0)
+        progress.finish_update(auc=0.5)
+        with urllib.request.urlopen(f"http://127.0.0.1:{progress.port}/metrics") as res:
+            body = res.read().decode()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"http://127.0.0.1:{progress.port}/other")
+
+    lines = body.splitlines()
+    assert "# TYPE synthetic_iteration gauge" in lines
+    assert 'synthetic_iteration{method="mock"} 0.0' in lines
+    assert 'synthetic_auc{method="mock"} 0.5' in lines
+    assert not any(line.startswith("synthetic_precision") for line in lines)
+    assert not any(line.startswith("synthetic_auc_error") for line in lines)
+    assert not any(line.startswith("synthetic_throughput") for line in lines)
+    assert progress.port is None
+
+
+def test_resident_memory(mocker: MockerFixture) -> None:
+    res = resident_memory()
+    assert res is not None and res > 0
+
+    # Neither /proc nor resource is available on Windows.
+    mocker.patch("builtins.open", side_effect=OSError)
+    mocker.patch.dict("sys.modules", {"resource": None})
+    assert resident_memory() is None
+
+
+def test_ranking_status_file(tmp_path: Path, mocker: MockerFixture) -> None:
+    mocker.patch.object(cli, "INSTALLED_GRAPHS", {"mock": lambda **_: Graph()})
+    path = tmp_path / "status.json"
+
+    assert cli.ranking.callback is not None
+    cli.ranking.callback(method="mock", loop=2, param=[], output=io.StringIO(), status_file=str(path))
+
+    status = json.loads(path.read_text())
+    assert status["state"] == "finished"
+    assert (status["iteration"], status["loop"], status["updates_total"]) == (1, 2, 2)
+    assert status["precision"] == 1.0
+    assert status["auc"] == 1.0
+    assert status["auc_error"] == 0.0
+    assert status["throughput_reviews_per_second"] > 0
+
+
+def test_ranking_status_file_sample(tmp_path: Path, mocker: MockerFixture) -> None:
+    mocker.patch.object(cli, "INSTALLED_GRAPHS", {"mock": lambda **_: Graph()})
+    count_reviews = mocker.patch("synthetic.loader.count_reviews")
+    path = tmp_path / "status.json"
+
+    assert cli.ranking.callback is not None
+    cli.ranking.callback(method="mock", loop=2, param=[], output=io.StringIO(), status_file=str(path), sample=0.5)
+
+    count_reviews.assert_not_called()
+    status = json.loads(path.read_text())
+    assert status["throughput_reviews_per_second"] > 0
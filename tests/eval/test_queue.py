@@ -0,0 +1,176 @@
+#
+#  test_queue.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+import io
+import json
+import multiprocessing
+import operator
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from synthetic.eval import cli, queue
+from synthetic.eval.queue import JobError, QueueExecutor, QueueStatus, queue_status, read_result, submit_job, work
+from synthetic.eval.significance import compare
+
+
+def start_workers(root: Path, n: int) -> list[threading.Thread]:
+    threads = [
+        threading.Thread(target=work, args=(root,), kwargs={"idle_timeout": 0.5, "poll": 0.01, "worker": f"w{i}"})
+        for i in range(n)
+    ]
+    for t in threads:
+        t.start()
+    return threads
+
+
+def test_executor(tmp_path: Path) -> None:
+    threads = start_workers(tmp_path, 3)
+    with QueueExecutor(tmp_path, poll=0.01) as executor:
+        assert list(executor.map(operator.mul, range(20), range(20))) == [i * i for i in range(20)]
+    for t in threads:
+        t.join()
+
+    assert queue_status(tmp_path) == QueueStatus(pending=0, running=0, done=20, failed=0)
+
+
+def test_worker_processes(tmp_path: Path) -> None:
+    workers = [
+        multiprocessing.Process(target=work, args=(tmp_path,), kwargs={"idle_timeout": 1, "poll": 0.01})
+        for _ in range(2)
+    ]
+    for p in workers:
+        p.start()
+    with QueueExecutor(tmp_path, poll=0.01) as executor:
+        assert list(executor.map(pow, range(10), [3] * 10)) == [i**3 for i in range(10)]
+    for p in workers:
+        p.join()
+        assert p.exitcode == 0
+
+
+def test_idempotent_jobs(tmp_path: Path) -> None:
+    job_id = submit_job(tmp_path, operator.add, 1, 2)
+    assert submit_job(tmp_path, operator.add, 1, 2) == job_id
+    assert read_result(tmp_path, job_id) == (False, None)
+    assert queue_status(tmp_path) == QueueStatus(pending=1, running=0, done=0, failed=0)
+
+    assert work(tmp_path, idle_timeout=0, poll=0.01) == 1
+    assert read_result(tmp_path, job_id) == (True, 3)
+
+    # The result is reused without any workers.
+    with QueueExecutor(tmp_path, poll=0.01) as executor:
+        assert executor.submit(operator.add, 1, 2).result(timeout=10) == 3
+    assert work(tmp_path, idle_timeout=0, poll=0.01) == 0
+
+
+def test_failed_job(tmp_path: Path) -> None:
+    job_id = submit_job(tmp_path, int, "x")
+    assert work(tmp_path, idle_timeout=0, poll=0.01, max_attempts=2) == 1
+    with pytest.raises(JobError, match="ValueError"):
+        read_result(tmp_path, job_id)
+    assert queue_status(tmp_path) == QueueStatus(pending=0, running=0, done=0, failed=1)
+
+    with QueueExecutor(tmp_path, poll=0.01) as executor:
+        with pytest.raises(JobError):
+            executor.submit(int, "x").result(timeout=10)
+
+
+def test_expired_lease(tmp_path: Path) -> None:
+    job_id = submit_job(tmp_path, operator.add, 1, 2)
+    lease = tmp_path / "leases" / f"{job_id}.json"
+
+    lease.write_text(json.dumps({"worker": "other", "attempt": 1, "expires": time.time() + 60}))
+    assert queue_status(tmp_path) == QueueStatus(pending=0, running=1, done=0, failed=0)
+    assert work(tmp_path, idle_timeout=0, poll=0.01) == 0
+
+    # The worker holding the lease died.
+    lease.write_text(json.dumps({"worker": "other", "attempt": 1, "expires": time.time() - 1}))
+    assert queue_status(tmp_path) == QueueStatus(pending=1, running=0, done=0, failed=0)
+    assert work(tmp_path, idle_timeout=0, poll=0.01) == 1
+    assert read_result(tmp_path, job_id) == (True, 3)
+    assert not lease.exists()
+
+    # A job whose workers died too many times fails.
+    job_id = submit_job(tmp_path, operator.add, 2, 3)
+    lease = tmp_path / "leases" / f"{job_id}.json"
+    lease.write_text(json.dumps({"worker": "other", "attempt": 3, "expires": 0}))
+    assert work(tmp_path, idle_timeout=0, poll=0.01, max_attempts=3) == 1
+    with pytest.raises(JobError):
+        read_result(tmp_path, job_id)
+
+
+def test_take_over(tmp_path: Path) -> None:
+    job_id = submit_job(tmp_path, operator.add, 1, 2)
+    lease = tmp_path / "leases" / f"{job_id}.json"
+    claim = tmp_path / "leases" / f"{job_id}.2.claim"
+
+    res = queue._claim(str(tmp_path), job_id, "a", 60)
+    assert res is not None and (res.worker, res.attempt) == ("a", 1)
+    assert queue._claim(str(tmp_path), job_id, "b", 60) is None
+
+    # Another worker is taking over the expired lease.
+    lease.write_text(json.dumps({"worker": "a", "attempt": 1, "expires": 0}))
+    claim.touch()
+    assert queue._claim(str(tmp_path), job_id, "b", 60) is None
+    assert json.loads(lease.read_text())["worker"] == "a"
+
+    # The worker died before writing the lease, so its attempt is skipped.
+    os.utime(claim, (0, 0))
+    res = queue._claim(str(tmp_path), job_id, "b", 60)
+    assert res is not None and (res.worker, res.attempt) == ("b", 3)
+    assert json.loads(lease.read_text())["worker"] == "b"
+
+    queue._release(str(lease))
+    assert list(lease.parent.iterdir()) == []
+
+
+def test_significance_with_queue(tmp_path: Path) -> None:
+    rng = np.random.default_rng(0)
+    labels = rng.random(100) < 0.2
+    a = labels + rng.normal(size=100)
+    b = rng.normal(size=100)
+    with ThreadPoolExecutor(2) as executor:
+        expect = compare(a, b, labels, resamples=200, seed=0, executor=executor, jobs=2)
+
+    threads = start_workers(tmp_path, 2)
+    with QueueExecutor(tmp_path, poll=0.01) as executor:
+        res = compare(a, b, labels, resamples=200, seed=0, executor=executor, jobs=2)
+    for t in threads:
+        t.join()
+    assert res == expect
+
+
+def test_queue_commands(tmp_path: Path) -> None:
+    submit_job(tmp_path, operator.add, 1, 2)
+
+    output = io.StringIO()
+    assert cli.queue_status_command.callback is not None
+    cli.queue_status_command.callback(queue=str(tmp_path), output=output)
+    assert json.loads(output.getvalue()) == {"pending": 1, "running": 0, "done": 0, "failed": 0}
+
+    output = io.StringIO()
+    assert cli.queue_work.callback is not None
+    cli.queue_work.callback(queue=str(tmp_path), lease=10, max_attempts=3, output=output, idle_timeout=0)
+    assert json.loads(output.getvalue()) == {"finished": 1}
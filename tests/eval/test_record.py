@@ -0,0 +1,59 @@
+#
+#  test_record.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+import io
+from pathlib import Path
+
+import numpy as np
+from pytest_mock import MockerFixture
+
+from synthetic.eval import cli
+from synthetic.eval.record import ScoreRecorder, index_path, read_record
+from tests.graph import Graph, Reviewer
+
+
+def test_score_recorder(tmp_path: Path) -> None:
+    path = tmp_path / "scores.npy"
+    reviewers = [Reviewer(f"r{i}") for i in range(4)]
+
+    with ScoreRecorder(path, reviewers, 3) as recorder:
+        for i in range(3):
+            for j, r in enumerate(reviewers):
+                r.anomalous_score = i * 10 + j
+            recorder.record()
+
+    assert index_path(path) == str(tmp_path / "scores.names")
+    names, scores = read_record(path)
+    assert names == ["r0", "r1", "r2", "r3"]
+    assert scores.dtype == np.float32
+    np.testing.assert_array_equal(scores, [[0, 1, 2, 3], [10, 11, 12, 13], [20, 21, 22, 23]])
+
+
+def test_record_scores_option(tmp_path: Path, mocker: MockerFixture) -> None:
+    mocker.patch.object(cli, "INSTALLED_GRAPHS", {"mock": lambda **_: Graph()})
+    path = tmp_path / "scores.npy"
+
+    assert cli.dcg.callback is not None
+    cli.dcg.callback(method="mock", loop=2, param=[], output=io.StringIO(), record_scores=str(path))
+
+    names, scores = read_record(path)
+    assert scores.shape == (2, 1000)
+    for name, score in zip(names, scores[-1], strict=True):
+        assert score == ("anomaly" in name)
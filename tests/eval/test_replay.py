@@ -0,0 +1,104 @@
+#
+#  test_replay.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+import math
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from synthetic.eval.graph import takes_dates
+from synthetic.eval.replay import replay
+from synthetic.loader import read_dataset
+from tests.graph import Graph
+
+
+class UntimedGraph(Graph):
+    """A graph whose add_review follows the three-argument protocol."""
+
+    def add_review(self, reviewer: Any, product: str, score: float) -> None:  # type: ignore[override]
+        super().add_review(reviewer, product, score)
+
+
+@pytest.mark.parametrize(("every", "interval"), [(1000, None), (None, 1000.0), (1000, 1e9)])
+def test_replay(every: int | None, interval: float | None) -> None:
+    dataset = read_dataset()
+    graph = Graph()
+
+    steps = list(replay(graph, dataset, every, interval))
+    assert [s.step for s in steps] == list(range(7))
+    assert [s.reviews for s in steps] == [1000, 2000, 3000, 4000, 5000, 6000, 6041]
+    assert [s.time for s in steps] == [r - 1 for r in [1000, 2000, 3000, 4000, 5000, 6000, 6041]]
+    assert graph.updates == 7
+    for s in steps:
+        assert s.precision == 1.0 or math.isnan(s.precision)
+        assert s.update_time >= 0
+        assert s.feed_time >= 0
+        assert s.lag == 0
+
+    assert sum(len(pmap) for pmap in graph.reviews.values()) == len(dataset.review_scores)
+
+
+def test_replay_with_timestamps(tmp_path: Path) -> None:
+    (tmp_path / "reviewer.dat").write_text("1 r1\n2 r2(anomaly)\n")
+    (tmp_path / "product.dat").write_text("1 p1\n2 p2\n")
+    (tmp_path / "review.dat").write_text("1 1 1.0 30\n2 1 5.0 10\n2 2 0.0 20\n1 2 2.5 40\n")
+    graph = Graph()
+
+    steps = list(replay(graph, read_dataset(tmp_path), interval=15))
+    assert [(s.reviews, s.time) for s in steps] == [(2, 20.0), (3, 30.0), (4, 40.0)]
+    assert math.isclose(steps[-1].precision, 1.0)
+
+    reviewers = {r.name: r for r in graph.reviewers}
+    assert graph.dates[(reviewers["r2(anomaly)"], "p1")] == datetime.fromtimestamp(10, tz=timezone.utc)
+    assert graph.reviews[reviewers["r1"]] == {"p1": 0.2, "p2": 0.5}
+
+
+def test_replay_error() -> None:
+    with pytest.raises(ValueError):
+        next(replay(Graph(), read_dataset()))
+
+
+def test_replay_rate(tmp_path: Path) -> None:
+    (tmp_path / "reviewer.dat").write_text("1 r1\n2 r2(anomaly)\n")
+    (tmp_path / "product.dat").write_text("1 p1\n2 p2\n")
+    (tmp_path / "review.dat").write_text("1 1 1.0\n2 1 5.0\n2 2 0.0\n1 2 2.5\n")
+
+    start = time.perf_counter()
+    steps = list(replay(Graph(), read_dataset(tmp_path), every=2, rate=20))
+    # The last review is due 3 / 20 seconds after the start.
+    assert time.perf_counter() - start >= 0.15
+    assert [(s.reviews, s.time) for s in steps] == [(2, 0.05), (4, 0.15)]
+    assert all(s.feed_time < 0.1 for s in steps)
+
+
+def test_replay_untimed_graph(tmp_path: Path) -> None:
+    (tmp_path / "reviewer.dat").write_text("1 r1\n")
+    (tmp_path / "product.dat").write_text("1 p1\n")
+    (tmp_path / "review.dat").write_text("1 1 1.0 30\n")
+    graph = UntimedGraph()
+
+    assert not takes_dates(graph)
+    assert takes_dates(Graph())
+    list(replay(graph, read_dataset(tmp_path), every=1))
+    assert not graph.dates
+    assert sum(len(pmap) for pmap in graph.reviews.values()) == 1
@@ -22,6 +22,7 @@ import math
 from collections.abc import Iterable
 from random import random
 
+import numpy as np
 import pytest
 from numpy import testing
 
@@ -30,9 +31,18 @@ from synthetic.eval.score import (
     TYPE2_ANOMALY_REVIEWER_TAG,
     TYPE3_ANOMALY_REVIEWER_TAG,
     Reviewer,
+    ScoreSketch,
+    anomaly_types,
+    auc,
     calc_anomalous_reviews,
     dcg,
+    dcg_curve,
     ideal_dcg,
+    ndcg,
+    ndcg_at_k,
+    precision,
+    precision_at_k,
+    roc_auc,
 )
 from synthetic.loader import load
 from tests.graph import Graph
@@ -83,3 +93,105 @@ def test_calc_anomalous_reviews(reviewers: Iterable[Reviewer]) -> None:
     assert res.type1 == t1
     assert res.type2 == t2
     assert res.type3 == t3
+
+
+def test_anomaly_types(reviewers: Iterable[Reviewer]) -> None:
+    names = [r.name for r in reviewers]
+    types = anomaly_types(names)
+
+    res = calc_anomalous_reviews(reviewers)
+    assert (types == 1).sum() == res.type1
+    assert (types == 2).sum() == res.type2
+    assert (types == 3).sum() == res.type3
+    assert (types == 0).sum() == len(names) - sum(res)
+
+
+@pytest.mark.parametrize("k", [0, 1, 10, 57, 100])
+def test_ndcg_and_precision(reviewers: Iterable[Reviewer], k: int) -> None:
+    top = sorted(reviewers, key=lambda rv: rv.anomalous_score, reverse=True)[:k]
+    expect = sum(ANOMALY_REVIEWER_TAG in r.name for r in top) / k if k else 0.0
+    testing.assert_almost_equal(precision(reviewers, k), expect)
+    testing.assert_almost_equal(ndcg(reviewers, k), dcg(reviewers, k) / ideal_dcg(k) if k else 0.0)
+
+
+def test_dcg_curve(reviewers: Iterable[Reviewer]) -> None:
+    reviewers = list(reviewers)
+    scores = [r.anomalous_score for r in reviewers]
+    labels = anomaly_types([r.name for r in reviewers]) > 0
+
+    curve = dcg_curve(scores, labels, 100)
+    assert len(curve) == 100
+    for k in (1, 10, 57, 100):
+        testing.assert_almost_equal(curve[k - 1], dcg(reviewers, k))
+        testing.assert_almost_equal(ndcg_at_k(scores, labels, k), ndcg(reviewers, k))
+        testing.assert_almost_equal(precision_at_k(scores, labels, k), precision(reviewers, k))
+    assert len(dcg_curve(scores, labels, 2000)) == len(reviewers)
+
+
+def test_top_k_ties() -> None:
+    # Tied reviewers are ranked in the given order.
+    testing.assert_allclose(dcg_curve([0.5, 0.5, 0.1], [False, True, True], 3), [0, 1, 1 + 1 / math.log2(3)])
+    assert precision_at_k([0.5, 0.5], [True, False], 1) == 1.0
+    assert precision_at_k([], [], 1) == 0.0
+    assert ndcg_at_k([0.5], [True], 0) == 0.0
+
+
+def test_roc_auc(reviewers: Iterable[Reviewer]) -> None:
+    anomalous = [r.anomalous_score for r in reviewers if ANOMALY_REVIEWER_TAG in r.name]
+    normal = [r.anomalous_score for r in reviewers if ANOMALY_REVIEWER_TAG not in r.name]
+    expect = sum((a > n) + (a == n) / 2 for a in anomalous for n in normal) / (len(anomalous) * len(normal))
+    testing.assert_almost_equal(roc_auc(reviewers), expect)
+
+
+def test_auc_ties() -> None:
+    testing.assert_almost_equal(auc([0.5, 0.5, 0.5, 1.0], [True, False, False, True]), 0.75)
+    assert math.isnan(auc([0.1, 0.2], [False, False]))
+
+
+@pytest.mark.parametrize("chunk", [1, 7, 1000])
+def test_score_sketch(chunk: int) -> None:
+    rng = np.random.default_rng(0)
+    labels = rng.random(1000) < 0.1
+    scores = np.round(np.clip(labels * 0.3 + rng.normal(0.4, 0.2, 1000), -0.2, 1.2), 3)
+    scores[::50] = np.nan
+    thresholds = np.linspace(0, 1, 100)
+
+    sketch = ScoreSketch(50, bins=64, thresholds=thresholds)
+    for i in range(0, len(scores), chunk):
+        sketch.add(scores[i : i + chunk], labels[i : i + chunk])
+
+    valid = ~np.isnan(scores)
+    assert sketch.positives == np.count_nonzero(labels & valid)
+    assert sketch.negatives == np.count_nonzero(~labels & valid)
+
+    estimate = sketch.auc()
+    assert 0 < estimate.error < 0.05
+    assert abs(estimate.value - auc(scores[valid], labels[valid])) <= estimate.error
+
+    anomalous, normal, error = sketch.at_least(thresholds)
+    testing.assert_array_equal(error, 0)
+    testing.assert_array_equal(anomalous, [np.count_nonzero(valid & labels & (scores >= t)) for t in thresholds])
+    testing.assert_array_equal(normal, [np.count_nonzero(valid & ~labels & (scores >= t)) for t in thresholds])
+
+    # NaN scores are ranked last by dcg_curve, so they are out of the top-50 ranking.
+    testing.assert_allclose(sketch.dcg_curve(), dcg_curve(scores, labels, 50))
+    testing.assert_array_equal(sketch.top_index, np.argsort(-scores, kind="stable")[:50])
+    assert sketch.precision() == precision_at_k(scores, labels, 50)
+    assert sketch.precision(10) == precision_at_k(scores, labels, 10)
+    testing.assert_almost_equal(sketch.ndcg(20), ndcg_at_k(scores, labels, 20))
+
+
+def test_score_sketch_bounds() -> None:
+    sketch = ScoreSketch(2, bins=2)
+    sketch.add([0.5, 0.5, 0.5, 1.0], [True, False, False, True])
+    assert sketch.auc() == (0.75, 0.25)
+    assert sketch.precision() == 1.0
+    testing.assert_allclose(sketch.dcg_curve(), [1, 2])
+    anomalous, normal, error = sketch.at_least([0.5, 0.7])
+    testing.assert_array_equal(anomalous, [2, 1])
+    testing.assert_array_equal(normal, [2, 0])
+    testing.assert_array_equal(error, [0, 3])
+
+    assert math.isnan(ScoreSketch(1).auc().value)
+    with pytest.raises(ValueError):
+        ScoreSketch(1, bins=0)
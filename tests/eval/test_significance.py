@@ -0,0 +1,138 @@
+#
+#  test_significance.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+import io
+import json
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+
+import numpy as np
+import pytest
+from numpy import testing
+
+from synthetic.eval import cli, significance
+from synthetic.eval.graph import Scores
+from synthetic.eval.score import auc, ndcg_at_k
+from synthetic.eval.significance import batch_auc, batch_ndcg, compare
+
+
+def test_batch_auc() -> None:
+    rng = np.random.default_rng(0)
+    scores = rng.integers(0, 5, size=(4, 50)).astype(np.float64)
+    labels = rng.random((4, 50)) < 0.3
+
+    testing.assert_allclose(batch_auc(scores, labels), [auc(s, y) for s, y in zip(scores, labels)])
+    assert np.isnan(batch_auc(scores[:1], np.zeros((1, 50), dtype=bool)))[0]
+
+
+def test_batch_ndcg() -> None:
+    scores = np.array([[0.9, 0.8, 0.7, 0.1], [0.1, 0.9, 0.8, 0.85]])
+    labels = np.array([[True, False, True, False], [True, False, True, False]])
+
+    testing.assert_allclose(batch_ndcg(scores, labels, 3), [(1 + 1 / np.log2(3)) / 2, 1 / np.log2(3) / 2])
+
+
+@pytest.mark.parametrize("k", [1, 5, 17])
+def test_batch_ndcg_ties(k: int) -> None:
+    rng = np.random.default_rng(0)
+    scores = rng.integers(0, 4, size=(30, 40)).astype(np.float64)
+    labels = rng.random((30, 40)) < 0.8
+
+    # Tied reviewers are ranked in the given order as ndcg_at_k does.
+    testing.assert_allclose(batch_ndcg(scores, labels, k), [ndcg_at_k(s, y, k) for s, y in zip(scores, labels)])
+
+
+def test_resampled_auc() -> None:
+    rng = np.random.default_rng(0)
+    a = rng.integers(0, 6, size=60).astype(np.float64)
+    b = rng.integers(0, 6, size=60).astype(np.float64)
+    labels = rng.random(60) < 0.3
+    seed = np.random.SeedSequence(3)
+
+    # AUC of each resample from the scores sorted once is the same as the one sorting every resample.
+    gen = np.random.default_rng(seed)
+    idx = gen.integers(0, 60, size=(50, 60))
+    testing.assert_allclose(
+        significance._bootstrap("auc", 0, a, b, labels, 50, seed),
+        batch_auc(a[idx], labels[idx]) - batch_auc(b[idx], labels[idx]),
+    )
+    gen = np.random.default_rng(seed)
+    swap = gen.random((50, 60)) < 0.5
+    tiled = np.broadcast_to(labels, (50, 60))
+    testing.assert_allclose(
+        significance._permutation("auc", 0, a, b, labels, 50, seed),
+        batch_auc(np.where(swap, b, a), tiled) - batch_auc(np.where(swap, a, b), tiled),
+    )
+
+
+def test_compare_same_methods() -> None:
+    rng = np.random.default_rng(0)
+    labels = rng.random(200) < 0.2
+    scores = labels + rng.normal(size=200)
+
+    res = compare(scores, scores, labels, resamples=500, seed=0)
+    assert res.difference == 0
+    assert res.low == res.high == 0
+    assert res.p_value == 1
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+@pytest.mark.parametrize("metric", ["auc", "ndcg"])
+def test_compare_different_methods(metric: str, parallel: bool) -> None:
+    rng = np.random.default_rng(0)
+    labels = rng.random(300) < 0.2
+    good = 2 * labels + rng.normal(size=300)
+    bad = rng.normal(size=300)
+
+    pool: AbstractContextManager[Executor | None] = ProcessPoolExecutor(2) if parallel else nullcontext()
+    with pool as executor:
+        res = compare(good, bad, labels, metric=metric, resamples=1000, seed=1, executor=executor, jobs=2)
+
+    assert res.difference > 0
+    assert 0 < res.low <= res.difference <= res.high
+    assert res.p_value < 0.01
+
+
+def test_compare_errors() -> None:
+    with pytest.raises(ValueError):
+        compare([1, 2], [1, 2], [True, False], metric="unknown")
+    with pytest.raises(ValueError):
+        compare([1, 2], [1], [True, False])
+
+
+def test_significance_command() -> None:
+    names = [f"r{i}" for i in range(40)] + [f"anomaly{i}" for i in range(10)]
+    good, bad = io.StringIO(), io.StringIO()
+    Scores({n: 1.0 if "anomaly" in n else 0.0 for n in names}, {}).dump(good)
+    Scores({n: 0.5 for n in names}, {}).dump(bad)
+    good.seek(0)
+    bad.seek(0)
+
+    output = io.StringIO()
+    assert cli.significance.callback is not None
+    cli.significance.callback(
+        scores_a=good, scores_b=bad, metric="auc", resamples=200, alpha=0.05, seed=0, jobs=1, output=output
+    )
+
+    res = json.loads(output.getvalue())
+    assert res["a"] == 1.0
+    assert res["b"] == 0.5
+    assert res["difference"] == 0.5
+    assert res["p-value"] < 0.05
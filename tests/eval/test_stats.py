@@ -0,0 +1,79 @@
+#
+#  test_stats.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+import io
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+
+from synthetic import loader
+from synthetic.eval import cli
+from synthetic.eval.stats import DatasetStats, distribution
+
+
+def test_distribution() -> None:
+    res = distribution(np.array([0, 1, 2, 3, 4, 9]))
+    assert res["min"] == 0
+    assert res["max"] == 9
+    assert res["bins"] == [0, 1, 2, 4, 8]
+    assert res["counts"] == [1, 1, 2, 1, 1]
+    assert distribution(np.array([], dtype=np.int64)) == {"nodes": 0}
+
+
+def test_dataset_stats(tmp_path: Path) -> None:
+    (tmp_path / "reviewer.dat").write_text("1 r1\n2 r2\n3 anomaly1\n4 anomaly_1\n5 anomaly_2\n")
+    (tmp_path / "product.dat").write_text("7 p1\n8 p2\n9 p3\n")
+    (tmp_path / "review.dat").write_text("1 7 4.5\n2 7 4\n2 8 3\n3 7 1\n3 8 0.2\n4 9 0.5\n5 9 5\n")
+
+    res = DatasetStats()
+    res.add(loader.read_dataset(tmp_path))
+    summary = res.summary()
+
+    assert summary["reviews"] == 7
+    assert summary["density"] == 7 / 15
+    assert summary["reviewer_degrees"]["counts"] == [0, 3, 2]
+    assert summary["product_degrees"]["counts"] == [0, 0, 3]
+    assert summary["scores"]["counts"] == [1, 1, 1, 0, 0, 0, 1, 0, 1, 2]
+    assert summary["types"]["normal"]["reviewers"] == 2
+    assert summary["types"]["normal"]["mean_score"] == (4.5 + 4 + 3) / 3
+    assert summary["types"]["type1"]["counts"] == [1, 0, 1, 0, 0, 0, 0, 0, 0, 0]
+    assert summary["collusion"]["type1"] == {"reviewers": 1, "products": 2, "reviews": 2, "density": 1.0}
+    assert summary["collusion"]["type2"]["density"] == 1.0
+    assert summary["collusion"]["anomalous"] == {"reviewers": 3, "products": 3, "reviews": 4, "density": 4 / 9}
+
+
+def test_stats_command(mocker: MockerFixture) -> None:
+    mocker.patch.object(loader, "_CHUNK_SIZE", 4096)
+
+    res = []
+    for stream in (False, True):
+        output = io.StringIO()
+        assert cli.stats.callback is not None
+        cli.stats.callback(output=output, stream=stream)
+        res.append(json.loads(output.getvalue()))
+
+    # Means can differ in the last digits because scores are summed in different orders.
+    for name, t in res[0]["types"].items():
+        assert t.pop("mean_score") == pytest.approx(res[1]["types"][name].pop("mean_score"))
+    assert res[0] == res[1]
+    assert res[0]["collusion"]["anomalous"]["reviewers"] == 57
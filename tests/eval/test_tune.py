@@ -0,0 +1,116 @@
+#
+#  test_tune.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from typing import Optional
+
+import pytest
+from pytest_mock import MockerFixture
+
+from synthetic.eval import tune
+from synthetic.eval.tune import Outcome, Params, best_trial, evaluate, grid, hyperband, successive_halving
+from synthetic.graph import MutualGraph
+from synthetic.scores import Scores
+from tests.graph import Graph
+
+
+def quadratic(params: Params, loop: int, warm_start: Optional[Scores] = None) -> Outcome:
+    """A score which is the highest at x = 0.3 and whose noise decreases as the total number of updates increases.
+
+    The exported scores carry the total number of updates.
+    """
+    total = loop + (int(warm_start.reviewers["loop"]) if warm_start else 0)
+    x = dict(params)["x"]
+    return Outcome(
+        -((x - 0.3) ** 2) + (0.1 if x == 0.9 and total < 3 else 0.0), Scores(reviewers={"loop": total}, products={})
+    )
+
+
+def test_grid() -> None:
+    assert grid({"a": [1.0, 2.0], "b": [3.0]}) == [(("a", 1.0), ("b", 3.0)), (("a", 2.0), ("b", 3.0))]
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_successive_halving(parallel: bool) -> None:
+    configs = grid({"x": [i / 10 for i in range(10)]})
+    pool: AbstractContextManager[Executor | None] = ProcessPoolExecutor(2) if parallel else nullcontext()
+    with pool as executor:
+        trials = list(successive_halving(quadratic, configs, 1, 9, 3, executor))
+
+    assert Counter(t.loop for t in trials) == {1: 10, 3: 3, 9: 1}
+    assert [t.rung for t in trials] == [0] * 10 + [1] * 3 + [2]
+    assert dict(best_trial(trials).params) == {"x": 0.3}
+
+
+@pytest.mark.parametrize("n", [1, 2, 4])
+def test_successive_halving_few_configs(n: int) -> None:
+    trials = list(successive_halving(quadratic, grid({"x": [i / 10 for i in range(n)]}), 1, 20, 3))
+
+    assert [t.loop for t in trials if t.rung > 0] == [3, 9, 20]
+    assert best_trial(trials).loop == 20
+
+
+@pytest.mark.parametrize("resumable", [False, True])
+def test_successive_halving_continue(resumable: bool) -> None:
+    calls = []
+
+    def evaluator(params: Params, loop: int, warm_start: Optional[Scores] = None) -> Outcome:
+        calls.append((loop, None if warm_start is None else warm_start.reviewers["loop"]))
+        res = quadratic(params, loop, warm_start)
+        return res if resumable else res._replace(scores=None)
+
+    trials = list(successive_halving(evaluator, grid({"x": [i / 10 for i in range(10)]}), 1, 9, 3))
+
+    assert [t.loop for t in trials] == [1] * 10 + [3] * 3 + [9]
+    if resumable:
+        assert calls == [(1, None)] * 10 + [(2, 1)] * 3 + [(6, 3)]
+    else:
+        assert calls == [(1, None)] * 10 + [(3, None)] * 3 + [(9, None)]
+    assert dict(best_trial(trials).params) == {"x": 0.3}
+
+
+def test_hyperband() -> None:
+    configs = grid({"x": [i / 10 for i in range(10)]})
+    trials = list(hyperband(quadratic, configs, 9, 3, seed=0))
+
+    assert max(t.bracket for t in trials) == 2
+    assert Counter(t.loop for t in trials if t.bracket == 0) == {1: 9, 3: 3, 9: 1}
+    assert Counter(t.loop for t in trials if t.bracket == 2) == {9: 3}
+    assert dict(best_trial(trials).params) == {"x": 0.3}
+
+
+def test_evaluate(mocker: MockerFixture) -> None:
+    mocker.patch.object(tune, "_installed_graphs", return_value={"mock": lambda **_: Graph()})
+    for metric in tune.METRICS:
+        assert evaluate("mock", metric, None, None, None, (("x", 1.0),), 2) == Outcome(1.0, None)
+
+
+def test_evaluate_warm_start(mocker: MockerFixture) -> None:
+    mocker.patch.object(tune, "_installed_graphs", return_value={"mutual": MutualGraph})
+    expect = evaluate("mutual", "auc", None, 0.2, 0, (), 3)
+    first = evaluate("mutual", "auc", None, 0.2, 0, (), 1)
+    assert first.scores is not None
+
+    res = evaluate("mutual", "auc", None, 0.2, 0, (), 2, first.scores)
+    assert res.score == pytest.approx(expect.score)
+    assert res.scores is not None and expect.scores is not None
+    assert res.scores.reviewers == pytest.approx(expect.scores.reviewers)
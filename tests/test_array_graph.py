@@ -0,0 +1,130 @@
+#
+#  test_array_graph.py
+#
+#  Copyright (c) 2016-2022 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Unit test for graph module."""
+
+import pickle
+
+import pytest
+
+import synthetic
+from synthetic.eval.graph import Graph, ScoreArrayGraph, ScoreSnapshot, WarmStartGraph, list_installed_graphs
+from synthetic.eval.score import calc_anomalous_reviews
+from synthetic.graph import ArrayGraph, DeviationGraph, MutualGraph
+
+
+def small_graph(g: ArrayGraph) -> ArrayGraph:
+    r1, r2, r3 = (g.new_reviewer(name) for name in ("r1", "r2", "r3"))
+    p1, p2 = g.new_product("p1"), g.new_product("p2")
+    g.add_review(r1, p1, 0.8)
+    g.add_review(r2, p1, 0.8)
+    g.add_review(r3, p1, 0.2)
+    g.add_review(r1, p2, 0.5)
+    return g
+
+
+def test_deviation_graph() -> None:
+    g = small_graph(DeviationGraph())
+    assert g.update() == pytest.approx(0.4)
+
+    r1, r2, r3 = g.reviewers
+    assert g.products[0].summary == pytest.approx(0.6)
+    assert g.products[1].summary == pytest.approx(0.5)
+    assert r1.anomalous_score == pytest.approx(0.1)
+    assert r2.anomalous_score == pytest.approx(0.2)
+    assert r3.anomalous_score == pytest.approx(0.4)
+    assert g.update() == 0
+
+
+def test_mutual_graph() -> None:
+    g = small_graph(MutualGraph())
+    g.update()
+    for _ in range(100):
+        if g.update() < 1e-9:
+            break
+
+    r1, r2, r3 = g.reviewers
+    assert r3.anomalous_score > r2.anomalous_score > r1.anomalous_score
+    assert g.products[0].summary > 0.6
+
+
+def test_load_dataset() -> None:
+    g = synthetic.load(MutualGraph())
+    assert len(g.reviewers) == 1000
+    assert len(g.products) == 459
+    assert sum(calc_anomalous_reviews(g.reviewers)) == synthetic.ANOMALOUS_REVIEWER_SIZE
+
+    g.update()
+    assert all(0 <= r.anomalous_score <= 1 for r in g.reviewers)
+
+    # Graphs can be extended after updates and pickled by the graph cache.
+    g.add_review(g.new_reviewer("new"), g.new_product("new"), 1.0)
+    restored = pickle.loads(pickle.dumps(g))
+    assert [r.anomalous_score for r in restored.reviewers] == [r.anomalous_score for r in g.reviewers]
+
+
+def test_scores_array() -> None:
+    g = small_graph(DeviationGraph())
+    assert isinstance(g, ScoreArrayGraph)
+    assert g.reviewer_index() == ["r1", "r2", "r3"]
+
+    g.update()
+    assert g.scores_array().tolist() == [r.anomalous_score for r in g.reviewers]
+    assert ScoreSnapshot(g).scores().tolist() == [r.anomalous_score for r in g.reviewers]
+
+
+def test_scores_array_then_add_reviews() -> None:
+    g = small_graph(MutualGraph())
+    g.update()
+    scores = g.scores_array()
+
+    r = g.new_reviewer("r4")
+    g.add_review(r, g.new_product("p3"), 0.5)
+    g.update()
+    assert len(scores) == 3
+    assert g.scores_array().tolist() == [r.anomalous_score for r in g.reviewers]
+
+
+def test_warm_start() -> None:
+    g = small_graph(MutualGraph())
+    g.update()
+    assert isinstance(g, WarmStartGraph)
+
+    scores = g.export_scores()
+    assert set(scores.reviewers) == {"r1", "r2", "r3"}
+    assert set(scores.products) == {"p1", "p2"}
+
+    other = small_graph(MutualGraph())
+    other.import_scores(scores)
+    assert other.export_scores() == scores
+
+
+def test_registered() -> None:
+    graphs = list_installed_graphs()
+    assert graphs["deviation"] is DeviationGraph
+    assert graphs["mutual"] is MutualGraph
+
+    g: Graph = graphs["mutual"]()
+    assert len(g.reviewers) == 0
+
+
+def test_array_graph_is_abstract() -> None:
+    with pytest.raises(TypeError):
+        ArrayGraph()  # type: ignore[abstract]
@@ -0,0 +1,161 @@
+#
+#  test_generator.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Unit test for generator module."""
+
+import gzip
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from synthetic.anomaly import anomaly_types
+from synthetic.generator import (
+    DestinationError,
+    PrefixConflictError,
+    generate_dataset,
+    inject,
+    inject_files,
+    write_dataset,
+)
+from synthetic.loader import read_dataset
+
+
+def test_generate_dataset() -> None:
+    dataset = generate_dataset(2000, seed=1)
+
+    assert len(dataset.reviewer_ids) == 2000
+    assert len(dataset.product_ids) == 918
+    assert np.bincount(anomaly_types(dataset.reviewer_names), minlength=4).tolist() == [1886, 54, 20, 40]
+    assert np.all((0 <= dataset.review_scores) & (dataset.review_scores < 5))
+    assert len(np.unique(dataset.review_reviewers * 918 + dataset.review_products)) == len(dataset.review_scores)
+
+    for a, b in zip(dataset, generate_dataset(2000, seed=1), strict=True):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_generate_dataset_with_times(tmp_path: Path) -> None:
+    dataset = generate_dataset(2000, seed=1, times=(100.0, 200.0))
+    assert np.all((100 <= dataset.review_times) & (dataset.review_times <= 200))
+
+    # Timestamps don't change the other columns.
+    for a, b in zip(dataset[:-1], generate_dataset(2000, seed=1)[:-1], strict=True):
+        np.testing.assert_array_equal(a, b)
+
+    write_dataset(dataset, tmp_path)
+    np.testing.assert_array_equal(read_dataset(tmp_path).review_times, dataset.review_times)
+
+
+def test_generate_dataset_error() -> None:
+    with pytest.raises(ValueError):
+        generate_dataset(0)
+    with pytest.raises(ValueError):
+        generate_dataset(10, times=(2.0, 1.0))
+
+
+def test_write_dataset(tmp_path: Path) -> None:
+    dataset = generate_dataset(300, products=50, seed=2)
+    write_dataset(dataset, tmp_path)
+    for a, b in zip(read_dataset(tmp_path), dataset, strict=True):
+        np.testing.assert_array_equal(a, b)
+
+    dataset = dataset._replace(review_times=np.arange(len(dataset.review_scores), dtype=np.float64))
+    write_dataset(dataset, tmp_path)
+    np.testing.assert_array_equal(read_dataset(tmp_path).review_times, dataset.review_times)
+
+
+def test_inject() -> None:
+    dataset = read_dataset()
+    res = inject(dataset, rates=(0.1, 0.05, 0.05), seed=3)
+
+    types = anomaly_types(res.reviewer_names)
+    assert np.bincount(types[len(dataset.reviewer_ids) :], minlength=4).tolist() == [0, 100, 50, 50]
+    for a, b in zip(dataset, res, strict=True):
+        np.testing.assert_array_equal(b[: len(a)], a)
+    assert res.reviewer_ids[len(dataset.reviewer_ids)] == dataset.reviewer_ids.max() + 1
+    assert np.all((0 <= res.review_scores) & (res.review_scores < 5))
+
+    planted = slice(len(dataset.review_scores), None)
+    assert np.all(types[res.review_reviewers[planted]] > 0)
+    colluding = types[res.review_reviewers[planted]] > 1
+    assert np.all(res.review_scores[planted][colluding] <= 1.5)
+    degrees = np.bincount(res.review_reviewers[planted], minlength=len(types))[len(dataset.reviewer_ids) :]
+    assert np.all(degrees[types[len(dataset.reviewer_ids) :] >= 2] == 2)
+
+
+def test_inject_with_times() -> None:
+    dataset = generate_dataset(300, products=50, rates=(0, 0, 0), seed=4)
+    dataset = dataset._replace(review_times=np.linspace(10, 20, len(dataset.review_scores)))
+    res = inject(dataset, seed=5)
+
+    assert len(res.reviewer_ids) == 300 + 8 + 3 + 6
+    assert np.all((10 <= res.review_times) & (res.review_times <= 20))
+
+
+def test_inject_error() -> None:
+    dataset = generate_dataset(300, rates=(0, 0, 0), seed=8)
+    dataset = dataset._replace(reviewer_names=np.append(dataset.reviewer_names[:-1], "s301(anomaly)"))
+    with pytest.raises(PrefixConflictError):
+        inject(dataset, seed=9)
+
+
+def test_inject_files(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    write_dataset(generate_dataset(300, products=50, rates=(0, 0, 0), seed=6), source)
+    with open(source / "review.dat", "rb") as src, gzip.open(source / "review.dat.gz", "wb") as dst:
+        dst.write(src.read().rstrip(b"\n"))
+    (source / "review.dat").unlink()
+
+    res = inject_files(source, tmp_path / "destination", seed=7)
+    loaded = read_dataset(tmp_path / "destination")
+    expected = inject(read_dataset(source), seed=7)
+    np.testing.assert_array_equal(loaded.reviewer_names, expected.reviewer_names)
+    np.testing.assert_array_equal(loaded.review_products, expected.review_products)
+    np.testing.assert_allclose(loaded.review_scores, expected.review_scores)
+    assert len(res.review_scores) == len(loaded.review_scores) - len(read_dataset(source).review_scores)
+
+
+def test_inject_files_error(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    dataset = generate_dataset(300, rates=(0, 0, 0), seed=8)
+    write_dataset(dataset._replace(reviewer_names=np.append(dataset.reviewer_names[:-1], "s301(anomaly)")), source)
+
+    with pytest.raises(PrefixConflictError):
+        inject_files(source, tmp_path / "destination", seed=9)
+    assert not (tmp_path / "destination").exists()
+
+
+def test_inject_files_in_place(tmp_path: Path) -> None:
+    write_dataset(generate_dataset(300, products=50, rates=(0, 0, 0), seed=6), tmp_path)
+    before = {f.name: f.read_bytes() for f in tmp_path.iterdir()}
+
+    with pytest.raises(DestinationError):
+        inject_files(tmp_path, tmp_path, seed=7)
+    assert {f.name: f.read_bytes() for f in tmp_path.iterdir()} == before
+
+    # Files linked to the source are replaced instead of being overwritten.
+    destination = tmp_path / "destination"
+    destination.mkdir()
+    for name in before:
+        (destination / name).symlink_to(tmp_path / name)
+    inject_files(tmp_path, destination, seed=7)
+    assert {f.name: f.read_bytes() for f in tmp_path.iterdir() if f.is_file()} == before
+    assert len(read_dataset(destination).reviewer_ids) == 300 + 8 + 3 + 6
+    assert [f.name for f in tmp_path.iterdir() if f.name.startswith(".")] == []
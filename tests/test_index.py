@@ -0,0 +1,100 @@
+#
+#  test_index.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Unit test for index module."""
+
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import synthetic
+from synthetic import index
+from synthetic.loader import _induced_dataset, add_dataset, read_dataset
+from tests.graph import Graph
+
+
+@pytest.fixture
+def dataset(tmp_path: Path) -> Path:
+    res = tmp_path / "dataset"
+    res.mkdir()
+    (res / "reviewer.dat").write_text("10 r1\n20 r2(anomaly)\n30 r0\n40 r3\n")
+    (res / "product.dat").write_text("7 p1\n8 p2\n9 p3\n")
+    (res / "review.dat").write_text("20 7 2.5 100\n10 8 5 200\n\n10 7 0 300\n30 9 1 400\n40 9 4 500")
+    return res
+
+
+def test_load_subgraph(tmp_path: Path, dataset: Path) -> None:
+    synthetic.build_index(tmp_path / "index", dataset)
+
+    g = synthetic.load_subgraph(Graph(), ["r2(anomaly)"], tmp_path / "index", hops=0)
+    assert {r.name for r in g.reviewers} == {"r2(anomaly)"}
+    assert g.products == set()
+
+    g = synthetic.load_subgraph(Graph(), ["r2(anomaly)"], tmp_path / "index")
+    reviewers = {r.name: r for r in g.reviewers}
+    assert set(reviewers) == {"r2(anomaly)"}
+    assert g.products == {"p1"}
+    assert g.reviews[reviewers["r2(anomaly)"]] == {"p1": 0.5}
+
+    g = synthetic.load_subgraph(Graph(), ["r2(anomaly)"], tmp_path / "index", hops=2)
+    reviewers = {r.name: r for r in g.reviewers}
+    assert set(reviewers) == {"r1", "r2(anomaly)"}
+    assert g.products == {"p1"}
+    assert g.reviews[reviewers["r1"]] == {"p1": 0.0}
+
+    g = synthetic.load_subgraph(Graph(), ["r2(anomaly)"], tmp_path / "index", hops=3)
+    assert g.products == {"p1", "p2"}
+    assert g.reviews[{r.name: r for r in g.reviewers}["r1"]] == {"p1": 0.0, "p2": 1.0}
+
+    g = synthetic.load_subgraph(Graph(), ["r0"], tmp_path / "index", hops=4)
+    assert {r.name for r in g.reviewers} == {"r0", "r3"}
+    assert g.products == {"p3"}
+
+
+def test_load_subgraph_of_bundled_dataset(tmp_path: Path) -> None:
+    synthetic.build_index(tmp_path)
+    dataset = read_dataset()
+    seeds = dataset.reviewer_names[:3].tolist()
+
+    g = synthetic.load_subgraph(Graph(), seeds, tmp_path, hops=1)
+    expect = add_dataset(Graph(), _induced_dataset(dataset, np.arange(3)))
+    assert g.reviewers == expect.reviewers
+    assert g.products == expect.products
+    assert g.reviews == expect.reviews
+
+
+def test_index_errors(tmp_path: Path, dataset: Path) -> None:
+    synthetic.build_index(tmp_path / "index", dataset)
+    with pytest.raises(ValueError):
+        synthetic.load_subgraph(Graph(), ["unknown"], tmp_path / "index")
+    with pytest.raises(ValueError):
+        synthetic.load_subgraph(Graph(), ["r1"], tmp_path / "index", hops=-1)
+
+    with open(dataset / "review.dat", "a") as fp:
+        fp.write("\n30 7 1 600\n")
+    with pytest.raises(ValueError):
+        index.open_index(tmp_path / "index")
+
+    shutil.copy(dataset / "review.dat", dataset / "review.dat.gz")
+    (dataset / "review.dat").unlink()
+    with pytest.raises(ValueError):
+        synthetic.build_index(tmp_path / "index", dataset)
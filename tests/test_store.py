@@ -0,0 +1,109 @@
+#
+#  test_store.py
+#
+#  Copyright (c) 2016-2025 Junpei Kawamoto
+#
+#  This file is part of rgmining-synthetic-dataset.
+#
+#  rgmining-synthetic-dataset is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  rgmining-synthetic-dataset is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with rgmining-synthetic-dataset. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Unit test for store module."""
+
+import io
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+from click.testing import CliRunner
+from pytest_mock import MockerFixture
+
+from synthetic import store as store_module
+from synthetic.eval import cli
+from synthetic.generator import generate_dataset
+from synthetic.loader import read_dataset
+from synthetic.store import DatasetStore
+
+
+def test_generated(tmp_path: Path, mocker: MockerFixture) -> None:
+    store = DatasetStore(tmp_path, 1 << 30)
+    generate = mocker.spy(store_module, "generate_dataset")
+
+    path = store.generated(300, seed=1)
+    assert path == store.path(store.generator_key(300, seed=1))
+    assert store.generated(300, seed=1) == path
+    assert generate.call_count == 1
+
+    for a, b in zip(read_dataset(path), generate_dataset(300, seed=1), strict=True):
+        np.testing.assert_array_equal(a, b)
+    assert store.generator_key(300, seed=2) != store.generator_key(300, seed=1)
+    assert store.generator_key(300, seed=1, times=(0, 1)) != store.generator_key(300, seed=1)
+    assert [e.name for e in os.scandir(tmp_path)] == [os.path.basename(path)]
+
+
+def test_converted(tmp_path: Path) -> None:
+    store = DatasetStore(tmp_path, 1 << 30)
+    path = store.converted(None)
+    assert store.get(store.source_key(None)) == path
+    for a, b in zip(read_dataset(path), read_dataset(), strict=True):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_put_existing(tmp_path: Path) -> None:
+    """Putting an entry which another worker has stored keeps the existing one."""
+    store = DatasetStore(tmp_path, 1 << 30)
+    dataset = generate_dataset(100, seed=0)
+    path = store.put("key", dataset)
+    assert store.put("key", generate_dataset(200, seed=0)) == path
+    assert len(read_dataset(path).reviewer_ids) == 100
+    assert [e.name for e in os.scandir(tmp_path)] == ["key"]
+
+
+def test_evict(tmp_path: Path) -> None:
+    dataset = generate_dataset(1000, seed=0)
+    store = DatasetStore(tmp_path, 1)
+    store.put("a", dataset)
+    os.utime(store.path("a"), (0, 0))
+    store.put("b", dataset)
+
+    # The newest entry is kept even if it alone exceeds the limit.
+    assert store.get("a") is None
+    assert store.get("b") == store.path("b")
+    assert [e.name for e in os.scandir(tmp_path)] == ["b"]
+
+
+def test_store_command(tmp_path: Path) -> None:
+    assert cli.store.callback is not None
+    res = []
+    for _ in range(2):
+        output = io.StringIO()
+        cli.store.callback(root=str(tmp_path), seed=3, workers=1, store_size=1024, output=output, reviewers=200)
+        res.append(json.loads(output.getvalue()))
+    assert [r["hit"] for r in res] == [False, True]
+    assert res[0]["path"] == res[1]["path"]
+    assert len(read_dataset(res[0]["path"]).reviewer_ids) == 200
+
+    output = io.StringIO()
+    cli.store.callback(
+        root=str(tmp_path), seed=3, workers=1, store_size=1024, output=output, reviewers=200, time_span=(0.0, 10.0)
+    )
+    times = read_dataset(json.loads(output.getvalue())["path"]).review_times
+    assert np.all((0 <= times) & (times <= 10))
+
+
+def test_store_command_negative_size(tmp_path: Path) -> None:
+    res = CliRunner().invoke(cli.main, ["store", str(tmp_path / "store"), "--store-size", "-1"])
+    assert res.exit_code == 2
+    assert "--store-size" in res.output
+    assert not (tmp_path / "store").exists()
@@ -20,7 +20,26 @@
 #
 """Unit test for synthetic package."""
 
+import bz2
+import gzip
+import lzma
+import shutil
+import subprocess
+import sys
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Literal
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+
 import synthetic
+from synthetic import loader
+from synthetic.eval.score import calc_anomalous_reviews
+from synthetic.generator import generate_dataset
+from synthetic.graph import DeviationGraph
+from synthetic.loader import read_dataset
 from tests.graph import Graph
 
 
@@ -35,3 +54,291 @@ def test_load() -> None:
     for pmap in graph.reviews.values():
         for score in pmap.values():
             assert 0 <= score < 1
+
+
+def test_load_external_dataset(tmp_path: Path) -> None:
+    """Test load method with an external dataset."""
+    (tmp_path / "reviewer.dat").write_text("10 r1\n20 r2(anomaly)\n")
+    (tmp_path / "product.dat").write_text("7 p1\n8 p2\n")
+    (tmp_path / "review.dat").write_text("20 7 2.5\n10 8 5\n10 7 0\n")
+
+    graph = synthetic.load(Graph(), path=tmp_path)
+    reviewers = {r.name: r for r in graph.reviewers}
+    assert set(reviewers) == {"r1", "r2(anomaly)"}
+    assert graph.products == {"p1", "p2"}
+    assert graph.reviews[reviewers["r1"]] == {"p1": 0.0, "p2": 1.0}
+    assert graph.reviews[reviewers["r2(anomaly)"]] == {"p1": 0.5}
+
+
+def test_read_dataset() -> None:
+    """read_dataset returns the same reviews as parsing the files line by line."""
+    dataset = read_dataset()
+    with open(loader._fullpath("review.dat")) as fp:
+        expect = [line.split() for line in fp]
+
+    assert len(dataset.review_scores) == len(expect)
+    for (rid, pid, score), r, p, s in zip(
+        expect, dataset.review_reviewers, dataset.review_products, dataset.review_scores, strict=True
+    ):
+        assert dataset.reviewer_ids[r] == int(rid)
+        assert dataset.product_ids[p] == int(pid)
+        assert s == float(score)
+
+
+@pytest.mark.parametrize(
+    "review",
+    ["1 1\n", "1 1 x\n", "3 1 1.0\n"],
+)
+def test_read_dataset_error(tmp_path: Path, review: str) -> None:
+    """read_dataset raises ValueError for broken review files."""
+    (tmp_path / "reviewer.dat").write_text("1 r1\n")
+    (tmp_path / "product.dat").write_text("1 p1\n")
+    (tmp_path / "review.dat").write_text(review)
+
+    with pytest.raises(ValueError):
+        read_dataset(tmp_path)
+
+
+def test_read_dataset_large_ids(tmp_path: Path) -> None:
+    """read_dataset parses IDs too large for a float exactly."""
+    big = 2**62 + 1
+    (tmp_path / "reviewer.dat").write_text(f"{big} r1\n{big + 1} r2\n")
+    (tmp_path / "product.dat").write_text(f"{big} p1\n")
+    (tmp_path / "review.dat").write_text(f"{big + 1} {big} 2.5 100\n{big} {big} 5 200\n")
+
+    dataset = read_dataset(tmp_path)
+    np.testing.assert_array_equal(dataset.reviewer_ids[dataset.review_reviewers], [big + 1, big])
+    np.testing.assert_array_equal(dataset.review_scores, [2.5, 5])
+    np.testing.assert_array_equal(dataset.review_times, [100, 200])
+
+
+@pytest.mark.parametrize(
+    ("reviewer", "review", "message"),
+    [
+        ("1 r1\n", "1.5 1 1.0\n", "reviewer IDs must be 64-bit integers"),
+        ("1 r1\n", "1 p1 1.0\n", "product IDs must be 64-bit integers"),
+        ("1 r1\n", f"{2**64} 1 1.0\n", "reviewer IDs must be 64-bit integers"),
+        ("1 r1\n", "1 1 x\n", "scores and timestamps must be numbers"),
+        ("r1 r1\n", "1 1 1.0\n", "IDs must be 64-bit integers"),
+    ],
+)
+def test_read_dataset_invalid_ids(tmp_path: Path, reviewer: str, review: str, message: str) -> None:
+    """read_dataset reports which column has an invalid value."""
+    (tmp_path / "reviewer.dat").write_text(reviewer)
+    (tmp_path / "product.dat").write_text("1 p1\n")
+    (tmp_path / "review.dat").write_text(review)
+
+    with pytest.raises(ValueError, match=message):
+        read_dataset(tmp_path)
+
+
+@pytest.mark.parametrize(
+    ("suffix", "compress"),
+    [(".gz", gzip.compress), (".bz2", bz2.compress), (".xz", lzma.compress)],
+)
+def test_read_compressed_dataset(
+    tmp_path: Path, mocker: MockerFixture, suffix: str, compress: Callable[[bytes], bytes]
+) -> None:
+    """read_dataset decompresses tables and parses them in chunks."""
+    for name in ("reviewer.dat", "product.dat", "review.dat"):
+        with open(loader._fullpath(name), "rb") as fp:
+            (tmp_path / (name + suffix)).write_bytes(compress(fp.read()))
+    mocker.patch.object(loader, "_CHUNK_SIZE", 4096)
+
+    expect = read_dataset()
+    for workers in (1, 2):
+        for a, b in zip(read_dataset(tmp_path, workers), expect, strict=True):
+            np.testing.assert_array_equal(a, b)
+
+
+def test_bounded_map() -> None:
+    """_bounded_map reads chunks only when fewer than the limit are in flight."""
+    read = []
+
+    def chunks() -> Iterator[bytes]:
+        for i in range(10):
+            read.append(i)
+            yield str(i).encode()
+
+    with ThreadPoolExecutor(2) as executor:
+        res = []
+        for v in loader._bounded_map(executor, lambda b: loader.parse_reviews(b + b" 1 1"), chunks(), 3):
+            res.append(int(v.reviewers[0]))
+            assert len(read) <= len(res) + 3
+    assert res == list(range(10))
+
+
+@pytest.mark.parametrize("workers", [1, 3, 8])
+def test_read_dataset_in_parallel(tmp_path: Path, mocker: MockerFixture, workers: int) -> None:
+    """read_dataset splits a plain review table into chunks."""
+    for name in ("reviewer.dat", "product.dat", "review.dat"):
+        shutil.copy(loader._fullpath(name), tmp_path)
+    mocker.patch.object(loader, "_CHUNK_SIZE", 4096)
+
+    ranges = loader._chunk_ranges(str(tmp_path / "review.dat"), workers)
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == (tmp_path / "review.dat").stat().st_size
+    assert all(end == start for (_, end), (start, _) in zip(ranges[:-1], ranges[1:]))
+
+    expect = read_dataset()
+    for a, b in zip(read_dataset(tmp_path, workers), expect, strict=True):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_iter_dataset(mocker: MockerFixture) -> None:
+    """iter_dataset reads the same reviews as read_dataset chunk by chunk."""
+    mocker.patch.object(loader, "_CHUNK_SIZE", 4096)
+
+    chunks = list(loader.iter_dataset())
+    assert len(chunks) > 1
+
+    expect = read_dataset()
+    for i, column in enumerate(expect):
+        if i < 4:
+            np.testing.assert_array_equal(chunks[0][i], column)
+        else:
+            np.testing.assert_array_equal(np.concatenate([c[i] for c in chunks]), column)
+
+
+def test_binary_dataset(tmp_path: Path, mocker: MockerFixture) -> None:
+    """read_dataset memory-maps a dataset written by write_binary."""
+    expect = read_dataset()
+    assert not loader.is_binary(tmp_path)
+    loader.write_binary(expect, tmp_path)
+    assert loader.is_binary(tmp_path)
+
+    res = read_dataset(tmp_path)
+    assert isinstance(res.review_scores, np.memmap)
+    for a, b in zip(res, expect, strict=True):
+        np.testing.assert_array_equal(a, b)
+    assert loader.dataset_digest(tmp_path) != loader.dataset_digest()
+
+    mocker.patch.object(loader, "_CHUNK_SIZE", 32 * 1000)
+    chunks = list(loader.iter_dataset(tmp_path))
+    assert len(chunks) == -(-len(expect.review_scores) // 1000)
+    np.testing.assert_array_equal(np.concatenate([c.review_products for c in chunks]), expect.review_products)
+
+
+@pytest.mark.parametrize("fraction", [0.01, 0.1, 0.5, 1.0])
+def test_load_sample(fraction: float) -> None:
+    """load with a fraction keeps the mix of anomalous reviewers, sampling at least one of each type."""
+    full = calc_anomalous_reviews(synthetic.load(Graph()).reviewers)
+    graph = synthetic.load(Graph(), fraction=fraction, seed=1)
+
+    assert len(graph.reviewers) == pytest.approx(1000 * fraction, abs=2)
+    for n, m in zip(calc_anomalous_reviews(graph.reviewers), full, strict=True):
+        assert n == max(round(m * fraction), 1)
+    for pmap in graph.reviews.values():
+        assert set(pmap) <= graph.products
+    assert graph.products == {p for pmap in graph.reviews.values() for p in pmap}
+
+    other = synthetic.load(Graph(), fraction=fraction, seed=1)
+    assert graph.reviewers == other.reviewers
+    assert graph.reviews == other.reviews
+
+
+def test_load_sample_without_eval() -> None:
+    """Sampling a dataset doesn't import the evaluation tools."""
+    code = (
+        "import sys; from synthetic.loader import read_dataset, sample_dataset; "
+        "sample_dataset(read_dataset(), 0.5, 0); sys.exit('synthetic.eval' in sys.modules)"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_load_sample_error() -> None:
+    """load raises ValueError for an invalid fraction."""
+    with pytest.raises(ValueError):
+        synthetic.load(Graph(), fraction=0)
+
+
+@pytest.mark.parametrize("partitioner", ["hash", "greedy"])
+@pytest.mark.parametrize("k", [1, 3])
+def test_load_partitioned(partitioner: Literal["hash", "greedy"], k: int) -> None:
+    """load_partitioned splits reviewers into k graphs."""
+    full = synthetic.load(Graph())
+    shards = synthetic.load_partitioned(Graph, k, partitioner=partitioner)
+    assert len(shards) == k
+
+    reviewers = [r for s in shards for r in s.graph.reviewers]
+    assert len(reviewers) == len(full.reviewers)
+    assert set(reviewers) == full.reviewers
+    assert sum(len(pmap) for s in shards for pmap in s.graph.reviews.values()) == sum(
+        len(pmap) for pmap in full.reviews.values()
+    )
+
+    for s in shards:
+        others = {p for o in shards if o is not s for p in o.graph.products}
+        assert set(s.ghost_products) == s.graph.products & others
+        assert s.cut_reviews == sum(p in others for pmap in s.graph.reviews.values() for p in pmap)
+        for r, pmap in s.graph.reviews.items():
+            assert full.reviews[r] == pmap
+
+
+def test_load_partitioned_greedy_reduces_ghosts() -> None:
+    """The greedy partitioner cuts fewer reviews than the hash partitioner."""
+    hashed = synthetic.load_partitioned(Graph, 4, partitioner="hash")
+    greedy = synthetic.load_partitioned(Graph, 4, partitioner="greedy")
+    assert sum(s.cut_reviews for s in greedy) < sum(s.cut_reviews for s in hashed)
+
+
+def test_greedy_partition_balance() -> None:
+    """The greedy partitioner keeps shards balanced with more shards than bits in a byte."""
+    dataset = generate_dataset(5000, seed=0)
+    shards = loader._greedy_partition(dataset, 12)
+    sizes = np.bincount(shards, minlength=12)
+    assert sizes.max() <= len(dataset.reviewer_ids) / 12 * 1.1
+    np.testing.assert_array_equal(shards, loader._greedy_partition(dataset, 12))
+
+    def cut(assigned: np.ndarray) -> int:
+        owners = assigned[dataset.review_reviewers]
+        shared = np.zeros((12, len(dataset.product_ids)), dtype=bool)
+        shared[owners, dataset.review_products] = True
+        return int(np.count_nonzero(shared.sum(axis=0)[dataset.review_products] > 1))
+
+    assert cut(shards) < cut(loader._hash_partition(dataset, 12))
+
+
+@pytest.mark.parametrize("order", loader.ORDERS)
+def test_load_order(order: loader.Order) -> None:
+    """load with an order adds the same reviewers, products, and reviews."""
+    full = synthetic.load(Graph())
+    graph = synthetic.load(DeviationGraph(), order=order)
+    assert {r.name for r in graph.reviewers} == {r.name for r in full.reviewers}
+    assert {p.name for p in graph.products} == full.products
+
+    reviewers, products, scores = graph._columns()
+    reviews = {
+        (graph.reviewers[r].name, graph.products[p].name): s
+        for r, p, s in zip(reviewers.tolist(), products.tolist(), scores.tolist(), strict=True)
+    }
+    assert len(reviews) == len(scores)
+    assert reviews == {(r.name, p): s for r, pmap in full.reviews.items() for p, s in pmap.items()}
+
+    if order != "file":
+        assert np.all(np.diff(products if order == "product" else reviewers) >= 0)
+
+
+def test_reorder_dataset() -> None:
+    """Orders place nodes as expected."""
+    dataset = read_dataset()
+    degrees = np.bincount(loader.reorder_dataset(dataset, "degree").review_reviewers)
+    assert np.all(np.diff(degrees) <= 0)
+
+    # A path r2 - p1 - r0 - p0 - r1 is numbered along the path by rcm.
+    path = loader.Dataset(
+        reviewer_ids=np.arange(3),
+        reviewer_names=np.array(["r0", "r1", "r2"]),
+        product_ids=np.arange(2),
+        product_names=np.array(["p0", "p1"]),
+        review_reviewers=np.array([0, 0, 1, 2]),
+        review_products=np.array([0, 1, 0, 1]),
+        review_scores=np.zeros(4),
+        review_times=np.full(4, np.nan),
+    )
+    res = loader.reorder_dataset(path, "rcm")
+    assert res.reviewer_names.tolist() in (["r1", "r0", "r2"], ["r2", "r0", "r1"])
+    assert res.product_names.tolist() == (["p0", "p1"] if res.reviewer_names[0] == "r1" else ["p1", "p0"])
+
+    with pytest.raises(ValueError):
+        loader.reorder_dataset(path, "unknown")  # type: ignore[arg-type]